@@ -0,0 +1,51 @@
+import sys
+import os
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
+from sqlalchemy import select
+from src.infrastructure.mysql.mysql_connection import MysqlConnection
+from src.config.db_config import DbConfig
+from src.infrastructure.mysql.repositories.transaction_repo import TransactionRepository
+from src.domain.entities.schema import Transaction
+from src.domain.value_objects.dto import ResTransactionDto
+
+# Read-only benchmark of TransactionRepository.list against the configured
+# database. It compares the old read path (whole ORM objects, one
+# model_validate per row) with the projected one (response columns as plain
+# rows, validated in bulk) and prints rows per second for each.
+# Usage: python benchmark_reads.py [rounds]
+
+
+async def orm_list(db: MysqlConnection) -> List[ResTransactionDto]:
+    # The read path list() used before the projection
+    async with await db.get_session() as session:
+        result = await session.execute(select(Transaction))
+        records = result.scalars().all()
+        return [ResTransactionDto.model_validate(r) for r in records]
+
+
+async def measure(name: str, read: Callable[[], Awaitable[List[ResTransactionDto]]], rounds: int) -> None:
+    await read()  # warm up the pool and the compiled statement cache
+    rows, started = 0, time.perf_counter()
+    for _ in range(rounds):
+        rows += len(await read())
+    elapsed = time.perf_counter() - started
+    print(f"{name:<28} {rows / elapsed:>12,.0f} rows/s  ({rows // rounds} rows x {rounds} rounds, {elapsed:.2f}s)")
+
+
+async def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    db = MysqlConnection(DbConfig())
+    try:
+        repository = TransactionRepository(db)
+        await measure("ORM objects + model_validate", lambda: orm_list(db), rounds)
+        await measure("projected rows + bulk", repository.list, rounds)
+    finally:
+        await db.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,10 +2,16 @@ import sys
 import os
 import asyncio
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
-from src.server import MCPServer
+from src.server import MCPServer, UNIT_OF_WORK, RESPONSE_CACHE, EVENT_BUS, ADMISSION, QUERY_STATS, READ, WRITE, REPORT
+from src.application.admission import AdmissionController, LaneLimit
+from src.application.event_bus import EventBus
+from src.application.single_flight import single_flight
 from src.di_container import DIContainer
 from src.infrastructure.mysql.mysql_connection import MysqlConnection
+from src.infrastructure.mysql.response_cache import ResponseCache
 from src.config.db_config import DbConfig
+from src.config.admission_config import AdmissionConfig
+from src.config.import_config import ImportConfig
 
 # Import repositories
 from src.infrastructure.mysql.repositories.contact_repo import ContactRepository
@@ -16,6 +22,10 @@ from src.infrastructure.mysql.repositories.assest_repo import AssetRepository
 from src.infrastructure.mysql.repositories.assest_type_repo import AssetTypeRepository
 from src.infrastructure.mysql.repositories.transaction_repo import TransactionRepository
 from src.infrastructure.mysql.repositories.tranfer_repo import TransferRepository
+from src.infrastructure.mysql.repositories.current_sheet_repo import CurrentSheetRepository
+from src.infrastructure.mysql.repositories.summary_repo import SummaryRepository
+from src.infrastructure.mysql.repositories.import_job_repo import ImportJobRepository
+from src.infrastructure.statements.statement_reader import read_statement
 
 # Import usecases
 from src.application.usecase.contact_usecase import ContactUseCase
@@ -26,6 +36,9 @@ from src.application.usecase.assest_usecase import AssetUseCase
 from src.application.usecase.assest_type_usecase import AssetTypeUseCase
 from src.application.usecase.transaction_usecase import TransactionUseCase
 from src.application.usecase.tranfer_usecase import TransferUseCase
+from src.application.usecase.balance_usecase import BalanceUseCase
+from src.application.usecase.summary_usecase import SummaryUseCase
+from src.application.usecase.import_usecase import ImportUseCase
 
 # Import resource registrations
 from src.infrastructure.http_resources.contact_resources import register_contact_resources
@@ -34,6 +47,10 @@ from src.infrastructure.http_resources.expense_type_resources import register_ex
 from src.infrastructure.http_resources.asset_resources import register_asset_resources
 from src.infrastructure.http_resources.transaction_resources import register_transaction_resources
 from src.infrastructure.http_resources.transfer_resources import register_transfer_resources
+from src.infrastructure.http_resources.balance_resources import register_balance_resources
+from src.infrastructure.http_resources.summary_resources import register_summary_resources
+from src.infrastructure.http_resources.metrics_resources import register_metrics_resources
+from src.infrastructure.http_resources.import_resources import register_import_resources
 
 async def main():
     # Setup DI container
@@ -46,6 +63,9 @@ async def main():
     # Migrate all Schema
     await db.create_tables()
 
+    # Open pooled connections up front so the first requests reuse them
+    await db.warm_up()
+
     # Create and register repositories
     contact_repo = ContactRepository(db)
     contact_type_repo = ContactTypeRepository(db)
@@ -55,6 +75,9 @@ async def main():
     asset_type_repo = AssetTypeRepository(db)
     transaction_repo = TransactionRepository(db)
     transfer_repo = TransferRepository(db)
+    current_sheet_repo = CurrentSheetRepository(db)
+    summary_repo = SummaryRepository(db)
+    import_job_repo = ImportJobRepository(db, transaction_repo)
 
     # Create and register usecases
     contact_usecase = ContactUseCase(contact_repo)
@@ -63,8 +86,17 @@ async def main():
     expense_type_usecase = ExpenseTypeUseCase(expense_type_repo)
     asset_usecase = AssetUseCase(asset_repo)
     asset_type_usecase = AssetTypeUseCase(asset_type_repo)
-    transaction_usecase = TransactionUseCase(transaction_repo)
+    transaction_usecase = TransactionUseCase(
+        transaction_repo,
+        group_commit=db_config.group_commit,
+        group_commit_max_batch=db_config.group_commit_max_batch,
+        group_commit_max_latency=db_config.group_commit_max_latency_ms / 1000,
+    )
     transfer_usecase = TransferUseCase(transfer_repo)
+    balance_usecase = BalanceUseCase(current_sheet_repo)
+    summary_usecase = SummaryUseCase(summary_repo)
+    # Statements are only read from the configured import directory
+    import_usecase = ImportUseCase(import_job_repo, read_statement, ImportConfig().import_dir)
 
     # Register usecases in container
     container.register("contact_usecase", contact_usecase)
@@ -75,6 +107,38 @@ async def main():
     container.register("asset_type_usecase", asset_type_usecase)
     container.register("transaction_usecase", transaction_usecase)
     container.register("transfer_usecase", transfer_usecase)
+    container.register("balance_usecase", balance_usecase)
+    container.register("summary_usecase", summary_usecase)
+    container.register("import_usecase", import_usecase)
+
+    # Each resource request shares one session and commits once
+    container.register(UNIT_OF_WORK, db.run_in_unit_of_work)
+    # List responses are served from memory until their tables are written
+    response_cache = ResponseCache(db.table_versions)
+    container.register(RESPONSE_CACHE, response_cache)
+    # Committed writes notify the clients subscribed to the resources they
+    # change, a burst of them once, so watching clients need not poll
+    event_bus = EventBus()
+    db.table_versions.listen(event_bus.publish)
+    container.register(EVENT_BUS, event_bus)
+    # Reads, writes and reports each get their own slots, so a flood of one
+    # class queues up or is turned away instead of starving the others; the
+    # pool's connections go to writes first, then reads, then reports
+    admission_config = AdmissionConfig()
+    capacity = admission_config.capacity or db_config.pool_size + db_config.max_overflow
+    if admission_config.write_reserve >= capacity:
+        raise ValueError("ADMISSION_WRITE_RESERVE must be below the admission capacity.")
+    admission = AdmissionController({
+        WRITE: LaneLimit(admission_config.write_concurrency, admission_config.write_queue,
+                         admission_config.write_deadline, priority=0),
+        READ: LaneLimit(admission_config.read_concurrency, admission_config.read_queue,
+                        admission_config.read_deadline, priority=1),
+        REPORT: LaneLimit(admission_config.report_concurrency, admission_config.report_queue,
+                          admission_config.report_deadline, priority=2),
+    }, capacity=capacity, reserved=admission_config.write_reserve)
+    container.register(ADMISSION, admission)
+    # SQL statements, DB time and rows are counted per resource
+    container.register(QUERY_STATS, db.query_stats)
 
     # Create MCP server
     mcp = MCPServer(name="self-money-habbit", _container=container)
@@ -86,6 +150,14 @@ async def main():
     register_asset_resources(mcp, asset_usecase)
     register_transaction_resources(mcp, transaction_usecase)
     register_transfer_resources(mcp, transfer_usecase)
+    register_balance_resources(mcp, balance_usecase)
+    register_summary_resources(mcp, summary_usecase)
+    register_import_resources(mcp, import_usecase)
+    register_metrics_resources(mcp, db, {
+        "asset_types": asset_type_repo.cache,
+        "expense_types": expense_type_repo.cache,
+        "contact_types": contact_type_repo.cache,
+    }, single_flight, response_cache, event_bus, admission, transaction_usecase.group_commit)
 
     # Start the server
     mcp.start()
@@ -0,0 +1,30 @@
+import sys
+import os
+import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
+from src.infrastructure.mysql.mysql_connection import MysqlConnection
+from src.config.db_config import DbConfig
+from src.infrastructure.mysql.repositories.current_sheet_repo import CurrentSheetRepository
+from src.application.usecase.balance_usecase import BalanceUseCase
+
+# One-shot rebuild of the current_sheets balances and the monthly
+# balance_checkpoints from the transactions table. Both are only kept up to
+# date by writes made since they were maintained, so run this once on a
+# database that predates that, with the server stopped.
+# Usage: python rebuild_balances.py
+
+async def main():
+    db = MysqlConnection(DbConfig())
+    await db.create_tables()
+    try:
+        usecase = BalanceUseCase(CurrentSheetRepository(db))
+        await usecase.rebuild_balances()
+        print("Rebuilt current balances from the ledger.")
+        written = await usecase.rebuild_checkpoints()
+        print(f"Rebuilt balance checkpoints: {written} row(s) written.")
+    finally:
+        await db.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,29 @@
+import sys
+import os
+import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
+from src.infrastructure.mysql.mysql_connection import MysqlConnection
+from src.config.db_config import DbConfig
+from src.infrastructure.mysql.repositories.summary_repo import SummaryRepository
+from src.application.usecase.summary_usecase import SummaryUseCase
+
+# One-shot rebuild of the monthly_rollups table from the transactions table.
+# Months are recomputed in parallel, each in its own DB transaction; pass the
+# number of months to run at once as the first argument (default 4).
+# Usage: python rebuild_rollups.py [concurrency]
+
+async def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+
+    db = MysqlConnection(DbConfig())
+    await db.create_tables()
+    try:
+        usecase = SummaryUseCase(SummaryRepository(db))
+        written = await usecase.rebuild_rollups(min(concurrency, db.config.pool_size))
+        print(f"Rebuilt monthly rollups: {written} row(s) written.")
+    finally:
+        await db.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,204 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Queue waits kept per class for the wait percentiles
+WAIT_SAMPLES = 1024
+
+
+class Overloaded(Exception):
+    """A request was rejected because its class's wait queue is full."""
+
+    def __init__(self, kind: str, retry_after: float):
+        super().__init__(f"Server busy with {kind} requests, retry after {retry_after:.1f}s")
+        self.kind = kind
+        self.retry_after = retry_after
+
+
+@dataclass
+class LaneLimit:
+    concurrency: int  # requests running at once
+    queue: int  # requests waiting for a slot
+    deadline: float  # seconds from arrival, waiting included
+    priority: int = 0  # lower runs first when the shared capacity is short
+
+
+class _Lane:
+    def __init__(self, limit: LaneLimit):
+        self.limit = limit
+        self.active = 0
+        self.waiters: Deque["asyncio.Future[None]"] = deque()
+        # Moving average of how long a request holds its slot, for retry-after
+        self.service_time = 0.05
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.waits: Deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self.total_wait = 0.0
+
+
+class AdmissionController:
+    """
+    Bounds how many requests of each class (e.g. read, write, report) run at
+    once. Each class has its own slots, so a flood of one cannot take the
+    connections another needs. Requests beyond the limit wait in FIFO order
+    in a bounded queue. Once the queue is full they are rejected at once
+    with Overloaded, which carries a retry-after estimate.
+
+    All classes also share `capacity` slots, normally the connection pool.
+    A freed slot goes to the waiting class with the best priority, so
+    interactive writes get the next connection ahead of reads and reports.
+    The last `reserved` slots are kept for the top-priority class alone.
+    A report's own small limit throttles it further.
+
+    Every request has a deadline counted from its arrival. A request still
+    running when it passes is cancelled. Cancelling an await on the database
+    only makes SQLAlchemy invalidate the client's connection: MySQL keeps
+    running the statement until it ends. A request already committing is
+    therefore let finish its COMMIT before it stops (see unit_of_work), so
+    a timed-out write is committed in full or not at all, never unknown to
+    the server; its client still gets the timeout.
+    """
+
+    def __init__(self, limits: Dict[str, LaneLimit], capacity: Optional[int] = None, reserved: int = 0):
+        self._lanes = {kind: _Lane(limit) for kind, limit in limits.items()}
+        # Best priority first, the order a freed slot is offered in
+        self._by_priority: List[_Lane] = sorted(self._lanes.values(), key=lambda lane: lane.limit.priority)
+        self._top_priority = min((limit.priority for limit in limits.values()), default=0)
+        self._capacity = capacity if capacity is not None else sum(limit.concurrency for limit in limits.values())
+        self._reserved = reserved
+        self._running = 0
+
+    async def run(self, kind: str, operation: Callable[[], Awaitable[T]]) -> T:
+        lane = self._lanes.get(kind)
+        if lane is None:
+            return await operation()
+
+        loop = asyncio.get_running_loop()
+        deadline = asyncio.timeout(lane.limit.deadline)
+        try:
+            async with deadline:
+                await self._admit(lane, kind)
+                started = loop.time()
+                try:
+                    return await operation()
+                finally:
+                    lane.service_time += 0.2 * (loop.time() - started - lane.service_time)
+                    self._release(lane)
+        except TimeoutError:
+            if not deadline.expired():
+                raise
+            lane.timed_out += 1
+            raise TimeoutError(f"{kind} request exceeded its {lane.limit.deadline:g}s deadline")
+
+    def stats(self) -> Dict[str, Any]:
+        lanes: Dict[str, Any] = {
+            kind: {
+                "priority": lane.limit.priority,
+                "active": lane.active,
+                "waiting": len(lane.waiters),
+                "admitted": lane.admitted,
+                "queued": lane.queued,
+                "rejected": lane.rejected,
+                "timed_out": lane.timed_out,
+                "service_time_ms": round(lane.service_time * 1000, 2),
+                "concurrency": lane.limit.concurrency,
+                "queue": lane.limit.queue,
+                "deadline": lane.limit.deadline,
+                "queue_wait_ms": self._wait_stats(lane),
+            }
+            for kind, lane in self._lanes.items()
+        }
+        return {"running": self._running, "capacity": self._capacity, "reserved": self._reserved, "classes": lanes}
+
+    async def _admit(self, lane: _Lane, kind: str) -> None:
+        loop = asyncio.get_running_loop()
+        if not lane.waiters and self._can_start(lane) and not self._outranked(lane):
+            self._start(lane, 0.0)
+            return
+        if len(lane.waiters) >= lane.limit.queue:
+            lane.rejected += 1
+            raise Overloaded(kind, self._retry_after(lane))
+
+        waiter: "asyncio.Future[None]" = loop.create_future()
+        lane.waiters.append(waiter)
+        lane.queued += 1
+        arrived = loop.time()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted just as we gave up; pass it on
+                self._release(lane)
+            elif waiter in lane.waiters:
+                # _dispatch may already have skipped past it
+                lane.waiters.remove(waiter)
+            raise
+        self._record_wait(lane, loop.time() - arrived)
+
+    def _can_start(self, lane: _Lane) -> bool:
+        if lane.active >= lane.limit.concurrency:
+            return False
+        free = self._capacity - self._running
+        if lane.limit.priority == self._top_priority:
+            return free > 0
+        return free > self._reserved
+
+    def _outranked(self, lane: _Lane) -> bool:
+        """Whether a better-priority class is waiting for the slot this one would take."""
+        return any(
+            other.waiters and other.limit.priority < lane.limit.priority and self._can_start(other)
+            for other in self._by_priority
+        )
+
+    def _start(self, lane: _Lane, waited: float) -> None:
+        lane.active += 1
+        self._running += 1
+        self._record_wait(lane, waited)
+
+    def _release(self, lane: _Lane) -> None:
+        lane.active -= 1
+        self._running -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        # Offer free slots class by class in priority order, oldest waiter first
+        for lane in self._by_priority:
+            while lane.waiters and self._can_start(lane):
+                waiter = lane.waiters.popleft()
+                if waiter.done():
+                    continue
+                lane.active += 1
+                self._running += 1
+                waiter.set_result(None)
+
+    @staticmethod
+    def _record_wait(lane: _Lane, waited: float) -> None:
+        lane.admitted += 1
+        lane.waits.append(waited)
+        lane.total_wait += waited
+
+    @staticmethod
+    def _wait_stats(lane: _Lane) -> Dict[str, float]:
+        waits = sorted(lane.waits)
+        if not waits:
+            return {"avg": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+        def at(fraction: float) -> float:
+            return round(waits[min(len(waits) - 1, int(fraction * len(waits)))] * 1000, 2)
+        return {
+            "avg": round(lane.total_wait / lane.admitted * 1000, 2),
+            "p50": at(0.50),
+            "p95": at(0.95),
+            "p99": at(0.99),
+            "max": round(waits[-1] * 1000, 2),
+        }
+
+    @staticmethod
+    def _retry_after(lane: _Lane) -> float:
+        # About when the queue ahead would have drained
+        return max(0.1, (len(lane.waiters) + 1) / lane.limit.concurrency * lane.service_time)
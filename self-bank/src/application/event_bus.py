@@ -0,0 +1,72 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+# Receives the topics published during one coalescing window
+Handler = Callable[[Set[str]], Awaitable[None]]
+
+
+class EventBus:
+    """
+    In-process fan-out of change events. Publishers name topics, here the
+    tables a committed DB transaction wrote; subscribers are called with
+    every topic published during a short window, once per window, so a
+    burst of writes costs each subscriber one call instead of one per write.
+
+    Publishing is synchronous and never waits for a subscriber, so it is
+    safe from commit hooks. A failing subscriber does not affect the others.
+    """
+
+    def __init__(self, window_seconds: float = 0.05):
+        self._window = window_seconds
+        self._handlers: List[Handler] = []
+        self._pending: Set[str] = set()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._deliveries: Set["asyncio.Task[None]"] = set()
+        self.published = 0
+        self.flushes = 0
+        self.errors = 0
+
+    def subscribe(self, handler: Handler) -> None:
+        self._handlers.append(handler)
+
+    def publish(self, topics: Iterable[str]) -> None:
+        """Queues `topics` for the next delivery; starts the window if none is open."""
+        topics = set(topics)
+        if not topics or not self._handlers:
+            return
+        self.published += 1
+        self._pending |= topics
+        if self._flush_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # No loop, e.g. a script committing synchronously: nobody to notify
+                self._pending.clear()
+                return
+            self._flush_handle = loop.call_later(self._window, self._flush)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "published": self.published,
+            "flushes": self.flushes,
+            # Publications folded into an earlier one of the same window
+            "coalesced": self.published - self.flushes,
+            "errors": self.errors,
+            "subscribers": len(self._handlers),
+            "window_seconds": self._window,
+        }
+
+    def _flush(self) -> None:
+        topics, self._pending = self._pending, set()
+        self._flush_handle = None
+        self.flushes += 1
+        for handler in self._handlers:
+            task = asyncio.ensure_future(handler(topics))
+            # Kept until done so the task is not garbage collected mid-flight
+            self._deliveries.add(task)
+            task.add_done_callback(self._delivered)
+
+    def _delivered(self, task: "asyncio.Task[None]") -> None:
+        self._deliveries.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
@@ -0,0 +1,112 @@
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+from returns.result import Result, Failure
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Upper bounds of the batch size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+class GroupCommit(Generic[T, R]):
+    """
+    Group commit for small writes: items submitted by concurrent callers are
+    collected and written by one `flush` call, i.e. one multi-row INSERT and
+    one commit, and each caller gets its own item's result.
+
+    A batch is written once `max_batch` items are waiting or the oldest has
+    waited `max_latency` seconds. Only one batch is written at a time; items
+    arriving meanwhile form the next batch, which is written as soon as the
+    current one commits. Under load batches therefore grow by themselves and
+    throughput follows the load instead of the commit rate.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[T]], Awaitable[List[Result[R, Exception]]]],
+        max_batch: int = 200,
+        max_latency: float = 0.005,
+    ):
+        self._flush = flush
+        self._max_batch = max(1, max_batch)
+        self._max_latency = max_latency
+        self._pending: List[Tuple[T, "asyncio.Future[Result[R, Exception]]"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._writing: Optional["asyncio.Task[None]"] = None
+        self._sizes: Counter[int] = Counter()
+        self.batches = 0
+        self.items = 0
+        self.largest = 0
+        self.errors = 0
+
+    async def submit(self, item: T) -> Result[R, Exception]:
+        """Queues `item` for the next batch and waits for its own result."""
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Result[R, Exception]]" = loop.create_future()
+        self._pending.append((item, future))
+        if self._writing is None:
+            if len(self._pending) >= self._max_batch:
+                self._write_next()
+            elif self._timer is None:
+                self._timer = loop.call_later(self._max_latency, self._on_timer)
+        # A caller that gives up does not take its item out of the batch
+        return await asyncio.shield(future)
+
+    def stats(self) -> Dict[str, Any]:
+        buckets: Dict[str, int] = {}
+        for size, count in sorted(self._sizes.items()):
+            bound = next((b for b in BATCH_SIZE_BUCKETS if size <= b), None)
+            label = f"<={bound}" if bound is not None else f">{BATCH_SIZE_BUCKETS[-1]}"
+            buckets[label] = buckets.get(label, 0) + count
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "average_batch": round(self.items / self.batches, 2) if self.batches else 0,
+            "largest_batch": self.largest,
+            "batch_sizes": buckets,
+            "errors": self.errors,
+            "waiting": len(self._pending),
+            "max_batch": self._max_batch,
+            "max_latency_ms": self._max_latency * 1000,
+        }
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        if self._writing is None and self._pending:
+            self._write_next()
+
+    def _write_next(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending[:self._max_batch], self._pending[self._max_batch:]
+        # A task of its own: the batch commits in its own session, not in
+        # the unit of work of whichever caller happened to fill it
+        self._writing = asyncio.ensure_future(self._write(batch))
+
+    async def _write(self, batch: List[Tuple[T, "asyncio.Future[Result[R, Exception]]"]]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        self.largest = max(self.largest, len(batch))
+        self._sizes[len(batch)] += 1
+        try:
+            results = await self._flush([item for item, _ in batch])
+        except Exception as e:
+            self.errors += 1
+            results = [Failure(e)] * len(batch)
+        except BaseException:
+            # Shutting down: the callers must not wait forever
+            for _, future in batch:
+                future.cancel()
+            raise
+        finally:
+            self._writing = None
+            # Whatever queued up meanwhile has waited a whole commit already
+            if self._pending:
+                self._write_next()
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,91 @@
+import asyncio
+import functools
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+from pydantic import BaseModel
+
+T = TypeVar("T")
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for a key is in
+    flight, later callers with the same key await it instead of starting
+    their own, and all of them get its result (or its exception).
+
+    The shared call runs in a task of its own, so a caller that gives up
+    does not cancel it for the others; being its own task it also reads
+    through a session of its own, i.e. it sees committed data only. Nothing
+    is kept once the call finishes, so this never serves stale results.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "executed": 0, "coalesced": 0, "errors": 0}
+        )
+
+    async def do(self, name: str, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        stats = self._stats[name]
+        stats["calls"] += 1
+        shared = self._in_flight.get(key)
+        if shared is not None:
+            stats["coalesced"] += 1
+            return await asyncio.shield(shared)
+
+        stats["executed"] += 1
+        task = asyncio.ensure_future(call())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._finished(key, name, done))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Counters per method: calls, executed (DB queries run) and coalesced."""
+        return {name: dict(counters) for name, counters in sorted(self._stats.items())}
+
+    def _finished(self, key: Hashable, name: str, task: "asyncio.Future[Any]") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Retrieved here so a failure nobody waited for is not reported as lost
+        if not task.cancelled() and task.exception() is not None:
+            self._stats[name]["errors"] += 1
+
+
+# Shared by every usecase, so one metrics resource can report on all of them
+single_flight = SingleFlight()
+
+
+def coalesced(method: F) -> F:
+    """
+    Marks a read-only usecase method whose concurrent identical calls (same
+    usecase, same arguments) share one execution. Callers receive the same
+    result objects and must not mutate them.
+    """
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        key = _call_key(self, name, args, kwargs)
+        if key is None:
+            # Arguments that cannot be compared cheaply are not coalesced
+            return await method(self, *args, **kwargs)
+        return await single_flight.do(name, key, lambda: method(self, *args, **kwargs))
+    return wrapper  # type: ignore[return-value]
+
+
+def _call_key(owner: Any, name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Optional[Hashable]:
+    try:
+        key = (id(owner), name, tuple(_freeze(arg) for arg in args),
+               tuple(sorted((k, _freeze(v)) for k, v in kwargs.items())))
+        hash(key)
+        return key
+    except TypeError:
+        return None
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, BaseModel):
+        # DTO arguments (e.g. filters) compare by their values
+        return type(value), value.model_dump_json()
+    return value
@@ -2,12 +2,13 @@ from typing import List, Optional
 from returns.result import Result, Failure
 
 
+from ..single_flight import coalesced
 from ...domain.value_objects.dto import (
     CreateAssetTypeDto,
     UpdateAssetTypeDto,
     ResAssetTypeDto,
 )
-from ...domain.repository.i_repository import CrudProtocol
+from ...domain.repository.i_reference_repository import ReferenceRepositoryProtocol
 
 
 
@@ -24,12 +25,12 @@ class AssetTypeUseCase:
     4. Asset types maintain their own audit trail
     """
 
-    def __init__(self, repository: CrudProtocol[CreateAssetTypeDto, UpdateAssetTypeDto, ResAssetTypeDto]):
+    def __init__(self, repository: ReferenceRepositoryProtocol[CreateAssetTypeDto, UpdateAssetTypeDto, ResAssetTypeDto]):
         """
         Initialize the AssetType Use Case with its repository.
 
         Args:
-            repository: Repository implementing the CrudProtocol for AssetType operations
+            repository: Cached repository for AssetType operations
         """
         self.repository = repository
 
@@ -56,13 +57,8 @@ class AssetTypeUseCase:
             if not validation_result:
                 return Failure(Exception("Invalid asset type name format"))
 
-            # Check if asset type with same name already exists
-            existing_types = await self.list_asset_types()
-            if any(t.name.lower() == dto.name.lower() for t in existing_types):
-                return Failure(Exception("Asset type with this name already exists"))
-
-            
-
+            # Uniqueness is enforced by the unique index on the normalized
+            # name; a duplicate comes back as a Failure from the insert
             return await self.repository.create(dto)
         except Exception as e:
             return Failure(Exception(f"Failed to create asset type: {str(e)}"))
@@ -118,13 +114,7 @@ class AssetTypeUseCase:
                 if not validation_result:
                     return Failure(Exception("Invalid asset type name format"))
 
-                # Check for duplicate names
-                existing_types = await self.list_asset_types()
-                if any(t.name.lower() == dto.name.lower() and t.id != id for t in existing_types):
-                    return Failure(Exception("Asset type with this name already exists"))
-
-            
-
+            # A name taken by another asset type is rejected by the unique index
             return await self.repository.update(id, dto)
         except Exception as e:
             return Failure(Exception(f"Failed to update asset type: {str(e)}"))
@@ -159,6 +149,7 @@ class AssetTypeUseCase:
         except Exception as e:
             return Failure(Exception(f"Failed to delete asset type: {str(e)}"))
 
+    @coalesced
     async def list_asset_types(self) -> List[ResAssetTypeDto]:
         """
         Retrieve all asset types in the system.
@@ -1,12 +1,15 @@
 from typing import List, Optional
 from returns.result import Result, Failure
+from ..single_flight import coalesced
 from ...domain.value_objects.dto import (
     CreateAssetDto,
     UpdateAssetDto,
     ResAssetDto,
-    
+    PageDto,
+    ChangesDto,
 )
 from ...domain.repository.i_repository import CrudProtocol
+from ...domain.value_objects.pagination import DEFAULT_PAGE_SIZE, decode_page_cursor, decode_change_cursor
 
 
 
@@ -44,6 +47,7 @@ class AssetUseCase:
         except Exception as e:
             return Failure(Exception(f"Failed to create asset: {str(e)}"))
 
+    @coalesced
     async def get_all_assets(self) -> List[ResAssetDto]:
         """
         Retrieve all assets in the system.
@@ -58,6 +62,39 @@ class AssetUseCase:
             print(f"Error retrieving assets: {str(e)}")
             return []
 
+    @coalesced
+    async def get_assets_page(
+        self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> PageDto[ResAssetDto]:
+        """
+        Retrieve one page of assets ordered by ID.
+
+        Args:
+            cursor: Opaque cursor from a previous page, or None for the first page
+            limit: Maximum number of assets to return
+
+        Returns:
+            PageDto[ResAssetDto]: Assets plus the cursor of the next page
+        """
+        return await self.repository.list_page(decode_page_cursor(cursor), limit)
+
+    @coalesced
+    async def get_asset_changes(
+        self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> ChangesDto[ResAssetDto]:
+        """
+        Retrieve the assets created, updated or deleted since a change cursor.
+
+        Args:
+            cursor: next_cursor of the previous call, or None to get every asset
+            limit: Maximum number of changes to return
+
+        Returns:
+            Changed assets, deleted IDs and the cursor to continue from
+        """
+        return await self.repository.changes_since(decode_change_cursor(cursor), limit)
+
+    @coalesced
     async def get_asset(self, id: int) -> Optional[ResAssetDto]:
         """
         Retrieve a specific asset by its ID.
@@ -0,0 +1,81 @@
+from typing import List, Optional
+
+from ..single_flight import coalesced
+from ...domain.value_objects.dto import ResCurrentSheetDto, PageDto
+from ...domain.repository.i_current_sheet_repository import CurrentSheetRepositoryProtocol
+from ...domain.value_objects.pagination import DEFAULT_PAGE_SIZE, decode_page_cursor
+
+
+class BalanceUseCase:
+    """
+    Balance Use Case - serves the current balance of each asset.
+
+    Balances live in CurrentSheet rows that are kept up to date by every
+    income, payment and transfer write, so reading one is a single indexed
+    lookup rather than a sum over the ledger.
+    """
+
+    def __init__(self, repository: CurrentSheetRepositoryProtocol):
+        """
+        Initialize the Balance Use Case with its repository.
+
+        Args:
+            repository: Repository for CurrentSheet rows
+        """
+        self.repository = repository
+
+    @coalesced
+    async def get_asset_balance(self, asset_id: int) -> Optional[ResCurrentSheetDto]:
+        """
+        Retrieve the current balance of an asset.
+
+        Args:
+            asset_id: ID of the asset
+
+        Returns:
+            Optional[ResCurrentSheetDto]: The asset's balance sheet if found, None otherwise
+        """
+        return await self.repository.get_by_asset(asset_id)
+
+    @coalesced
+    async def list_balances(self) -> List[ResCurrentSheetDto]:
+        """
+        Retrieve the current balance of every asset.
+
+        Returns:
+            List[ResCurrentSheetDto]: One balance sheet per asset
+        """
+        return await self.repository.list()
+
+    @coalesced
+    async def list_balances_page(
+        self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> PageDto[ResCurrentSheetDto]:
+        """
+        Retrieve one page of balance sheets ordered by ID.
+
+        Args:
+            cursor: Opaque cursor from a previous page, or None for the first page
+            limit: Maximum number of sheets to return
+
+        Returns:
+            PageDto[ResCurrentSheetDto]: Balance sheets plus the cursor of the next page
+        """
+        return await self.repository.list_page(decode_page_cursor(cursor), limit)
+
+    async def rebuild_balances(self) -> None:
+        """
+        Recompute every asset's balance from the transactions table, e.g. once
+        for a database whose sheets predate incremental maintenance.
+        """
+        await self.repository.rebuild_balances()
+
+    async def rebuild_checkpoints(self) -> int:
+        """
+        Recompute every monthly balance checkpoint from the transactions table,
+        e.g. once for a database whose history predates checkpoints.
+
+        Returns:
+            int: Number of checkpoint rows written
+        """
+        return await self.repository.rebuild_checkpoints()
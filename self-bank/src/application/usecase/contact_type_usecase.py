@@ -1,12 +1,13 @@
 from typing import List, Optional
 from returns.result import Result, Success, Failure
 
+from ..single_flight import coalesced
 from ...domain.value_objects.dto import (
     CreateContactTypeDto,
     UpdateContactTypeDto,
     ResContactTypeDto,
 )
-from ...domain.repository.i_repository import CrudProtocol
+from ...domain.repository.i_reference_repository import ReferenceRepositoryProtocol
 
 
 class ContactTypeUseCase:
@@ -14,7 +15,7 @@ class ContactTypeUseCase:
     Use case for managing contact types (e.g., Customer, Vendor) in the system.
     This class handles all business logic related to contact type operations.
     """
-    def __init__(self, repository: CrudProtocol[CreateContactTypeDto, UpdateContactTypeDto, ResContactTypeDto]):
+    def __init__(self, repository: ReferenceRepositoryProtocol[CreateContactTypeDto, UpdateContactTypeDto, ResContactTypeDto]):
         self.repository = repository
 
     async def create_contact_type(
@@ -71,6 +72,7 @@ class ContactTypeUseCase:
         """
         return await self.repository.delete(id)
 
+    @coalesced
     async def list_contact_types(self) -> List[ResContactTypeDto]:
         """
         Retrieves all contact types in the system.
@@ -88,8 +90,7 @@ class ContactTypeUseCase:
         Returns:
             Optional[ResContactTypeDto]: The customer contact type if found, None otherwise
         """
-        types = await self.list_contact_types()
-        return next((t for t in types if t.name.lower() == "customer"), None)
+        return await self.repository.get_by_name("customer")
 
     async def get_vendor_type(self) -> Optional[ResContactTypeDto]:
         """
@@ -99,5 +100,4 @@ class ContactTypeUseCase:
         Returns:
             Optional[ResContactTypeDto]: The vendor contact type if found, None otherwise
         """
-        types = await self.list_contact_types()
-        return next((t for t in types if t.name.lower() == "vendor"), None)
+        return await self.repository.get_by_name("vendor")
@@ -1,12 +1,16 @@
 from typing import List, Optional
 from returns.result import Result, Failure
+from ..single_flight import coalesced
 from ...domain.value_objects.dto import (
     CreateContactDto,
     UpdateContactDto,
     ResContactDto,
-    ResContactTypeDto
+    ResContactTypeDto,
+    PageDto,
+    ChangesDto,
 )
 from ...domain.repository.i_repository import CrudProtocol
+from ...domain.value_objects.pagination import DEFAULT_PAGE_SIZE, decode_page_cursor, decode_change_cursor
 from ...domain.entities.schema import ContactType
 
 
@@ -74,6 +78,7 @@ class ContactUseCase:
             return Failure(Exception("Contact type must be set to VENDOR"))
         return await self.repository.create(dto)
 
+    @coalesced
     async def get_all_contacts(self) -> List[ResContactDto]:
         """
         Retrieves all contacts from the system.
@@ -83,6 +88,39 @@ class ContactUseCase:
         """
         return await self.repository.list()
 
+    @coalesced
+    async def get_contacts_page(
+        self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> PageDto[ResContactDto]:
+        """
+        Retrieves one page of contacts ordered by ID.
+        
+        Args:
+            cursor: Opaque cursor from a previous page, or None for the first page
+            limit: Maximum number of contacts to return
+        
+        Returns:
+            Contacts on this page plus the cursor of the next page
+        """
+        return await self.repository.list_page(decode_page_cursor(cursor), limit)
+
+    @coalesced
+    async def get_contact_changes(
+        self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> ChangesDto[ResContactDto]:
+        """
+        Retrieve the contacts created, updated or deleted since a change cursor.
+        
+        Args:
+            cursor: next_cursor of the previous call, or None to get every contact
+            limit: Maximum number of changes to return
+        
+        Returns:
+            Changed contacts, deleted IDs and the cursor to continue from
+        """
+        return await self.repository.changes_since(decode_change_cursor(cursor), limit)
+
+    @coalesced
     async def get_contact(self, id: int) -> Optional[ResContactDto]:
         """
         Retrieves a specific contact by ID.
@@ -2,12 +2,16 @@ from typing import Optional, List
 from returns.result import Result, Failure
 
 
+from ..single_flight import coalesced
 from ...domain.value_objects.dto import (
     CreateExpenseTypeDto,
     UpdateExpenseTypeDto,
     ResExpenseTypeDto,
+    PageDto,
+    ChangesDto,
 )
-from ...domain.repository.i_repository import CrudProtocol
+from ...domain.repository.i_reference_repository import ReferenceRepositoryProtocol
+from ...domain.value_objects.pagination import DEFAULT_PAGE_SIZE, decode_page_cursor, decode_change_cursor
 
 
 
@@ -17,12 +21,12 @@ class ExpenseTypeUseCase:
     This class handles all business logic related to expense type operations.
     """
 
-    def __init__(self, repository: CrudProtocol[CreateExpenseTypeDto, UpdateExpenseTypeDto, ResExpenseTypeDto]):
+    def __init__(self, repository: ReferenceRepositoryProtocol[CreateExpenseTypeDto, UpdateExpenseTypeDto, ResExpenseTypeDto]):
         """
         Initialize the expense type use case with its repository.
 
         Args:
-            repository: Repository implementing the CrudProtocol for expense types
+            repository: Cached repository for expense types
         """
         self.repository = repository
 
@@ -111,6 +115,7 @@ class ExpenseTypeUseCase:
         except Exception as e:
             return Failure(e)
 
+    @coalesced
     async def list_expense_types(self) -> List[ResExpenseTypeDto]:
         """
         Retrieve all expense types in the system.
@@ -120,9 +125,41 @@ class ExpenseTypeUseCase:
         """
         return await self.repository.list()
 
+    @coalesced
+    async def list_expense_types_page(
+        self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> PageDto[ResExpenseTypeDto]:
+        """
+        Retrieve one page of expense types ordered by ID.
+
+        Args:
+            cursor: Opaque cursor from a previous page, or None for the first page
+            limit: Maximum number of expense types to return
+
+        Returns:
+            Expense types on this page plus the cursor of the next page
+        """
+        return await self.repository.list_page(decode_page_cursor(cursor), limit)
+
+    @coalesced
+    async def list_expense_type_changes(
+        self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> ChangesDto[ResExpenseTypeDto]:
+        """
+        Retrieve the expense types created, updated or deleted since a change cursor.
+
+        Args:
+            cursor: next_cursor of the previous call, or None to get every expense type
+            limit: Maximum number of changes to return
+
+        Returns:
+            Changed expense types, deleted IDs and the cursor to continue from
+        """
+        return await self.repository.changes_since(decode_change_cursor(cursor), limit)
+
     async def get_expense_type_by_name(self, name: str) -> Optional[ResExpenseTypeDto]:
         """
-        Find an expense type by its name.
+        Find an expense type by its name (case-insensitive).
 
         Args:
             name: The name of the expense type to find
@@ -130,6 +167,4 @@ class ExpenseTypeUseCase:
         Returns:
             Optional expense type DTO if found, None otherwise
         """
-        # This would require additional repository method to search by name
-        # Implementation depends on repository capabilities
-        raise NotImplementedError("Search by name not implemented in repository")
+        return await self.repository.get_by_name(name)
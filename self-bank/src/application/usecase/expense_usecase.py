@@ -2,12 +2,16 @@ from typing import Optional, List
 from returns.result import Result, Failure
 
 
+from ..single_flight import coalesced
 from ...domain.value_objects.dto import (
     CreateExpenseDto,
     UpdateExpenseDto,
     ResExpenseDto,
+    PageDto,
+    ChangesDto,
 )
 from ...domain.repository.i_repository import CrudProtocol
+from ...domain.value_objects.pagination import DEFAULT_PAGE_SIZE, decode_page_cursor, decode_change_cursor
 
 
 class ExpenseUseCase:
@@ -53,6 +57,7 @@ class ExpenseUseCase:
         except Exception as e:
             return Failure(e)
 
+    @coalesced
     async def get_expense(self, id: int) -> Optional[ResExpenseDto]:
         """
         Retrieve a specific expense by its ID.
@@ -115,6 +120,7 @@ class ExpenseUseCase:
         except Exception as e:
             return Failure(e)
 
+    @coalesced
     async def list_expenses(self) -> List[ResExpenseDto]:
         """
         Retrieve all defined expense items in the system.
@@ -123,3 +129,35 @@ class ExpenseUseCase:
             List of all expense records
         """
         return await self.repository.list()
+
+    @coalesced
+    async def list_expenses_page(
+        self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> PageDto[ResExpenseDto]:
+        """
+        Retrieve one page of expense records ordered by ID.
+        
+        Args:
+            cursor: Opaque cursor from a previous page, or None for the first page
+            limit: Maximum number of expenses to return
+            
+        Returns:
+            Expenses on this page plus the cursor of the next page
+        """
+        return await self.repository.list_page(decode_page_cursor(cursor), limit)
+
+    @coalesced
+    async def list_expense_changes(
+        self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> ChangesDto[ResExpenseDto]:
+        """
+        Retrieve the expenses created, updated or deleted since a change cursor.
+            
+        Args:
+            cursor: next_cursor of the previous call, or None to get every expense
+            limit: Maximum number of changes to return
+            
+        Returns:
+            Changed expenses, deleted IDs and the cursor to continue from
+        """
+        return await self.repository.changes_since(decode_change_cursor(cursor), limit)
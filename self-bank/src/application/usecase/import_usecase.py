@@ -0,0 +1,231 @@
+import asyncio
+import os
+from itertools import islice
+from typing import Awaitable, Callable, Dict, Generator, Iterator, List, Optional, Tuple
+from decimal import Decimal
+from returns.result import Result, Success, Failure
+
+from .transaction_usecase import TransactionUseCase, MAX_KEY_LENGTH
+from ...domain.value_objects.dto import (
+    CreateTransactionDto,
+    TransactionTypeEnum,
+    ImportStatementDto,
+    ImportMappingDto,
+    ImportErrorDto,
+    ImportStatusEnum,
+    ResImportJobDto,
+    ResImportResultDto,
+    StatementFormatEnum,
+)
+from ...domain.value_objects.statement import StatementLine, StatementReader
+from ...domain.repository.i_import_job_repository import ImportJobRepositoryProtocol
+
+# Records written per DB transaction are bounded so one chunk stays a short transaction
+MAX_IMPORT_BATCH_SIZE = 5000
+# Skipped records reported back in detail; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+# transactions.note is a VARCHAR
+MAX_NOTE_LENGTH = 255
+
+ImportProgress = Callable[[ResImportJobDto], Awaitable[None]]
+
+
+class ImportUseCase:
+    """
+    Import Use Case - streams a bank statement into transactions. Records are
+    read lazily, mapped and validated a chunk at a time, and each chunk is
+    written with one bulk insert together with the job's new offset, so memory
+    stays flat and an interrupted import can be resumed where it stopped.
+    Reading and mapping run in a worker thread, off the event loop.
+
+    Statement paths are relative to the import directory and may not leave
+    it, so a client can only import the files put there for it.
+    """
+
+    def __init__(self, repository: ImportJobRepositoryProtocol, reader: StatementReader, import_dir: str):
+        """
+        Initialize the Import Use Case.
+
+        Args:
+            repository: Repository of import jobs, which also writes their transactions
+            reader: Streams the records of a statement file from an offset
+            import_dir: Directory statement files are imported from
+        """
+        self.repository = repository
+        self.reader = reader
+        self.import_dir = os.path.realpath(import_dir)
+
+    async def import_statement(
+        self, dto: ImportStatementDto, on_progress: Optional[ImportProgress] = None
+    ) -> Result[ResImportResultDto, Exception]:
+        """
+        Import a CSV, OFX or QIF statement, or resume an earlier import.
+
+        Args:
+            dto: File, asset and column/rule mapping; job_id resumes an earlier job
+            on_progress: Awaited with the job after every committed chunk
+
+        Returns:
+            Result[ResImportResultDto, Exception]: The finished job and the first
+            skipped records, or error
+        """
+        if not 1 <= dto.batch_size <= MAX_IMPORT_BATCH_SIZE:
+            return Failure(ValueError(f"batch_size must be between 1 and {MAX_IMPORT_BATCH_SIZE}"))
+        if dto.start_offset is not None and dto.start_offset < 0:
+            return Failure(ValueError("start_offset must not be negative"))
+
+        started = await self._start_job(dto)
+        if isinstance(started, Failure):
+            return started
+        job = started.unwrap()
+
+        errors: List[ImportErrorDto] = []
+        lines: Optional[Iterator[StatementLine]] = None
+        try:
+            lines = self.reader(
+                self._resolve(job.source), job.file_format, dto.mapping,
+                dto.start_offset if dto.start_offset is not None else job.next_offset,
+            )
+            while True:
+                # The file is read and parsed in a worker thread, one chunk at
+                # a time, so a large statement does not stall other requests
+                chunk, transactions, skipped = await asyncio.to_thread(
+                    self._read_chunk, lines, dto.batch_size, job.asset_id, dto.mapping
+                )
+                if not chunk:
+                    break
+
+                written = await self.repository.write_chunk(
+                    job.id, transactions, job.next_offset, chunk[-1].offset + 1, len(skipped)
+                )
+                if isinstance(written, Failure):
+                    await self.repository.set_status(job.id, ImportStatusEnum.FAILED, str(written.failure()))
+                    return written
+                job = written.unwrap()
+
+                errors.extend(skipped[:MAX_REPORTED_ERRORS - len(errors)])
+                if on_progress is not None:
+                    await on_progress(job)
+        except Exception as e:
+            # Unreadable file, a mapping that does not fit it or a failing
+            # progress report; the job keeps its offset so it can be resumed
+            await self.repository.set_status(job.id, ImportStatusEnum.FAILED, str(e))
+            return Failure(e)
+        finally:
+            self._close(lines)
+
+        finished = await self.repository.set_status(job.id, ImportStatusEnum.COMPLETED)
+        if isinstance(finished, Failure):
+            return finished
+        return Success(ResImportResultDto(job=finished.unwrap(), errors=errors))
+
+    async def get_import_job(self, id: int) -> Optional[ResImportJobDto]:
+        """
+        Get an import job, to follow its progress or find where to resume it.
+
+        Args:
+            id: Import job ID
+
+        Returns:
+            Optional[ResImportJobDto]: The job, or None if it does not exist
+        """
+        return await self.repository.get(id)
+
+    async def _start_job(self, dto: ImportStatementDto) -> Result[ResImportJobDto, Exception]:
+        if dto.job_id is None:
+            try:
+                self._resolve(dto.path)
+                file_format = dto.file_format or self._format_from_path(dto.path)
+            except ValueError as e:
+                return Failure(e)
+            return await self.repository.create_job(dto.path, file_format, dto.asset_id)
+
+        job = await self.repository.get(dto.job_id)
+        if job is None:
+            return Failure(Exception("Import job not found"))
+        if job.status == ImportStatusEnum.COMPLETED:
+            return Failure(Exception(f"Import job {job.id} is already completed"))
+        return await self.repository.set_status(job.id, ImportStatusEnum.RUNNING)
+
+    def _resolve(self, path: str) -> str:
+        # Symlinks and '..' are resolved first, so neither can lead outside
+        resolved = os.path.realpath(os.path.join(self.import_dir, path))
+        if os.path.commonpath([self.import_dir, resolved]) != self.import_dir:
+            raise ValueError(f"Statement '{path}' is not inside the import directory")
+        return resolved
+
+    @staticmethod
+    def _close(lines: Optional[Iterator[StatementLine]]) -> None:
+        # Closes the statement file. A reader still running in a worker thread,
+        # when the import was cancelled mid-chunk, cannot be closed yet; it
+        # closes the file once collected
+        if isinstance(lines, Generator) and not lines.gi_running:
+            lines.close()
+
+    def _read_chunk(
+        self, lines: Iterator[StatementLine], batch_size: int, asset_id: int, mapping: ImportMappingDto
+    ) -> Tuple[List[StatementLine], List[CreateTransactionDto], List[ImportErrorDto]]:
+        chunk = list(islice(lines, batch_size))
+        transactions, skipped = self._map_chunk(chunk, asset_id, mapping)
+        return chunk, transactions, skipped
+
+    def _map_chunk(
+        self, chunk: List[StatementLine], asset_id: int, mapping: ImportMappingDto
+    ) -> Tuple[List[CreateTransactionDto], List[ImportErrorDto]]:
+        expense_rules = self._rules(mapping.expense_rules)
+        contact_rules = self._rules(mapping.contact_rules)
+        transactions: List[CreateTransactionDto] = []
+        skipped: List[ImportErrorDto] = []
+        for line in chunk:
+            transaction, error = self._to_transaction(line, asset_id, mapping, expense_rules, contact_rules)
+            if transaction is None:
+                skipped.append(ImportErrorDto(offset=line.offset, error=error or "Unreadable record"))
+            else:
+                transactions.append(transaction)
+        return transactions, skipped
+
+    @staticmethod
+    def _to_transaction(
+        line: StatementLine,
+        asset_id: int,
+        mapping: ImportMappingDto,
+        expense_rules: List[Tuple[str, int]],
+        contact_rules: List[Tuple[str, int]],
+    ) -> Tuple[Optional[CreateTransactionDto], Optional[str]]:
+        if line.error is not None or line.amount is None:
+            return None, line.error
+        if line.amount == Decimal("0"):
+            return None, "Amount is zero"
+
+        text = f"{line.payee} {line.description}".lower()
+        is_payment = line.amount < 0
+        expense_id = None
+        if is_payment:
+            expense_id = next((id for needle, id in expense_rules if needle in text), mapping.default_expense_id)
+        transaction = CreateTransactionDto(
+            transaction_type=TransactionTypeEnum.PAYMENT if is_payment else TransactionTypeEnum.INCOME,
+            amount=abs(line.amount),
+            asset_id=asset_id,
+            expense_id=expense_id,
+            contact_id=next((id for needle, id in contact_rules if needle in text), None),
+            note=(line.description or line.payee)[:MAX_NOTE_LENGTH] or None,
+            created_at=line.posted_at,
+            external_ref=line.reference[:MAX_KEY_LENGTH] or None,
+        )
+        # The same rules as transactions recorded one by one
+        error = TransactionUseCase.validate_transaction(transaction)
+        if error is not None:
+            return None, error
+        return transaction, None
+
+    @staticmethod
+    def _format_from_path(path: str) -> StatementFormatEnum:
+        extension = path.rsplit(".", 1)[-1].lower()
+        try:
+            return StatementFormatEnum(extension)
+        except ValueError:
+            raise ValueError(f"Cannot tell the statement format of '{path}'; pass file_format")
+
+    @staticmethod
+    def _rules(rules: Dict[str, int]) -> List[Tuple[str, int]]:
+        return [(needle.lower(), id) for needle, id in rules.items() if needle.strip()]
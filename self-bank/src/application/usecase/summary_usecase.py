@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime
+from typing import List
+
+from ..single_flight import coalesced
+from ...domain.value_objects.dto import (
+    ResMonthlySummaryDto,
+    ResExpenseTypeSummaryDto,
+    ResContactSummaryDto,
+)
+from ...domain.repository.i_summary_repository import SummaryRepositoryProtocol
+
+TOP_CONTACTS_LIMIT = 10
+
+
+class SummaryUseCase:
+    """
+    Summary Use Case - serves monthly dashboards from the pre-aggregated
+    monthly rollups, which every ledger write keeps up to date.
+    """
+
+    def __init__(self, repository: SummaryRepositoryProtocol):
+        """
+        Initialize the Summary Use Case with its repository.
+
+        Args:
+            repository: Repository reading and rebuilding the monthly rollups
+        """
+        self.repository = repository
+
+    @coalesced
+    async def get_monthly_summary(self, start_month: str, end_month: str) -> List[ResMonthlySummaryDto]:
+        """
+        Income vs payment per month.
+
+        Args:
+            start_month: First month, 'YYYY-MM' (inclusive)
+            end_month: Last month, 'YYYY-MM' (inclusive)
+
+        Returns:
+            List[ResMonthlySummaryDto]: One entry per month that has transactions
+        """
+        self._check_months(start_month, end_month)
+        return await self.repository.monthly_totals(start_month, end_month)
+
+    @coalesced
+    async def get_expense_type_summary(self, start_month: str, end_month: str) -> List[ResExpenseTypeSummaryDto]:
+        """
+        Payments per expense type, largest first.
+
+        Args:
+            start_month: First month, 'YYYY-MM' (inclusive)
+            end_month: Last month, 'YYYY-MM' (inclusive)
+
+        Returns:
+            List[ResExpenseTypeSummaryDto]: Spend per expense type
+        """
+        self._check_months(start_month, end_month)
+        return await self.repository.expense_type_totals(start_month, end_month)
+
+    @coalesced
+    async def get_top_contacts(
+        self, start_month: str, end_month: str, limit: int = TOP_CONTACTS_LIMIT
+    ) -> List[ResContactSummaryDto]:
+        """
+        Contacts with the largest income plus payment volume.
+
+        Args:
+            start_month: First month, 'YYYY-MM' (inclusive)
+            end_month: Last month, 'YYYY-MM' (inclusive)
+            limit: Maximum number of contacts to return
+
+        Returns:
+            List[ResContactSummaryDto]: Contacts ordered by volume
+        """
+        self._check_months(start_month, end_month)
+        return await self.repository.top_contacts(start_month, end_month, limit)
+
+    async def rebuild_rollups(self, concurrency: int = 4) -> int:
+        """
+        Recompute every monthly rollup from the transactions table. Each month
+        is rebuilt in its own DB transaction, up to `concurrency` at a time.
+
+        Args:
+            concurrency: Number of months rebuilt in parallel
+
+        Returns:
+            int: Number of rollup rows written
+        """
+        months = await self.repository.ledger_months()
+        gate = asyncio.Semaphore(max(concurrency, 1))
+
+        async def rebuild(month: str) -> int:
+            async with gate:
+                return await self.repository.rebuild_month(month)
+
+        written = await asyncio.gather(*(rebuild(month) for month in months))
+        await self.repository.prune_except(months)
+        return sum(written)
+
+    @staticmethod
+    def _check_months(start_month: str, end_month: str) -> None:
+        for month in (start_month, end_month):
+            try:
+                # Zero-padded so months compare correctly as strings
+                if len(month) != 7:
+                    raise ValueError
+                datetime.strptime(month, '%Y-%m')
+            except ValueError:
+                raise ValueError("Month must be in format 'YYYY-MM'")
+        if start_month > end_month:
+            raise ValueError("start_month must not be after end_month")
@@ -1,8 +1,18 @@
-from returns.result import Result, Failure
+from typing import List, Optional
+from returns.result import Result, Success, Failure
 from ...domain.repository.i_tranfer_repository import TranferRepositoryProtocol
-from ...domain.value_objects.dto import TransferFundDto
+from ...domain.value_objects.dto import (
+    TransferFundDto,
+    TransferItemResultDto,
+    BatchTransferResultDto,
+)
 from decimal import Decimal
 
+# Balances are stored with two decimal places
+CENT = Decimal('0.01')
+# Upper bound on transfers applied in one DB transaction
+MAX_BATCH_TRANSFERS = 500
+
 
 class TransferUseCase:
     def __init__(self, repo: TranferRepositoryProtocol) -> None:
@@ -20,21 +30,61 @@ class TransferUseCase:
             
         Business Rules:
         1. Source and destination assets must be different
-        2. Amount must be positive
+        2. Amount must be positive, with at most two decimal places
         3. Source asset must have sufficient funds
         4. Both assets must exist
         """
         try:
-            # Validate transfer amount
-            if dto.amount <= Decimal('0'):
-                return Failure(ValueError("Transfer amount must be greater than zero"))
-
-            # Validate source and destination are different
-            if dto.source_asset_id == dto.destination_asset_id:
-                return Failure(ValueError("Source and destination assets must be different"))
+            error = self._validate_transfer(dto)
+            if error:
+                return Failure(ValueError(error))
 
             # Execute transfer through repository
             return await self._repo.transfer_fund(dto)
 
         except Exception as e:
-            return Failure(e)
\ No newline at end of file
+            return Failure(e)
+
+    async def transfer_many(self, dtos: List[TransferFundDto]) -> Result[BatchTransferResultDto, Exception]:
+        """
+        Apply many transfers atomically in a single DB transaction.
+
+        Args:
+            dtos (List[TransferFundDto]): Transfers to apply, in order
+
+        Returns:
+            Result[BatchTransferResultDto, Exception]: Per-item results. committed is
+            False (and nothing is applied) if any item fails; Failure on DB errors
+
+        Business Rules:
+        1. Every item must pass the same rules as transfer_fund
+        2. Items are applied in order, so later items may spend funds received earlier
+        3. Either every transfer is applied or none is
+        """
+        try:
+            if not dtos:
+                return Failure(ValueError("At least one transfer is required"))
+            if len(dtos) > MAX_BATCH_TRANSFERS:
+                return Failure(ValueError(f"At most {MAX_BATCH_TRANSFERS} transfers are allowed per batch"))
+
+            items = [
+                TransferItemResultDto(index=index, success=error is None, error=error)
+                for index, error in enumerate(self._validate_transfer(dto) for dto in dtos)
+            ]
+            if any(not item.success for item in items):
+                return Success(BatchTransferResultDto(committed=False, items=items))
+
+            return await self._repo.transfer_many(dtos)
+
+        except Exception as e:
+            return Failure(e)
+
+    def _validate_transfer(self, dto: TransferFundDto) -> Optional[str]:
+        """Return the first broken business rule for a transfer, or None."""
+        if dto.amount <= Decimal('0'):
+            return "Transfer amount must be greater than zero"
+        if dto.amount != dto.amount.quantize(CENT):
+            return "Transfer amount must have at most two decimal places"
+        if dto.source_asset_id == dto.destination_asset_id:
+            return "Source and destination assets must be different"
+        return None
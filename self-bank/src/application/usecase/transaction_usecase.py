@@ -1,28 +1,49 @@
-from typing import Optional, List
+from typing import Optional, List, AsyncIterator, Tuple
+from decimal import Decimal
 from returns.result import Result, Success, Failure
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
+from ..group_commit import GroupCommit
+from ..single_flight import coalesced
 from ...domain.value_objects.dto import (
     CreateTransactionDto,
     UpdateTransactionDto,
     ResTransactionDto,
     TransferFundDto,
-    TransactionTypeEnum
+    TransactionTypeEnum,
+    TransactionFilterDto,
+    ResBalanceAsOfDto,
+    TransactionItemResultDto,
+    BatchTransactionResultDto,
+    ResDuplicateReportDto,
+    PageDto,
+    ChangesDto,
 )
-from ...domain.repository.i_repository import CrudProtocol
+from ...domain.repository.i_transaction_repository import TransactionRepositoryProtocol
+from ...domain.value_objects.pagination import DEFAULT_PAGE_SIZE, decode_page_cursor, decode_change_cursor
+
+# Upper bound on transactions written in one DB transaction
+MAX_BATCH_TRANSACTIONS = 5000
+# Width of the transactions.idempotency_key and external_ref columns
+MAX_KEY_LENGTH = 64
 
 
 class TransactionUseCase:
     def __init__(
         self,
-        repository: CrudProtocol[
-            CreateTransactionDto,
-            UpdateTransactionDto,
-            ResTransactionDto,
-        ]
+        repository: TransactionRepositoryProtocol,
+        group_commit: bool = False,
+        group_commit_max_batch: int = 200,
+        group_commit_max_latency: float = 0.005,
     ):
         self.repository = repository
+        # In group-commit mode single incomes and payments arriving together
+        # are written with one INSERT and one commit
+        self.group_commit: Optional[GroupCommit[CreateTransactionDto, ResTransactionDto]] = (
+            GroupCommit(self._create_group, group_commit_max_batch, group_commit_max_latency)
+            if group_commit else None
+        )
 
     async def record_income(
         self, dto: CreateTransactionDto
@@ -30,7 +51,10 @@ class TransactionUseCase:
         """Record an income transaction."""
         if dto.transaction_type != TransactionTypeEnum.INCOME:
             return Failure(Exception("Transaction type must be Income"))
-        return await self.repository.create(dto)
+        error = self._key_error(dto)
+        if error is not None:
+            return Failure(ValueError(error))
+        return await self._create(dto)
 
     async def record_payment(
         self, dto: CreateTransactionDto
@@ -40,8 +64,59 @@ class TransactionUseCase:
             return Failure(Exception("Transaction type must be Payment"))
         if not dto.expense_id:
             return Failure(Exception("Payment must have an expense_id"))
-        return await self.repository.create(dto)
+        error = self._key_error(dto)
+        if error is not None:
+            return Failure(ValueError(error))
+        return await self._create(dto)
+
+    async def record_many(
+        self, dtos: List[CreateTransactionDto]
+    ) -> Result[BatchTransactionResultDto, Exception]:
+        """
+        Record many income and payment transactions in a single DB transaction.
+
+        Every item is checked before anything is written; if any item fails,
+        nothing is written and each item reports its result. Balances and
+        monthly rollups are updated once per asset and month, not per row.
+        """
+        if not dtos:
+            return Failure(ValueError("At least one transaction is required"))
+        if len(dtos) > MAX_BATCH_TRANSACTIONS:
+            return Failure(ValueError(f"At most {MAX_BATCH_TRANSACTIONS} transactions are allowed per batch"))
+
+        items = [
+            TransactionItemResultDto(index=index, success=error is None, error=error)
+            for index, error in enumerate(self.validate_transaction(dto) for dto in dtos)
+        ]
+        if any(not item.success for item in items):
+            return Success(BatchTransactionResultDto(committed=False, ids=[], items=items))
 
+        created = await self.repository.create_many(dtos)
+        if isinstance(created, Failure):
+            return created
+        return Success(BatchTransactionResultDto(
+            committed=True, ids=[t.id for t in created.unwrap()], items=items
+        ))
+
+    async def _create(self, dto: CreateTransactionDto) -> Result[ResTransactionDto, Exception]:
+        if self.group_commit is None:
+            return await self.repository.create(dto)
+        return await self.group_commit.submit(dto)
+
+    async def _create_group(
+        self, dtos: List[CreateTransactionDto]
+    ) -> List[Result[ResTransactionDto, Exception]]:
+        """Writes a group-commit batch; each item gets its own result."""
+        created = await self.repository.create_many(dtos)
+        if not isinstance(created, Failure):
+            return [Success(item) for item in created.unwrap()]
+        if len(dtos) == 1:
+            return [Failure(created.failure())]
+        # One bad row fails the whole INSERT; written one by one, only its
+        # own caller sees the error
+        return [await self.repository.create(dto) for dto in dtos]
+
+    @coalesced
     async def get_transaction(self, id: int) -> Optional[ResTransactionDto]:
         """Get a single transaction by ID."""
         return await self.repository.get(id)
@@ -49,45 +124,129 @@ class TransactionUseCase:
     async def update_transaction(
         self, id: int, dto: UpdateTransactionDto
     ) -> Result[ResTransactionDto, Exception]:
-        """Update an existing transaction."""
+        """
+        Update an existing transaction. The result must still pass the rules
+        of record_income/record_payment, and transfers keep their type: they
+        are only recorded through the transfer API, which checks both assets.
+        """
+        current = await self.repository.get(id)
+        if current is None:
+            return Failure(Exception("Transaction not found"))
+        error = self.validate_update(current, dto)
+        if error is not None:
+            return Failure(ValueError(error))
         return await self.repository.update(id, dto)
 
     async def delete_transaction(self, id: int) -> Result[bool, Exception]:
         """Delete a transaction if it's safe to do so."""
         return await self.repository.delete(id)
 
+    @coalesced
     async def list_transactions(self) -> List[ResTransactionDto]:
         """Get all transactions (both income and payments)."""
         return await self.repository.list()
 
+    @coalesced
+    async def list_transactions_page(
+        self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> PageDto[ResTransactionDto]:
+        """Get one page of transactions ordered by ID, plus the next page cursor."""
+        return await self.repository.list_page(decode_page_cursor(cursor), limit)
+
+    @coalesced
+    async def list_transaction_changes(
+        self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> ChangesDto[ResTransactionDto]:
+        """Get the transactions created, updated or deleted since a change cursor, plus the cursor to continue from."""
+        return await self.repository.changes_since(decode_change_cursor(cursor), limit)
+
+    def stream_transactions(self, chunk_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[ResTransactionDto]:
+        """Iterate over every transaction, fetched from the server in chunks."""
+        return self.repository.iter_all(chunk_size)
+
+    @coalesced
     async def get_income_transactions(self) -> List[ResTransactionDto]:
         """Get only income transactions."""
-        all_transactions = await self.repository.list()
-        return [
-            t for t in all_transactions 
-            if t.transaction_type == TransactionTypeEnum.INCOME
-        ]
+        return await self.repository.list_filtered(
+            TransactionFilterDto(transaction_type=TransactionTypeEnum.INCOME)
+        )
 
+    @coalesced
     async def get_payment_transactions(self) -> List[ResTransactionDto]:
         """Get only payment transactions."""
-        all_transactions = await self.repository.list()
-        return [
-            t for t in all_transactions 
-            if t.transaction_type == TransactionTypeEnum.PAYMENT
-        ]
+        return await self.repository.list_filtered(
+            TransactionFilterDto(transaction_type=TransactionTypeEnum.PAYMENT)
+        )
 
+    @coalesced
     async def get_transactions_by_month(self, month: str) -> List[ResTransactionDto]:
         """Get all transactions in a given month (format: 'YYYY-MM')."""
+        start, end = self._month_range(month)
+        return await self.repository.list_filtered(TransactionFilterDto(start=start, end=end))
+
+    @coalesced
+    async def filter_transactions(self, filters: TransactionFilterDto) -> List[ResTransactionDto]:
+        """Get transactions matching every field set on the filter."""
+        return await self.repository.list_filtered(filters)
+
+    @coalesced
+    async def find_duplicates(self) -> ResDuplicateReportDto:
+        """Get groups of transactions that look like the same one recorded twice."""
+        return await self.repository.duplicate_report()
+
+    @coalesced
+    async def get_balance_as_of(self, asset_id: int, as_of: str) -> ResBalanceAsOfDto:
+        """Get an asset's balance at the end of a given day (format: 'YYYY-MM-DD')."""
+        try:
+            day = datetime.strptime(as_of, '%Y-%m-%d')
+        except ValueError:
+            raise ValueError("Date must be in format 'YYYY-MM-DD'")
+        balance = await self.repository.balance_as_of(asset_id, day + timedelta(days=1))
+        return ResBalanceAsOfDto(asset_id=asset_id, as_of=day.date(), balance=balance)
+
+    @staticmethod
+    def validate_transaction(dto: CreateTransactionDto) -> Optional[str]:
+        """Return the first broken rule of record_income/record_payment, or None."""
+        if dto.transaction_type not in (TransactionTypeEnum.INCOME, TransactionTypeEnum.PAYMENT):
+            return "Transaction type must be Income or Payment"
+        if dto.transaction_type == TransactionTypeEnum.PAYMENT and not dto.expense_id:
+            return "Payment must have an expense_id"
+        if dto.amount <= Decimal('0'):
+            return "Transaction amount must be greater than zero"
+        return TransactionUseCase._key_error(dto)
+
+    @staticmethod
+    def validate_update(current: ResTransactionDto, dto: UpdateTransactionDto) -> Optional[str]:
+        """Return the first rule `dto` would break applied to `current`, or None."""
+        if dto.transaction_type is not None and dto.transaction_type != current.transaction_type:
+            if TransactionTypeEnum.TRANSFER in (dto.transaction_type, current.transaction_type):
+                return "Transfers cannot be turned into or from other transaction types"
+        if dto.amount is not None and dto.amount <= Decimal('0'):
+            return "Transaction amount must be greater than zero"
+        transaction_type = dto.transaction_type or current.transaction_type
+        expense_id = dto.expense_id if "expense_id" in dto.model_fields_set else current.expense_id
+        if transaction_type == TransactionTypeEnum.PAYMENT and not expense_id:
+            return "Payment must have an expense_id"
+        return None
+
+    @staticmethod
+    def _key_error(dto: CreateTransactionDto) -> Optional[str]:
+        if dto.idempotency_key is not None and not 0 < len(dto.idempotency_key) <= MAX_KEY_LENGTH:
+            return f"idempotency_key must be 1 to {MAX_KEY_LENGTH} characters"
+        if dto.external_ref is not None and not 0 < len(dto.external_ref) <= MAX_KEY_LENGTH:
+            return f"external_ref must be 1 to {MAX_KEY_LENGTH} characters"
+        return None
+
+    @staticmethod
+    def _month_range(month: str) -> Tuple[datetime, datetime]:
+        """Return the [first day, first day of next month) range for 'YYYY-MM'."""
         try:
-            # Validate month format
-            datetime.strptime(month, '%Y-%m')
-            all_transactions = await self.repository.list()
-            return [
-                t for t in all_transactions 
-                if t.created_at and t.created_at.strftime('%Y-%m') == month
-            ]
+            start = datetime.strptime(month, '%Y-%m')
         except ValueError:
             raise ValueError("Month must be in format 'YYYY-MM'")
+        if start.month == 12:
+            return start, start.replace(year=start.year + 1, month=1)
+        return start, start.replace(month=start.month + 1)
 
     async def transfer_fund(self, dto: TransferFundDto) -> Result[bool, Exception]:
         """Transfer funds between assets."""
@@ -0,0 +1,44 @@
+import os
+from dotenv import load_dotenv
+from dataclasses import dataclass
+
+# Load environment variables from the .env file (if present)
+load_dotenv()
+
+
+@dataclass
+class AdmissionConfig:
+    # Requests of each class running at once. Together they may exceed the
+    # shared capacity; when it is short, writes go first, then reads, then
+    # reports, which their small limit throttles further
+    read_concurrency: int = int(os.environ.get("ADMISSION_READ_CONCURRENCY", 24))
+    write_concurrency: int = int(os.environ.get("ADMISSION_WRITE_CONCURRENCY", 16))
+    report_concurrency: int = int(os.environ.get("ADMISSION_REPORT_CONCURRENCY", 4))
+
+    # Requests of all classes running at once; 0 means the pool's size plus
+    # overflow, i.e. one connection each
+    capacity: int = int(os.environ.get("ADMISSION_CAPACITY", 0))
+    # Slots of the capacity only writes may take, so a write never waits
+    # behind a read or report flood for a connection
+    write_reserve: int = int(os.environ.get("ADMISSION_WRITE_RESERVE", 4))
+
+    # Requests of each class allowed to wait for a slot; beyond that they are
+    # rejected at once with a retry-after hint
+    read_queue: int = int(os.environ.get("ADMISSION_READ_QUEUE", 100))
+    write_queue: int = int(os.environ.get("ADMISSION_WRITE_QUEUE", 200))
+    report_queue: int = int(os.environ.get("ADMISSION_REPORT_QUEUE", 20))
+
+    # Seconds a request may take, waiting included, before it is cancelled
+    read_deadline: float = float(os.environ.get("ADMISSION_READ_DEADLINE", 10))
+    write_deadline: float = float(os.environ.get("ADMISSION_WRITE_DEADLINE", 15))
+    report_deadline: float = float(os.environ.get("ADMISSION_REPORT_DEADLINE", 30))
+
+    def __post_init__(self):
+        if min(self.read_concurrency, self.write_concurrency, self.report_concurrency) < 1:
+            raise ValueError("ADMISSION_*_CONCURRENCY must be >= 1.")
+        if min(self.read_queue, self.write_queue, self.report_queue) < 0:
+            raise ValueError("ADMISSION_*_QUEUE must be >= 0.")
+        if min(self.read_deadline, self.write_deadline, self.report_deadline) <= 0:
+            raise ValueError("ADMISSION_*_DEADLINE must be > 0.")
+        if self.capacity < 0 or self.write_reserve < 0:
+            raise ValueError("ADMISSION_CAPACITY and ADMISSION_WRITE_RESERVE must be >= 0.")
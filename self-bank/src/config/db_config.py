@@ -5,6 +5,14 @@ from dataclasses import dataclass
 # Load environment variables from the .env file (if present)
 load_dotenv()
 
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 @dataclass
 class DbConfig:
     user: str = os.environ.get("MYSQL_USER", "")
@@ -13,7 +21,40 @@ class DbConfig:
     port: int = int(os.environ.get("MYSQL_PORT", 3306))
     database: str = os.environ.get("MYSQL_DATABASE_NAME", "")
 
+    # Connection pool tuning
+    pool_size: int = int(os.environ.get("MYSQL_POOL_SIZE", 10))
+    max_overflow: int = int(os.environ.get("MYSQL_MAX_OVERFLOW", 20))
+    pool_timeout: float = float(os.environ.get("MYSQL_POOL_TIMEOUT", 10))
+    # Recycle well before MySQL's wait_timeout (8h default) drops idle connections
+    pool_recycle: int = int(os.environ.get("MYSQL_POOL_RECYCLE", 1800))
+    pool_pre_ping: bool = _env_bool("MYSQL_POOL_PRE_PING", True)
+    # Number of connections opened at startup, capped at pool_size
+    pool_warmup: int = int(os.environ.get("MYSQL_POOL_WARMUP", 5))
+    # SQL logging: "off", "info" (statements) or "debug" (statements and rows)
+    echo: str = os.environ.get("MYSQL_ECHO", "off").strip().lower()
+
+    # Group commit: single incomes/payments arriving within max_latency_ms of
+    # each other are written together, up to max_batch per INSERT and commit
+    group_commit: bool = _env_bool("MYSQL_GROUP_COMMIT", False)
+    group_commit_max_batch: int = int(os.environ.get("MYSQL_GROUP_COMMIT_MAX_BATCH", 200))
+    group_commit_max_latency_ms: float = float(os.environ.get("MYSQL_GROUP_COMMIT_MAX_LATENCY_MS", 5))
+
+    # Statements slower than slow_query_ms are logged, a sample_rate share of
+    # them with a digest of their parameters; a request running one statement
+    # n_plus_one times or more is flagged as an N+1 pattern
+    slow_query_ms: float = float(os.environ.get("MYSQL_SLOW_QUERY_MS", 200))
+    slow_query_sample_rate: float = float(os.environ.get("MYSQL_SLOW_QUERY_SAMPLE_RATE", 0.1))
+    n_plus_one_threshold: int = int(os.environ.get("MYSQL_N_PLUS_ONE_THRESHOLD", 10))
+
     def __post_init__(self):
         # You can add validation here to ensure the required fields are set
         if not self.user or not self.password or not self.database:
             raise ValueError("MYSQL_USER, MYSQL_PASSWORD, and MYSQL_DATABASE_NAME are required.")
+        if self.pool_size < 1 or self.max_overflow < 0:
+            raise ValueError("MYSQL_POOL_SIZE must be >= 1 and MYSQL_MAX_OVERFLOW must be >= 0.")
+        if self.echo not in ("off", "info", "debug"):
+            raise ValueError("MYSQL_ECHO must be one of: off, info, debug.")
+        if self.group_commit_max_batch < 1 or self.group_commit_max_latency_ms < 0:
+            raise ValueError("MYSQL_GROUP_COMMIT_MAX_BATCH must be >= 1 and MYSQL_GROUP_COMMIT_MAX_LATENCY_MS must be >= 0.")
+        if self.slow_query_ms < 0 or not 0 <= self.slow_query_sample_rate <= 1 or self.n_plus_one_threshold < 2:
+            raise ValueError("MYSQL_SLOW_QUERY_MS must be >= 0, MYSQL_SLOW_QUERY_SAMPLE_RATE within 0..1 and MYSQL_N_PLUS_ONE_THRESHOLD >= 2.")
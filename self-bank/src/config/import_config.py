@@ -0,0 +1,17 @@
+import os
+from dotenv import load_dotenv
+from dataclasses import dataclass
+
+# Load environment variables from the .env file (if present)
+load_dotenv()
+
+
+@dataclass
+class ImportConfig:
+    # Directory statement files are imported from; paths given by clients are
+    # relative to it and may not leave it
+    import_dir: str = os.environ.get("STATEMENT_IMPORT_DIR", "imports")
+
+    def __post_init__(self):
+        if not self.import_dir:
+            raise ValueError("STATEMENT_IMPORT_DIR must not be empty.")
@@ -1,6 +1,6 @@
 from sqlalchemy import (
-    Column, Integer, String, ForeignKey,
-    DateTime, Enum, Numeric
+    Column, Integer, BigInteger, String, ForeignKey,
+    DateTime, Date, Enum, Numeric, Index, UniqueConstraint
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -10,7 +10,7 @@ import enum
 Base = declarative_base()
 
 # Enum for TransactionType
-class TransactionType(enum.Enum):
+class TransactionType(str, enum.Enum):
     INCOME = "Income"
     PAYMENT = "Payment"
     TRANSFER = "Transfer"
@@ -20,15 +20,24 @@ class TimestampMixin:
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
+# Position of a row's last change in the change sequence, stamped when the
+# writing DB transaction commits; a client syncing "changes since" reads the
+# rows past its cursor off this index
+class ChangeTrackedMixin:
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default='0', index=True)
+
 # Asset Types
-class AssetType(Base, TimestampMixin):
+class AssetType(Base, TimestampMixin, ChangeTrackedMixin):
     __tablename__ = 'asset_types'
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     name = Column(String, index=True)
+    # Lowercased, trimmed name; the unique index enforces case-insensitive
+    # uniqueness and serves lookups by name
+    normalized_name = Column(String(255), unique=True, nullable=False)
     assets = relationship('Asset', back_populates='asset_type')
 
 # Assets (e.g., Bank, Wallet, etc.)
-class Asset(Base, TimestampMixin):
+class Asset(Base, TimestampMixin, ChangeTrackedMixin):
     __tablename__ = 'assets'
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     name = Column(String, index=True)
@@ -40,14 +49,17 @@ class Asset(Base, TimestampMixin):
     current_sheets = relationship('CurrentSheet', back_populates='asset')
 
 # Expense Categories
-class ExpenseType(Base, TimestampMixin):
+class ExpenseType(Base, TimestampMixin, ChangeTrackedMixin):
     __tablename__ = 'expense_types'
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     name = Column(String, index=True)
+    # Lowercased, trimmed name; the unique index enforces case-insensitive
+    # uniqueness and serves lookups by name
+    normalized_name = Column(String(255), unique=True, nullable=False)
     expenses = relationship('Expense', back_populates='expense_type')
 
 # Expenses
-class Expense(Base, TimestampMixin):
+class Expense(Base, TimestampMixin, ChangeTrackedMixin):
     __tablename__ = 'expenses'
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     description = Column(String, index=True)
@@ -57,14 +69,17 @@ class Expense(Base, TimestampMixin):
     transactions = relationship('Transaction', back_populates='expense')
 
 # Contact Types (Customer or Vendor)
-class ContactType(Base, TimestampMixin):
+class ContactType(Base, TimestampMixin, ChangeTrackedMixin):
     __tablename__ = 'contact_types'
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     name = Column(String, index=True)
+    # Lowercased, trimmed name; the unique index enforces case-insensitive
+    # uniqueness and serves lookups by name
+    normalized_name = Column(String(255), unique=True, nullable=False)
     contacts = relationship('Contact', back_populates='contact_type')
 
 # Contacts (Customers or Vendors)
-class Contact(Base, TimestampMixin):
+class Contact(Base, TimestampMixin, ChangeTrackedMixin):
     __tablename__ = 'contacts'
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     name = Column(String, index=True)
@@ -77,7 +92,7 @@ class Contact(Base, TimestampMixin):
     transactions = relationship('Transaction', back_populates='contact')
 
 # Transactions: Income, Payment, or Transfer
-class Transaction(Base, TimestampMixin):
+class Transaction(Base, TimestampMixin, ChangeTrackedMixin):
     __tablename__ = 'transactions'
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     transaction_type = Column(Enum(TransactionType))
@@ -87,6 +102,26 @@ class Transaction(Base, TimestampMixin):
     expense_id = Column(Integer, ForeignKey('expenses.id'), nullable=True)
     contact_id = Column(Integer, ForeignKey('contacts.id'), nullable=True)
     note = Column(String, index=True)
+    external_ref = Column(String(64), nullable=True)  # id the bank gave it, e.g. the OFX FITID
+    # Hash of asset, type, amount, day, normalized note and external_ref;
+    # rows sharing one are probably the same transaction recorded twice
+    fingerprint = Column(String(40), nullable=True)
+    # Client key, or one derived from external_ref; a second insert with the
+    # same key returns the first row instead of writing another
+    idempotency_key = Column(String(64), nullable=True, unique=True)
+
+    # Composite indexes so the filtered/month queries are range scans on
+    # created_at within the equality prefix instead of full table scans
+    __table_args__ = (
+        Index('ix_transactions_created_at', 'created_at'),
+        Index('ix_transactions_type_created_at', 'transaction_type', 'created_at'),
+        Index('ix_transactions_asset_created_at', 'asset_id', 'created_at'),
+        Index('ix_transactions_destination_created_at', 'destination_asset_id', 'created_at'),
+        Index('ix_transactions_expense_created_at', 'expense_id', 'created_at'),
+        Index('ix_transactions_contact_created_at', 'contact_id', 'created_at'),
+        # The duplicate report reads rows in fingerprint order off this index
+        Index('ix_transactions_fingerprint', 'fingerprint', 'id'),
+    )
 
     asset = relationship('Asset', back_populates='transactions', foreign_keys=[asset_id])
     destination_asset = relationship('Asset', foreign_keys=[destination_asset_id])
@@ -97,8 +132,87 @@ class Transaction(Base, TimestampMixin):
 class CurrentSheet(Base):
     __tablename__ = 'current_sheets'
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
-    asset_id = Column(Integer, ForeignKey('assets.id'))
+    # One sheet per asset; the unique index also lets FOR UPDATE lock single rows
+    asset_id = Column(Integer, ForeignKey('assets.id'), unique=True)
     balance = Column(Numeric(10, 2))
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     asset = relationship('Asset', back_populates='current_sheets')
+
+# Closing balance of each asset at the end of each month, maintained on every
+# ledger write so historical balances never need a full-history sum
+class BalanceCheckpoint(Base):
+    __tablename__ = 'balance_checkpoints'
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    asset_id = Column(Integer, ForeignKey('assets.id'))
+    period_start = Column(Date)  # first day of the month
+    closing_balance = Column(Numeric(10, 2))
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('asset_id', 'period_start', name='uq_balance_checkpoints_asset_period'),
+    )
+
+# Monthly totals of the ledger, one row per (month, asset, expense type,
+# contact, transaction type), maintained on every ledger write so summaries
+# never scan the transactions table. 0 stands for "none" in the id columns:
+# NULLs would not collide in the unique key, so the upsert could not find them
+class MonthlyRollup(Base):
+    __tablename__ = 'monthly_rollups'
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    year_month = Column(String(7), nullable=False)  # 'YYYY-MM'
+    asset_id = Column(Integer, nullable=False, default=0)
+    expense_type_id = Column(Integer, nullable=False, default=0)
+    contact_id = Column(Integer, nullable=False, default=0)
+    transaction_type = Column(Enum(TransactionType), nullable=False)
+    total = Column(Numeric(14, 2), nullable=False)
+    tx_count = Column(Integer, nullable=False)
+    min_amount = Column(Numeric(10, 2), nullable=False)
+    max_amount = Column(Numeric(10, 2), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            'year_month', 'asset_id', 'expense_type_id', 'contact_id', 'transaction_type',
+            name='uq_monthly_rollups_key',
+        ),
+    )
+
+# A bank-statement import. next_offset counts the statement records already
+# handled and is advanced in the same DB transaction as each chunk of
+# transactions, so an interrupted import resumes exactly where it stopped
+class ImportJob(Base, TimestampMixin):
+    __tablename__ = 'import_jobs'
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    source = Column(String(1024), nullable=False)  # path of the statement file
+    file_format = Column(String(8), nullable=False)  # 'csv', 'ofx' or 'qif'
+    asset_id = Column(Integer, ForeignKey('assets.id'), nullable=False)
+    status = Column(String(16), nullable=False)  # 'running', 'completed' or 'failed'
+    next_offset = Column(Integer, nullable=False, default=0)
+    imported_count = Column(Integer, nullable=False, default=0)
+    skipped_count = Column(Integer, nullable=False, default=0)
+    duplicate_count = Column(Integer, nullable=False, default=0)  # records already in the ledger
+    error = Column(String(1024))
+
+# One counter per change-tracked table handing out its change sequence
+# numbers. A committing DB transaction takes the next one while holding the
+# row lock until it commits, so a table's sequence numbers become visible in
+# order and a cursor never skips one; writers of other tables do not wait
+class ChangeSequence(Base):
+    __tablename__ = 'change_sequences'
+    entity = Column(String(32), primary_key=True)  # table name, e.g. 'assets'
+    value = Column(BigInteger, nullable=False, default=0)
+
+# A deleted row of a change-tracked table, so a client syncing changes learns
+# it is gone
+class Tombstone(Base):
+    __tablename__ = 'tombstones'
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    entity = Column(String(32), nullable=False)  # table name, e.g. 'assets'
+    entity_id = Column(Integer, nullable=False)
+    change_seq = Column(BigInteger, nullable=False)
+    deleted_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index('ix_tombstones_entity_change_seq', 'entity', 'change_seq', 'entity_id'),
+    )
@@ -0,0 +1,16 @@
+from typing import Protocol, Optional
+from .i_repository import CrudProtocol
+from ..value_objects.dto import (
+    CreateCurrentSheetDto,
+    UpdateCurrentSheetDto,
+    ResCurrentSheetDto,
+)
+
+
+class CurrentSheetRepositoryProtocol(
+    CrudProtocol[CreateCurrentSheetDto, UpdateCurrentSheetDto, ResCurrentSheetDto],
+    Protocol,
+):
+    async def get_by_asset(self, asset_id: int) -> Optional[ResCurrentSheetDto]: ...
+    async def rebuild_balances(self) -> None: ...
+    async def rebuild_checkpoints(self) -> int: ...
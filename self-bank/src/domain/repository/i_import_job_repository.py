@@ -0,0 +1,19 @@
+from typing import Protocol, Optional, List
+from returns.result import Result
+from ..value_objects.dto import CreateTransactionDto, ResImportJobDto, ImportStatusEnum, StatementFormatEnum
+
+
+class ImportJobRepositoryProtocol(Protocol):
+    async def create_job(
+        self, source: str, file_format: StatementFormatEnum, asset_id: int
+    ) -> Result[ResImportJobDto, Exception]: ...
+
+    async def get(self, id: int) -> Optional[ResImportJobDto]: ...
+
+    async def write_chunk(
+        self, id: int, dtos: List[CreateTransactionDto], expected_offset: int, next_offset: int, skipped: int
+    ) -> Result[ResImportJobDto, Exception]: ...
+
+    async def set_status(
+        self, id: int, status: ImportStatusEnum, error: Optional[str] = None
+    ) -> Result[ResImportJobDto, Exception]: ...
@@ -0,0 +1,10 @@
+from typing import Protocol, Optional, Dict, Any
+from .i_repository import CrudProtocol, TCreate, TUpdate, TResponse
+
+
+class ReferenceRepositoryProtocol(CrudProtocol[TCreate, TUpdate, TResponse], Protocol):
+    """CRUD for small, rarely changing lookup tables served from an in-process cache."""
+
+    async def get_by_name(self, name: str) -> Optional[TResponse]: ...
+
+    def cache_stats(self) -> Dict[str, Any]: ...
@@ -1,5 +1,7 @@
-from typing import Protocol, Optional, List, TypeVar, Generic
+from typing import Protocol, Optional, List, Tuple, TypeVar, Generic, AsyncIterator
 from returns.result import Result
+from ..value_objects.dto import ChangesDto, PageDto
+from ..value_objects.pagination import DEFAULT_PAGE_SIZE
 # from ..value_objects.dto import (
 #     CreateAssetTypeDto, UpdateAssetTypeDto, ResAssetTypeDto,
 #     CreateAssetDto, UpdateAssetDto, ResAssetDto,
@@ -85,4 +87,11 @@ class CrudProtocol(Protocol, Generic[TCreate, TUpdate, TResponse]):
     async def get(self, id: int) -> Optional[TResponse]: ...
     async def update(self, id: int, dto: TUpdate) -> Result[TResponse, Exception]: ...
     async def delete(self, id: int) -> Result[bool, Exception]: ...
-    async def list(self) -> List[TResponse]: ...
\ No newline at end of file
+    async def list(self) -> List[TResponse]: ...
+    async def list_page(
+        self, after_id: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> PageDto[TResponse]: ...
+    def iter_all(self, chunk_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[TResponse]: ...
+    async def changes_since(
+        self, after: Tuple[int, int] = (0, 0), limit: int = DEFAULT_PAGE_SIZE
+    ) -> ChangesDto[TResponse]: ...
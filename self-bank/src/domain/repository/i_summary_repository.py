@@ -0,0 +1,20 @@
+from typing import Protocol, List
+from ..value_objects.dto import (
+    ResMonthlySummaryDto,
+    ResExpenseTypeSummaryDto,
+    ResContactSummaryDto,
+)
+
+
+class SummaryRepositoryProtocol(Protocol):
+    async def monthly_totals(self, start_month: str, end_month: str) -> List[ResMonthlySummaryDto]: ...
+
+    async def expense_type_totals(self, start_month: str, end_month: str) -> List[ResExpenseTypeSummaryDto]: ...
+
+    async def top_contacts(self, start_month: str, end_month: str, limit: int) -> List[ResContactSummaryDto]: ...
+
+    async def ledger_months(self) -> List[str]: ...
+
+    async def rebuild_month(self, year_month: str) -> int: ...
+
+    async def prune_except(self, months: List[str]) -> int: ...
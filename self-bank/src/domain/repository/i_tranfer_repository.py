@@ -1,6 +1,6 @@
-from typing import Protocol
+from typing import List, Protocol
 from returns.result import Result
-from ...domain.value_objects.dto import TransferFundDto
+from ...domain.value_objects.dto import TransferFundDto, BatchTransferResultDto
 
 
 class TranferRepositoryProtocol(Protocol):
@@ -8,3 +8,4 @@ class TranferRepositoryProtocol(Protocol):
 
     # 👇 Add this line to the protocol
     async def transfer_fund(self, dto: TransferFundDto) -> Result[bool, Exception]: ...
+    async def transfer_many(self, dtos: List[TransferFundDto]) -> Result[BatchTransferResultDto, Exception]: ...
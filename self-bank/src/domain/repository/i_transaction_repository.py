@@ -0,0 +1,25 @@
+from typing import Protocol, List, Sequence
+from datetime import datetime
+from decimal import Decimal
+from returns.result import Result
+from .i_repository import CrudProtocol
+from ..value_objects.dto import (
+    CreateTransactionDto,
+    UpdateTransactionDto,
+    ResTransactionDto,
+    TransactionFilterDto,
+    ResDuplicateReportDto,
+)
+
+
+class TransactionRepositoryProtocol(
+    CrudProtocol[CreateTransactionDto, UpdateTransactionDto, ResTransactionDto],
+    Protocol,
+):
+    async def create_many(self, dtos: Sequence[CreateTransactionDto]) -> Result[List[ResTransactionDto], Exception]: ...
+
+    async def list_filtered(self, filters: TransactionFilterDto) -> List[ResTransactionDto]: ...
+
+    async def balance_as_of(self, asset_id: int, until: datetime) -> Decimal: ...
+
+    async def duplicate_report(self) -> ResDuplicateReportDto: ...
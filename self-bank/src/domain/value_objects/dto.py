@@ -1,13 +1,16 @@
-from typing import Optional
-from datetime import datetime
+from typing import Optional, List, Dict, Generic, TypeVar
+from datetime import datetime, date
 from pydantic import BaseModel
 from enum import Enum
 from decimal import Decimal
 
+T = TypeVar("T")
+
 # --- ENUMS ---
 class TransactionTypeEnum(str, Enum):
     INCOME = "Income"
     PAYMENT = "Payment"
+    TRANSFER = "Transfer"  # only written by the transfer engine
 
 # === ASSET TYPE DTOs ===
 class CreateAssetTypeDto(BaseModel):
@@ -44,6 +47,7 @@ class ResAssetDto(BaseModel):
 
     class Config:
         orm_mode = True
+        from_attributes = True
 
 # === EXPENSE TYPE DTOs ===
 class CreateExpenseTypeDto(BaseModel):
@@ -60,6 +64,7 @@ class ResExpenseTypeDto(BaseModel):
 
     class Config:
         orm_mode = True
+        from_attributes = True
 
 # === EXPENSE DTOs ===
 class CreateExpenseDto(BaseModel):
@@ -79,6 +84,7 @@ class ResExpenseDto(BaseModel):
 
     class Config:
         orm_mode = True
+        from_attributes = True
 
 # === CONTACT TYPE DTOs ===
 class CreateContactTypeDto(BaseModel):
@@ -95,6 +101,7 @@ class ResContactTypeDto(BaseModel):
 
     class Config:
         orm_mode = True
+        from_attributes = True
 
 # === CONTACT DTOs ===
 class CreateContactDto(BaseModel):
@@ -123,6 +130,12 @@ class ResContactDto(BaseModel):
 
     class Config:
         orm_mode = True
+        from_attributes = True
+
+class ResBalanceAsOfDto(BaseModel):
+    asset_id: int
+    as_of: date
+    balance: Decimal
 
 # === TRANSACTION DTOs ===
 class CreateTransactionDto(BaseModel):
@@ -132,6 +145,9 @@ class CreateTransactionDto(BaseModel):
     expense_id: Optional[int] = None
     contact_id: Optional[int] = None
     note: Optional[str] = None
+    created_at: Optional[datetime] = None  # when it happened; now when omitted
+    external_ref: Optional[str] = None     # id the bank gave it; recorded once per asset
+    idempotency_key: Optional[str] = None  # retrying with the same key returns the first result
 
 class UpdateTransactionDto(BaseModel):
     transaction_type: Optional[TransactionTypeEnum] = None
@@ -146,6 +162,7 @@ class ResTransactionDto(BaseModel):
     transaction_type: TransactionTypeEnum
     amount: Decimal
     asset_id: int
+    destination_asset_id: Optional[int] = None
     expense_id: Optional[int]
     contact_id: Optional[int]
     note: Optional[str]
@@ -154,6 +171,39 @@ class ResTransactionDto(BaseModel):
 
     class Config:
         orm_mode = True
+        from_attributes = True
+
+class TransactionFilterDto(BaseModel):
+    transaction_type: Optional[TransactionTypeEnum] = None
+    start: Optional[datetime] = None  # inclusive lower bound on created_at
+    end: Optional[datetime] = None    # exclusive upper bound on created_at
+    asset_id: Optional[int] = None
+    expense_id: Optional[int] = None
+    contact_id: Optional[int] = None
+
+class DuplicateGroupDto(BaseModel):
+    fingerprint: str
+    asset_id: int
+    transaction_type: TransactionTypeEnum
+    amount: Decimal
+    day: date
+    ids: List[int]               # Oldest first; all but the first are probably duplicates
+
+class ResDuplicateReportDto(BaseModel):
+    scanned: int                 # Fingerprinted transactions read
+    duplicates: int              # Transactions beyond the first of each group
+    groups: List[DuplicateGroupDto]
+    truncated: bool              # True when more groups exist than were returned
+
+class TransactionItemResultDto(BaseModel):
+    index: int                   # Position of the transaction in the request
+    success: bool
+    error: Optional[str] = None
+
+class BatchTransactionResultDto(BaseModel):
+    committed: bool              # False means nothing in the batch was written
+    ids: List[int]               # Transaction ids in request order; a repeated idempotency key gives the first
+    items: List[TransactionItemResultDto]
 
 # === CURRENT SHEET DTOs ===
 class CreateCurrentSheetDto(BaseModel):
@@ -171,10 +221,119 @@ class ResCurrentSheetDto(BaseModel):
 
     class Config:
         orm_mode = True
+        from_attributes = True
 
 # === TRANSACTION DTOs ===
 class TransferFundDto(BaseModel):
     source_asset_id: int
     destination_asset_id: int
     amount: Decimal  # <- This line helps the type checker
-    note: Optional[str] = None
\ No newline at end of file
+    note: Optional[str] = None
+
+class TransferItemResultDto(BaseModel):
+    index: int                   # Position of the transfer in the request
+    success: bool
+    error: Optional[str] = None
+
+class BatchTransferResultDto(BaseModel):
+    committed: bool              # False means nothing in the batch was applied
+    items: List[TransferItemResultDto]
+
+# === SUMMARY DTOs ===
+class ResMonthlySummaryDto(BaseModel):
+    year_month: str              # 'YYYY-MM'
+    income: Decimal
+    payment: Decimal
+    net: Decimal                 # income - payment
+    income_count: int
+    payment_count: int
+
+class ResExpenseTypeSummaryDto(BaseModel):
+    expense_type_id: Optional[int]  # None for payments without an expense
+    total: Decimal
+    count: int
+    min_amount: Decimal
+    max_amount: Decimal
+
+class ResContactSummaryDto(BaseModel):
+    contact_id: int
+    income: Decimal
+    payment: Decimal
+    count: int
+
+# === IMPORT DTOs ===
+class StatementFormatEnum(str, Enum):
+    CSV = "csv"
+    OFX = "ofx"
+    QIF = "qif"
+
+class ImportStatusEnum(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ImportMappingDto(BaseModel):
+    # CSV header names. Amounts are signed (negative = payment) unless
+    # debit/credit columns are given instead
+    date_column: str = "Date"
+    amount_column: Optional[str] = "Amount"
+    debit_column: Optional[str] = None
+    credit_column: Optional[str] = None
+    description_column: Optional[str] = "Description"
+    payee_column: Optional[str] = None
+    reference_column: Optional[str] = None  # bank's transaction id, to skip re-imported rows
+    delimiter: str = ","
+    encoding: str = "utf-8"
+    # CSV and QIF dates; defaults to '%Y-%m-%d' for CSV and '%m/%d/%Y' for QIF
+    date_format: Optional[str] = None
+    decimal_separator: str = "."
+    # Case-insensitive text found in the payee or description -> id; first match wins
+    expense_rules: Dict[str, int] = {}
+    contact_rules: Dict[str, int] = {}
+    default_expense_id: Optional[int] = None  # for payments no rule matched
+
+class ImportStatementDto(BaseModel):
+    path: str                                          # statement file, relative to the import directory
+    asset_id: int                                      # asset the statement belongs to
+    file_format: Optional[StatementFormatEnum] = None  # from the file extension when omitted
+    mapping: ImportMappingDto = ImportMappingDto()
+    job_id: Optional[int] = None                       # resume this job where it stopped
+    start_offset: Optional[int] = None                 # records to skip, instead of the job's offset
+    batch_size: int = 1000                             # records written per DB transaction
+
+class ImportErrorDto(BaseModel):
+    offset: int                  # Position of the record in the statement
+    error: str
+
+class ResImportJobDto(BaseModel):
+    id: int
+    source: str
+    file_format: StatementFormatEnum
+    asset_id: int
+    status: ImportStatusEnum
+    next_offset: int             # records handled so far; resuming starts here
+    imported_count: int
+    skipped_count: int
+    duplicate_count: int         # records already recorded, e.g. by an overlapping statement
+    error: Optional[str]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class ResImportResultDto(BaseModel):
+    job: ResImportJobDto
+    errors: List[ImportErrorDto]  # First records skipped by this run
+
+# === PAGINATION DTOs ===
+class PageDto(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None  # None when there are no more rows
+
+# === CHANGE FEED DTOs ===
+class ChangesDto(BaseModel, Generic[T]):
+    items: List[T]  # Rows created or updated since the cursor, current values
+    deleted_ids: List[int]  # Rows deleted since the cursor
+    next_cursor: str  # Pass back to continue; kept by a client that is caught up
+    has_more: bool  # True when more changes are waiting behind next_cursor
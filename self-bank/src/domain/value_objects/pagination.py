@@ -0,0 +1,64 @@
+import base64
+import json
+from typing import Any, Dict, Optional, Tuple
+
+# Page size used when a client does not ask for one
+DEFAULT_PAGE_SIZE = 100
+# Upper bound so a single page can never turn back into a full table scan
+MAX_PAGE_SIZE = 1000
+# Literal cursor clients send to ask for the first page
+FIRST_PAGE_CURSOR = "start"
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """Encode a cursor payload into an opaque, URL-safe token."""
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a token produced by `encode_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if not isinstance(payload, dict):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return payload
+
+
+def encode_page_cursor(after_id: int) -> str:
+    return encode_cursor({"after_id": after_id})
+
+
+def decode_page_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Return the `after_id` of a page cursor, or None for the first page."""
+    if not cursor or cursor == FIRST_PAGE_CURSOR:
+        return None
+    after_id = decode_cursor(cursor).get("after_id")
+    if not isinstance(after_id, int):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return after_id
+
+
+def clamp_page_size(limit: int) -> int:
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def encode_change_cursor(seq: int, id: int) -> str:
+    return encode_cursor({"seq": seq, "id": id})
+
+
+def decode_change_cursor(cursor: Optional[str]) -> Tuple[int, int]:
+    """
+    Return the (change sequence, id) a change cursor points past, or (0, 0)
+    for "start", which asks for every row.
+    """
+    if not cursor or cursor == FIRST_PAGE_CURSOR:
+        return 0, 0
+    payload = decode_cursor(cursor)
+    seq, id = payload.get("seq"), payload.get("id")
+    if not isinstance(seq, int) or not isinstance(id, int):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return seq, id
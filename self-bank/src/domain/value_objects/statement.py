@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Callable, Iterator, Optional
+from .dto import ImportMappingDto, StatementFormatEnum
+
+
+@dataclass(frozen=True, slots=True)
+class StatementLine:
+    """One record of a bank statement, as read from the file."""
+    offset: int                    # position of the record in the statement, from 0
+    posted_at: Optional[datetime]
+    amount: Optional[Decimal]      # signed: negative money left the account
+    payee: str
+    description: str
+    reference: str = ""            # bank's id of the transaction, when the format has one
+    error: Optional[str] = None    # set instead of the values when the record is unreadable
+
+
+# Reads a statement file lazily, starting at the given record offset
+StatementReader = Callable[[str, StatementFormatEnum, ImportMappingDto, int], Iterator[StatementLine]]
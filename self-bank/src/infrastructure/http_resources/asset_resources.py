@@ -1,6 +1,6 @@
-from ...server import MCPServer
+from ...server import MCPServer, WRITE
 from ...application.usecase.assest_usecase import AssetUseCase
-from domain.value_objects.dto import CreateAssetDto, UpdateAssetDto, ResAssetDto
+from domain.value_objects.dto import CreateAssetDto, UpdateAssetDto, ResAssetDto, PageDto, ChangesDto
 from returns.result import Result
 from typing import Optional, List
 
@@ -55,7 +55,7 @@ ResAssetDto:
 """
 
 def register_asset_resources(mcp: MCPServer, usecase: AssetUseCase):
-    @mcp.resource("http://asset/create")
+    @mcp.resource("http://asset/create", kind=WRITE)
     async def create(dto: CreateAssetDto) -> Result[ResAssetDto, Exception]:
         """
         Create a new asset.
@@ -95,7 +95,7 @@ def register_asset_resources(mcp: MCPServer, usecase: AssetUseCase):
         """
         return await usecase.get_asset(id)
 
-    @mcp.resource("http://asset/list")
+    @mcp.resource("http://asset/list", tables=["assets"])
     async def list_all() -> List[ResAssetDto]:
         """
         List all assets.
@@ -111,7 +111,52 @@ def register_asset_resources(mcp: MCPServer, usecase: AssetUseCase):
         """
         return await usecase.get_all_assets()
 
-    @mcp.resource("http://asset/delete/{id}")
+    @mcp.resource("http://asset/list/page/{cursor}", tables=["assets"])
+    async def list_page(cursor: str) -> PageDto[ResAssetDto]:
+        """
+        List assets one page at a time.
+        
+        English:
+        Retrieves up to 100 assets ordered by ID. Pass "start" as the cursor
+        for the first page, then the returned next_cursor until it is null.
+        
+        Thai:
+        ดึงรายการสินทรัพย์ทีละหน้าเรียงตาม ID ใช้ cursor เป็น "start" สำหรับหน้าแรก
+        จากนั้นใช้ next_cursor ที่ได้รับจนกว่าจะเป็น null
+        
+        Args:
+            cursor (str): "start" or the next_cursor of the previous page
+            
+        Returns:
+            PageDto[ResAssetDto]: Assets on this page and the next cursor
+        """
+        return await usecase.get_assets_page(cursor)
+
+    @mcp.resource("http://asset/changes/{cursor}", tables=["assets", "tombstones"])
+    async def changes(cursor: str) -> ChangesDto[ResAssetDto]:
+        """
+        Sync assets incrementally.
+        
+        English:
+        Retrieves up to 100 assets created, updated or deleted since the cursor,
+        in the order they changed. Pass "start" the first time to get every row,
+        then the returned next_cursor, repeating while has_more is true. Keep
+        the last next_cursor: later calls return only what changed after it.
+        
+        Thai:
+        ดึงสินทรัพย์ที่ถูกสร้าง แก้ไข หรือลบหลังจาก cursor สูงสุด 100 รายการ ตามลำดับการเปลี่ยนแปลง
+        ครั้งแรกใช้ cursor เป็น "start" เพื่อรับข้อมูลทั้งหมด จากนั้นใช้ next_cursor ที่ได้รับ
+        ซ้ำจนกว่า has_more เป็น false และเก็บ next_cursor ล่าสุดไว้ใช้ดึงเฉพาะส่วนที่เปลี่ยนในครั้งถัดไป
+        
+        Args:
+            cursor (str): "start" or the next_cursor of the previous call
+            
+        Returns:
+            ChangesDto[ResAssetDto]: Assets changed, IDs deleted and the next cursor
+        """
+        return await usecase.get_asset_changes(cursor)
+
+    @mcp.resource("http://asset/delete/{id}", kind=WRITE)
     async def delete(id: int) -> Result[bool, Exception]:
         """
         Delete an asset.
@@ -130,7 +175,7 @@ def register_asset_resources(mcp: MCPServer, usecase: AssetUseCase):
         """
         return await usecase.delete_asset(id)
 
-    @mcp.resource("http://asset/update/{id}")
+    @mcp.resource("http://asset/update/{id}", kind=WRITE)
     async def update(id: int, dto: UpdateAssetDto) -> Result[ResAssetDto, Exception]:
         """
         Update an asset.
@@ -0,0 +1,94 @@
+from ...server import MCPServer
+from ...application.usecase.balance_usecase import BalanceUseCase
+from domain.value_objects.dto import ResCurrentSheetDto, PageDto
+from typing import Optional, List
+
+"""
+Balance Resources Documentation
+=============================
+
+English:
+This module serves the current balance of each asset.
+Balances are updated together with every income, payment and transfer,
+so reading them never has to add up the transaction history.
+
+Key Features:
+- Get the current balance of one asset
+- List the balances of all assets
+
+Thai:
+โมดูลนี้ให้ข้อมูลยอดเงินคงเหลือปัจจุบันของแต่ละสินทรัพย์
+ยอดคงเหลือจะถูกปรับพร้อมกับทุกรายรับ รายจ่าย และการโอน
+จึงไม่ต้องรวมประวัติธุรกรรมทั้งหมดทุกครั้งที่อ่าน
+
+คุณสมบัติหลัก:
+- ดูยอดคงเหลือปัจจุบันของสินทรัพย์
+- แสดงยอดคงเหลือของสินทรัพย์ทั้งหมด
+
+DTOs Used:
+----------
+ResCurrentSheetDto:
+{
+    id: int              # Unique identifier
+    asset_id: int        # Asset this balance belongs to
+    balance: Decimal     # Current balance
+    updated_at: datetime # Last time the balance changed
+}
+"""
+
+def register_balance_resources(mcp: MCPServer, usecase: BalanceUseCase):
+    @mcp.resource("http://balance/asset/{asset_id}", tables=["current_sheets"])
+    async def get_asset_balance(asset_id: int) -> Optional[ResCurrentSheetDto]:
+        """
+        Get the balance of an asset.
+
+        English:
+        Retrieves the current balance of a specific asset.
+
+        Thai:
+        ดึงยอดคงเหลือปัจจุบันของสินทรัพย์ที่ระบุ
+
+        Args:
+            asset_id (int): Asset ID
+
+        Returns:
+            Optional[ResCurrentSheetDto]: Balance if found, None otherwise
+        """
+        return await usecase.get_asset_balance(asset_id)
+
+    @mcp.resource("http://balance/list", tables=["current_sheets"])
+    async def list_all() -> List[ResCurrentSheetDto]:
+        """
+        List all balances.
+
+        English:
+        Retrieves the current balance of every asset.
+
+        Thai:
+        ดึงยอดคงเหลือปัจจุบันของสินทรัพย์ทั้งหมด
+
+        Returns:
+            List[ResCurrentSheetDto]: List of balances
+        """
+        return await usecase.list_balances()
+
+    @mcp.resource("http://balance/list/page/{cursor}", tables=["current_sheets"])
+    async def list_page(cursor: str) -> PageDto[ResCurrentSheetDto]:
+        """
+        List balances one page at a time.
+
+        English:
+        Retrieves up to 100 balances ordered by ID. Pass "start" as the cursor
+        for the first page, then the returned next_cursor until it is null.
+
+        Thai:
+        ดึงรายการยอดคงเหลือทีละหน้าเรียงตาม ID ใช้ cursor เป็น "start" สำหรับหน้าแรก
+        จากนั้นใช้ next_cursor ที่ได้รับจนกว่าจะเป็น null
+
+        Args:
+            cursor (str): "start" or the next_cursor of the previous page
+
+        Returns:
+            PageDto[ResCurrentSheetDto]: Balances on this page and the next cursor
+        """
+        return await usecase.list_balances_page(cursor)
@@ -1,6 +1,6 @@
-from ...server import MCPServer
+from ...server import MCPServer, WRITE
 from ...application.usecase.contact_usecase import ContactUseCase
-from domain.value_objects.dto import CreateContactDto, ResContactDto, UpdateContactDto
+from domain.value_objects.dto import CreateContactDto, ResContactDto, UpdateContactDto, PageDto, ChangesDto
 from returns.result import Result
 from typing import Optional, List
 
@@ -64,7 +64,7 @@ ResContactDto:
 """
 
 def register_contact_resources(mcp: MCPServer, usecase: ContactUseCase):
-    @mcp.resource("contact://create")
+    @mcp.resource("contact://create", kind=WRITE)
     async def create(dto: CreateContactDto) -> Result[ResContactDto, Exception]:
         """
         Create a new contact.
@@ -104,7 +104,7 @@ def register_contact_resources(mcp: MCPServer, usecase: ContactUseCase):
         """
         return await usecase.get_contact(id)
 
-    @mcp.resource("contact://list")
+    @mcp.resource("contact://list", tables=["contacts"])
     async def list_all() -> List[ResContactDto]:
         """
         List all contacts.
@@ -120,7 +120,52 @@ def register_contact_resources(mcp: MCPServer, usecase: ContactUseCase):
         """
         return await usecase.get_all_contacts()
 
-    @mcp.resource("contact://delete/{id}")
+    @mcp.resource("contact://list/page/{cursor}", tables=["contacts"])
+    async def list_page(cursor: str) -> PageDto[ResContactDto]:
+        """
+        List contacts one page at a time.
+        
+        English:
+        Retrieves up to 100 contacts ordered by ID. Pass "start" as the cursor
+        for the first page, then the returned next_cursor until it is null.
+        
+        Thai:
+        ดึงรายการผู้ติดต่อทีละหน้าเรียงตาม ID ใช้ cursor เป็น "start" สำหรับหน้าแรก
+        จากนั้นใช้ next_cursor ที่ได้รับจนกว่าจะเป็น null
+        
+        Args:
+            cursor (str): "start" or the next_cursor of the previous page
+            
+        Returns:
+            PageDto[ResContactDto]: Contacts on this page and the next cursor
+        """
+        return await usecase.get_contacts_page(cursor)
+
+    @mcp.resource("contact://changes/{cursor}", tables=["contacts", "tombstones"])
+    async def changes(cursor: str) -> ChangesDto[ResContactDto]:
+        """
+        Sync contacts incrementally.
+        
+        English:
+        Retrieves up to 100 contacts created, updated or deleted since the cursor,
+        in the order they changed. Pass "start" the first time to get every row,
+        then the returned next_cursor, repeating while has_more is true. Keep
+        the last next_cursor: later calls return only what changed after it.
+        
+        Thai:
+        ดึงผู้ติดต่อที่ถูกสร้าง แก้ไข หรือลบหลังจาก cursor สูงสุด 100 รายการ ตามลำดับการเปลี่ยนแปลง
+        ครั้งแรกใช้ cursor เป็น "start" เพื่อรับข้อมูลทั้งหมด จากนั้นใช้ next_cursor ที่ได้รับ
+        ซ้ำจนกว่า has_more เป็น false และเก็บ next_cursor ล่าสุดไว้ใช้ดึงเฉพาะส่วนที่เปลี่ยนในครั้งถัดไป
+        
+        Args:
+            cursor (str): "start" or the next_cursor of the previous call
+            
+        Returns:
+            ChangesDto[ResContactDto]: Contacts changed, IDs deleted and the next cursor
+        """
+        return await usecase.get_contact_changes(cursor)
+
+    @mcp.resource("contact://delete/{id}", kind=WRITE)
     async def delete(id: int) -> Result[bool, Exception]:
         """
         Delete a contact.
@@ -139,7 +184,7 @@ def register_contact_resources(mcp: MCPServer, usecase: ContactUseCase):
         """
         return await usecase.delete_contact(id)
 
-    @mcp.resource("contact://update/{id}")
+    @mcp.resource("contact://update/{id}", kind=WRITE)
     async def update(id: int, dto: UpdateContactDto) -> Result[ResContactDto, Exception]:
         """
         Update a contact.
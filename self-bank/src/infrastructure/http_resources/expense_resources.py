@@ -1,6 +1,6 @@
-from ...server import MCPServer
+from ...server import MCPServer, WRITE
 from ...application.usecase.expense_usecase import ExpenseUseCase
-from domain.value_objects.dto import CreateExpenseDto, UpdateExpenseDto, ResExpenseDto
+from domain.value_objects.dto import CreateExpenseDto, UpdateExpenseDto, ResExpenseDto, PageDto, ChangesDto
 from returns.result import Result
 from typing import Optional, List
 
@@ -55,7 +55,7 @@ ResExpenseDto:
 """
 
 def register_expense_resources(mcp: MCPServer, usecase: ExpenseUseCase):
-    @mcp.resource("expense://create")
+    @mcp.resource("expense://create", kind=WRITE)
     async def create(dto: CreateExpenseDto) -> Result[ResExpenseDto, Exception]:  # type: ignore[reportUnusedFunction]
         """
         Create a new expense.
@@ -95,7 +95,7 @@ def register_expense_resources(mcp: MCPServer, usecase: ExpenseUseCase):
         """
         return await usecase.get_expense(id)
 
-    @mcp.resource("expense://list")
+    @mcp.resource("expense://list", tables=["expenses"])
     async def list_all() -> List[ResExpenseDto]:  # type: ignore[reportUnusedFunction]
         """
         List all expenses.
@@ -111,7 +111,52 @@ def register_expense_resources(mcp: MCPServer, usecase: ExpenseUseCase):
         """
         return await usecase.list_expenses()
 
-    @mcp.resource("expense://{id}/delete")
+    @mcp.resource("expense://list/page/{cursor}", tables=["expenses"])
+    async def list_page(cursor: str) -> PageDto[ResExpenseDto]:  # type: ignore[reportUnusedFunction]
+        """
+        List expenses one page at a time.
+        
+        English:
+        Retrieves up to 100 expenses ordered by ID. Pass "start" as the cursor
+        for the first page, then the returned next_cursor until it is null.
+        
+        Thai:
+        ดึงรายการค่าใช้จ่ายทีละหน้าเรียงตาม ID ใช้ cursor เป็น "start" สำหรับหน้าแรก
+        จากนั้นใช้ next_cursor ที่ได้รับจนกว่าจะเป็น null
+        
+        Args:
+            cursor (str): "start" or the next_cursor of the previous page
+            
+        Returns:
+            PageDto[ResExpenseDto]: Expenses on this page and the next cursor
+        """
+        return await usecase.list_expenses_page(cursor)
+
+    @mcp.resource("expense://changes/{cursor}", tables=["expenses", "tombstones"])
+    async def changes(cursor: str) -> ChangesDto[ResExpenseDto]:
+        """
+        Sync expenses incrementally.
+        
+        English:
+        Retrieves up to 100 expenses created, updated or deleted since the cursor,
+        in the order they changed. Pass "start" the first time to get every row,
+        then the returned next_cursor, repeating while has_more is true. Keep
+        the last next_cursor: later calls return only what changed after it.
+        
+        Thai:
+        ดึงค่าใช้จ่ายที่ถูกสร้าง แก้ไข หรือลบหลังจาก cursor สูงสุด 100 รายการ ตามลำดับการเปลี่ยนแปลง
+        ครั้งแรกใช้ cursor เป็น "start" เพื่อรับข้อมูลทั้งหมด จากนั้นใช้ next_cursor ที่ได้รับ
+        ซ้ำจนกว่า has_more เป็น false และเก็บ next_cursor ล่าสุดไว้ใช้ดึงเฉพาะส่วนที่เปลี่ยนในครั้งถัดไป
+        
+        Args:
+            cursor (str): "start" or the next_cursor of the previous call
+            
+        Returns:
+            ChangesDto[ResExpenseDto]: Expenses changed, IDs deleted and the next cursor
+        """
+        return await usecase.list_expense_changes(cursor)
+
+    @mcp.resource("expense://{id}/delete", kind=WRITE)
     async def delete(id: int) -> Result[bool, Exception]:  # type: ignore[reportUnusedFunction]
         """
         Delete an expense.
@@ -130,7 +175,7 @@ def register_expense_resources(mcp: MCPServer, usecase: ExpenseUseCase):
         """
         return await usecase.delete_expense(id)
 
-    @mcp.resource("expense://{id}")
+    @mcp.resource("expense://{id}", kind=WRITE)
     async def update(id: int, dto: UpdateExpenseDto) -> Result[ResExpenseDto, Exception]:  # type: ignore[reportUnusedFunction]
         """
         Update an expense.
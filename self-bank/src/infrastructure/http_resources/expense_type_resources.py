@@ -1,6 +1,6 @@
-from ...server import MCPServer
+from ...server import MCPServer, WRITE
 from ...application.usecase.expense_type_usecase import ExpenseTypeUseCase
-from domain.value_objects.dto import CreateExpenseTypeDto, UpdateExpenseTypeDto, ResExpenseTypeDto
+from domain.value_objects.dto import CreateExpenseTypeDto, UpdateExpenseTypeDto, ResExpenseTypeDto, PageDto, ChangesDto
 from returns.result import Result
 from typing import Optional, List
 
@@ -52,7 +52,7 @@ ResExpenseTypeDto:
 """
 
 def register_expense_type_resources(mcp: MCPServer, usecase: ExpenseTypeUseCase):
-    @mcp.resource("http://expense-type/create")
+    @mcp.resource("http://expense-type/create", kind=WRITE)
     async def create(dto: CreateExpenseTypeDto) -> Result[ResExpenseTypeDto, Exception]:
         """
         Create a new expense type.
@@ -92,7 +92,7 @@ def register_expense_type_resources(mcp: MCPServer, usecase: ExpenseTypeUseCase)
         """
         return await usecase.get_expense_type(id)
 
-    @mcp.resource("http://expense-type/list")
+    @mcp.resource("http://expense-type/list", tables=["expense_types"])
     async def list_all() -> List[ResExpenseTypeDto]:
         """
         List all expense types.
@@ -108,7 +108,52 @@ def register_expense_type_resources(mcp: MCPServer, usecase: ExpenseTypeUseCase)
         """
         return await usecase.list_expense_types()
 
-    @mcp.resource("http://expense-type/delete/{id}")
+    @mcp.resource("http://expense-type/list/page/{cursor}", tables=["expense_types"])
+    async def list_page(cursor: str) -> PageDto[ResExpenseTypeDto]:
+        """
+        List expense types one page at a time.
+        
+        English:
+        Retrieves up to 100 expense types ordered by ID. Pass "start" as the cursor
+        for the first page, then the returned next_cursor until it is null.
+        
+        Thai:
+        ดึงรายการประเภทค่าใช้จ่ายทีละหน้าเรียงตาม ID ใช้ cursor เป็น "start" สำหรับหน้าแรก
+        จากนั้นใช้ next_cursor ที่ได้รับจนกว่าจะเป็น null
+        
+        Args:
+            cursor (str): "start" or the next_cursor of the previous page
+            
+        Returns:
+            PageDto[ResExpenseTypeDto]: Expense types on this page and the next cursor
+        """
+        return await usecase.list_expense_types_page(cursor)
+
+    @mcp.resource("http://expense-type/changes/{cursor}", tables=["expense_types", "tombstones"])
+    async def changes(cursor: str) -> ChangesDto[ResExpenseTypeDto]:
+        """
+        Sync expense types incrementally.
+        
+        English:
+        Retrieves up to 100 expense types created, updated or deleted since the cursor,
+        in the order they changed. Pass "start" the first time to get every row,
+        then the returned next_cursor, repeating while has_more is true. Keep
+        the last next_cursor: later calls return only what changed after it.
+        
+        Thai:
+        ดึงประเภทค่าใช้จ่ายที่ถูกสร้าง แก้ไข หรือลบหลังจาก cursor สูงสุด 100 รายการ ตามลำดับการเปลี่ยนแปลง
+        ครั้งแรกใช้ cursor เป็น "start" เพื่อรับข้อมูลทั้งหมด จากนั้นใช้ next_cursor ที่ได้รับ
+        ซ้ำจนกว่า has_more เป็น false และเก็บ next_cursor ล่าสุดไว้ใช้ดึงเฉพาะส่วนที่เปลี่ยนในครั้งถัดไป
+        
+        Args:
+            cursor (str): "start" or the next_cursor of the previous call
+            
+        Returns:
+            ChangesDto[ResExpenseTypeDto]: Expense types changed, IDs deleted and the next cursor
+        """
+        return await usecase.list_expense_type_changes(cursor)
+
+    @mcp.resource("http://expense-type/delete/{id}", kind=WRITE)
     async def delete(id: int) -> Result[bool, Exception]:
         """
         Delete an expense type.
@@ -127,7 +172,7 @@ def register_expense_type_resources(mcp: MCPServer, usecase: ExpenseTypeUseCase)
         """
         return await usecase.delete_expense_type(id)
 
-    @mcp.resource("http://expense-type/update/{id}")
+    @mcp.resource("http://expense-type/update/{id}", kind=WRITE)
     async def update(id: int, dto: UpdateExpenseTypeDto) -> Result[ResExpenseTypeDto, Exception]:
         """
         Update an expense type.
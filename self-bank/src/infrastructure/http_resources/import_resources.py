@@ -0,0 +1,148 @@
+from mcp.server.fastmcp import Context  # type: ignore
+from ...server import MCPServer
+from ...application.usecase.import_usecase import ImportUseCase
+from domain.value_objects.dto import ImportStatementDto, ResImportJobDto, ResImportResultDto
+from returns.result import Failure
+from typing import Optional
+
+"""
+Import Resources Documentation
+=================================
+
+English:
+This module imports bank statements into transactions.
+Statements are read as a stream and written in chunks, so large files
+do not need to fit in memory, and an interrupted import can be resumed.
+
+Key Features:
+- Import CSV, OFX and QIF statements into one asset
+- Map CSV columns and set expenses and contacts by payee/description rules
+- Report progress after every chunk written
+- Resume a stopped or failed import from where it stopped
+- Skip records imported before, by the bank's transaction ID (OFX FITID)
+- Check the progress of an import job
+
+Thai:
+โมดูลนี้นำเข้ารายการเดินบัญชีจากธนาคารเป็นธุรกรรม
+ไฟล์จะถูกอ่านแบบสตรีมและบันทึกทีละชุด จึงไม่ต้องโหลดไฟล์ขนาดใหญ่ทั้งหมดไว้ในหน่วยความจำ
+และสามารถนำเข้าต่อจากจุดที่หยุดไปได้
+
+คุณสมบัติหลัก:
+- นำเข้ารายการเดินบัญชีแบบ CSV, OFX และ QIF เข้าสู่สินทรัพย์หนึ่งรายการ
+- กำหนดคอลัมน์ของ CSV และกำหนดค่าใช้จ่ายและผู้ติดต่อตามกฎจากชื่อผู้รับเงิน/คำอธิบาย
+- รายงานความคืบหน้าหลังบันทึกแต่ละชุด
+- นำเข้าต่อจากจุดที่หยุดหรือล้มเหลว
+- ข้ามรายการที่เคยนำเข้าแล้ว โดยใช้รหัสธุรกรรมของธนาคาร (OFX FITID)
+- ตรวจสอบความคืบหน้าของงานนำเข้า
+
+DTOs Used:
+----------
+ImportStatementDto:
+{
+    path: str                            # Statement file, relative to the import directory
+    asset_id: int                        # Asset the statement belongs to
+    file_format?: 'csv' | 'ofx' | 'qif'  # From the file extension when omitted
+    mapping?: ImportMappingDto           # CSV columns, date format and rules
+    job_id?: int                         # Resume this job where it stopped
+    start_offset?: int                   # Records to skip, instead of the job's offset
+    batch_size?: int                     # Records written per DB transaction (default 1000)
+}
+
+ImportMappingDto:
+{
+    date_column?: str                    # CSV header of the date (default 'Date')
+    amount_column?: str                  # Signed amount, negative = payment (default 'Amount')
+    debit_column?: str                   # Or separate debit/credit columns
+    credit_column?: str
+    description_column?: str            # Default 'Description'
+    payee_column?: str
+    reference_column?: str               # Bank's transaction ID; re-imported rows are skipped
+    delimiter?: str                      # Default ','
+    encoding?: str                       # Default 'utf-8'
+    date_format?: str                    # strptime format of CSV and QIF dates
+    decimal_separator?: str              # '.' or ','
+    expense_rules?: {str: int}           # Text in payee/description -> expense ID
+    contact_rules?: {str: int}           # Text in payee/description -> contact ID
+    default_expense_id?: int             # Expense of payments no rule matched
+}
+
+ResImportJobDto:
+{
+    id: int                              # Import job ID
+    source: str                          # Statement file
+    file_format: str                     # 'csv', 'ofx' or 'qif'
+    asset_id: int                        # Asset the transactions were recorded on
+    status: str                          # 'running', 'completed' or 'failed'
+    next_offset: int                     # Records handled so far; resuming starts here
+    imported_count: int                  # Transactions recorded
+    skipped_count: int                   # Records that could not be imported
+    duplicate_count: int                 # Records already recorded (same bank reference)
+    error?: str                          # Why the job failed
+    created_at: datetime                 # Start timestamp
+    updated_at: datetime                 # Last progress timestamp
+}
+
+ResImportResultDto:
+{
+    job: ResImportJobDto                 # The finished job
+    errors: [                            # First records skipped by this run
+        { offset: int, error: str }
+    ]
+}
+"""
+
+def register_import_resources(mcp: MCPServer, usecase: ImportUseCase):
+    @mcp.tool()
+    async def import_statement(dto: ImportStatementDto, ctx: Context) -> ResImportResultDto:
+        """
+        Import a bank statement.
+
+        English:
+        Imports a CSV, OFX or QIF statement into transactions of one asset.
+        Records are written in chunks and progress is reported after each one.
+        If the import stops, call again with the returned job_id to resume it.
+        Only files in the server's import directory can be imported.
+
+        Thai:
+        นำเข้ารายการเดินบัญชีแบบ CSV, OFX หรือ QIF เป็นธุรกรรมของสินทรัพย์หนึ่งรายการ
+        บันทึกทีละชุดและรายงานความคืบหน้าหลังแต่ละชุด
+        หากการนำเข้าหยุดลง ให้เรียกอีกครั้งพร้อม job_id ที่ได้รับเพื่อทำต่อ
+        นำเข้าได้เฉพาะไฟล์ที่อยู่ในไดเรกทอรีนำเข้าของเซิร์ฟเวอร์เท่านั้น
+
+        Args:
+            dto (ImportStatementDto): Statement file, asset and mapping
+
+        Returns:
+            ResImportResultDto: Finished job and skipped records
+
+        Raises:
+            Exception: If the import failed; the job keeps its offset for resuming
+        """
+        async def report(job: ResImportJobDto) -> None:
+            # mcp 1.7 takes no progress message; the job carries the counts
+            await ctx.report_progress(job.next_offset)
+
+        result = await usecase.import_statement(dto, report)
+        if isinstance(result, Failure):
+            # Tools report failures as errors, not as a returned value
+            raise result.failure()
+        return result.unwrap()
+
+    @mcp.resource("http://import/job/{job_id}")
+    async def get_import_job(job_id: int) -> Optional[ResImportJobDto]:
+        """
+        Get an import job.
+
+        English:
+        Retrieves the status and progress of an import job.
+
+        Thai:
+        ดึงสถานะและความคืบหน้าของงานนำเข้า
+
+        Args:
+            job_id (int): Import job ID
+
+        Returns:
+            Optional[ResImportJobDto]: Import job if found, None otherwise
+        """
+        return await usecase.get_import_job(job_id)
@@ -0,0 +1,201 @@
+from ...server import MCPServer
+from ..mysql.mysql_connection import MysqlConnection
+from ..mysql.repositories.reference_cache import ReferenceCache
+from ..mysql.response_cache import ResponseCache
+from ...application.single_flight import SingleFlight
+from ...application.admission import AdmissionController
+from ...application.event_bus import EventBus
+from ...application.group_commit import GroupCommit
+from typing import Any, Dict, Optional
+
+"""
+Metrics Resources Documentation
+=============================
+
+English:
+This module exposes internal runtime metrics of the server.
+It is meant for operators, not for end users.
+
+Key Features:
+- Inspect database connection pool usage
+- Inspect reference table cache hit/miss counters
+- Inspect how many concurrent identical reads were coalesced
+- Inspect the list response cache and the table versions it is keyed on
+- Inspect how many change events were coalesced into notifications
+- Inspect the batch sizes of group-committed transactions
+- Inspect admission of read, write and report requests
+- Inspect the SQL statements, DB time and slow queries of each resource
+
+Thai:
+โมดูลนี้ให้ข้อมูลสถิติการทำงานภายในของเซิร์ฟเวอร์
+สำหรับผู้ดูแลระบบ ไม่ใช่ผู้ใช้งานทั่วไป
+
+คุณสมบัติหลัก:
+- ตรวจสอบการใช้งาน connection pool ของฐานข้อมูล
+- ตรวจสอบจำนวน hit/miss ของแคชตารางอ้างอิง
+- ตรวจสอบจำนวนการอ่านข้อมูลซ้ำพร้อมกันที่ถูกรวมเป็นคำสั่งเดียว
+- ตรวจสอบแคชผลลัพธ์ของรายการและเวอร์ชันของตารางที่ใช้เป็นคีย์
+- ตรวจสอบจำนวนเหตุการณ์การเปลี่ยนแปลงที่ถูกรวมเป็นการแจ้งเตือนเดียว
+- ตรวจสอบขนาดของกลุ่มธุรกรรมที่ถูกบันทึกด้วย group commit
+- ตรวจสอบการรับคำขอประเภทอ่าน เขียน และรายงาน
+- ตรวจสอบจำนวนคำสั่ง SQL เวลาในฐานข้อมูล และคำสั่งที่ช้าของแต่ละ resource
+"""
+
+def register_metrics_resources(
+    mcp: MCPServer, db: MysqlConnection, caches: Dict[str, ReferenceCache[Any]],
+    flights: SingleFlight, responses: ResponseCache, events: EventBus,
+    admission: AdmissionController, group_commit: Optional[GroupCommit[Any, Any]] = None,
+):
+    @mcp.resource("http://metrics/pool", kind=None)
+    async def pool_stats() -> Dict[str, Any]:
+        """
+        Get connection pool statistics.
+
+        English:
+        Returns the pool size, connections checked in/out and current overflow.
+
+        Thai:
+        ส่งคืนขนาดของ pool จำนวน connection ที่ว่างและถูกใช้งาน และ overflow ปัจจุบัน
+
+        Returns:
+            Dict[str, Any]: Connection pool statistics
+        """
+        return db.pool_stats()
+
+    @mcp.resource("http://metrics/cache", kind=None)
+    async def cache_stats() -> Dict[str, Dict[str, Any]]:
+        """
+        Get reference cache statistics.
+
+        English:
+        Returns hits, misses, table loads and cached rows of the asset type,
+        expense type and contact type caches.
+
+        Thai:
+        ส่งคืนจำนวน hit, miss, การโหลดตาราง และจำนวนแถวในแคชของ
+        ประเภทสินทรัพย์ ประเภทค่าใช้จ่าย และประเภทผู้ติดต่อ
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Statistics per cached table
+        """
+        return {name: cache.stats() for name, cache in caches.items()}
+
+    @mcp.resource("http://metrics/coalescing", kind=None)
+    async def coalescing_stats() -> Dict[str, Dict[str, int]]:
+        """
+        Get read coalescing statistics.
+
+        English:
+        Returns, per usecase method, the calls made, the calls that ran a
+        database query and the calls that shared the result of an identical
+        call already in flight.
+
+        Thai:
+        ส่งคืนจำนวนการเรียกของแต่ละเมธอด จำนวนที่ส่งคำสั่งไปยังฐานข้อมูลจริง
+        และจำนวนที่ใช้ผลลัพธ์ร่วมกับการเรียกแบบเดียวกันที่กำลังทำงานอยู่
+
+        Returns:
+            Dict[str, Dict[str, int]]: calls, executed, coalesced and errors per method
+        """
+        return flights.stats()
+
+    @mcp.resource("http://metrics/response-cache", kind=None)
+    async def response_cache_stats() -> Dict[str, Any]:
+        """
+        Get response cache statistics.
+
+        English:
+        Returns hits, misses, evictions, cached entries and bytes of the list
+        response cache, and the current write version of every table.
+
+        Thai:
+        ส่งคืนจำนวน hit, miss, การนำออกจากแคช จำนวนรายการและขนาดของแคชผลลัพธ์
+        รวมถึงเวอร์ชันการเขียนปัจจุบันของแต่ละตาราง
+
+        Returns:
+            Dict[str, Any]: Response cache statistics
+        """
+        return responses.stats()
+
+    @mcp.resource("http://metrics/events", kind=None)
+    async def event_stats() -> Dict[str, Any]:
+        """
+        Get change notification statistics.
+
+        English:
+        Returns how many committed writes published change events, how many
+        notification rounds they were coalesced into, and failed deliveries.
+
+        Thai:
+        ส่งคืนจำนวนการเขียนที่ commit แล้วและส่งเหตุการณ์การเปลี่ยนแปลง จำนวนรอบการแจ้งเตือน
+        ที่ถูกรวมจากเหตุการณ์เหล่านั้น และจำนวนการส่งที่ล้มเหลว
+
+        Returns:
+            Dict[str, Any]: Event bus statistics
+        """
+        return events.stats()
+
+    @mcp.resource("http://metrics/group-commit", kind=None)
+    async def group_commit_stats() -> Dict[str, Any]:
+        """
+        Get group commit statistics.
+
+        English:
+        Returns the batches written, the transactions in them, the batch size
+        distribution and the writes waiting for the next batch, or only
+        enabled: false when MYSQL_GROUP_COMMIT is off.
+
+        Thai:
+        ส่งคืนจำนวนกลุ่มที่บันทึก จำนวนธุรกรรมในกลุ่ม การกระจายของขนาดกลุ่ม
+        และจำนวนรายการที่รอกลุ่มถัดไป หากไม่ได้เปิด MYSQL_GROUP_COMMIT จะส่งคืนเพียง enabled: false
+
+        Returns:
+            Dict[str, Any]: Group commit statistics
+        """
+        return group_commit.stats() if group_commit is not None else {"enabled": False}
+
+    @mcp.resource("http://metrics/admission", kind=None)
+    async def admission_stats() -> Dict[str, Any]:
+        """
+        Get admission control statistics.
+
+        English:
+        Returns the requests running out of the shared capacity and, per
+        request class (write, read, report), its priority, the requests
+        running and waiting now, how many were admitted, had to queue, were
+        rejected because the queue was full or ran past their deadline, and
+        the time they waited in the queue (average and percentiles, in ms).
+
+        Thai:
+        ส่งคืนจำนวนคำขอที่กำลังทำงานจากความจุรวม และสำหรับแต่ละประเภท (เขียน อ่าน รายงาน)
+        ได้แก่ ลำดับความสำคัญ จำนวนที่กำลังทำงานและรอคิว จำนวนที่ได้รับอนุญาต ต้องรอคิว
+        ถูกปฏิเสธเพราะคิวเต็ม หรือเกินเวลาที่กำหนด และเวลาที่รอในคิว (ค่าเฉลี่ยและเปอร์เซ็นไทล์ หน่วย ms)
+
+        Returns:
+            Dict[str, Any]: Admission statistics, per request class under "classes"
+        """
+        return admission.stats()
+
+    @mcp.resource("http://metrics/db", kind=None)
+    async def db_stats() -> Dict[str, Any]:
+        """
+        Get SQL statement statistics per resource.
+
+        English:
+        Returns, per resource URI, the requests served, the SQL statements
+        they issued (in total, per request and the most in one request), the
+        time spent in the database, the rows returned, how many statements
+        were slow and how many requests ran one statement over and over (an
+        N+1 pattern), with the last such statement. Also returns the most
+        recent slow queries, some with a digest of their parameters.
+
+        Thai:
+        ส่งคืนข้อมูลของแต่ละ resource ได้แก่ จำนวนคำขอ จำนวนคำสั่ง SQL ที่ใช้ (ทั้งหมด ต่อคำขอ
+        และสูงสุดในคำขอเดียว) เวลาที่ใช้ในฐานข้อมูล จำนวนแถวที่ได้ จำนวนคำสั่งที่ช้า
+        และจำนวนคำขอที่รันคำสั่งเดิมซ้ำหลายครั้ง (รูปแบบ N+1) พร้อมคำสั่งล่าสุดนั้น
+        รวมถึงรายการคำสั่งที่ช้าล่าสุด บางรายการมี digest ของพารามิเตอร์
+
+        Returns:
+            Dict[str, Any]: Statement statistics, per resource URI under "resources"
+        """
+        return db.query_stats.stats()
@@ -0,0 +1,120 @@
+from ...server import MCPServer, REPORT
+from ...application.usecase.summary_usecase import SummaryUseCase
+from domain.value_objects.dto import ResMonthlySummaryDto, ResExpenseTypeSummaryDto, ResContactSummaryDto
+from typing import List
+
+"""
+Summary Resources Documentation
+=============================
+
+English:
+This module serves monthly dashboard summaries.
+Summaries are read from monthly rollups that are updated together with
+every transaction, so they cost the same however large the ledger grows.
+
+Key Features:
+- Income vs payment per month
+- Spend per expense type
+- Top contacts by volume
+
+Thai:
+โมดูลนี้ให้ข้อมูลสรุปรายเดือนสำหรับแดชบอร์ด
+ข้อมูลสรุปอ่านจากตารางสรุปรายเดือนที่ถูกปรับพร้อมกับทุกธุรกรรม
+จึงใช้เวลาเท่าเดิมไม่ว่าประวัติธุรกรรมจะมีขนาดเท่าใด
+
+คุณสมบัติหลัก:
+- รายรับเทียบกับรายจ่ายในแต่ละเดือน
+- ยอดใช้จ่ายตามประเภทค่าใช้จ่าย
+- ผู้ติดต่อที่มียอดธุรกรรมสูงสุด
+
+DTOs Used:
+----------
+ResMonthlySummaryDto:
+{
+    year_month: str      # Month in 'YYYY-MM' format
+    income: Decimal      # Total income
+    payment: Decimal     # Total payments
+    net: Decimal         # income - payment
+    income_count: int    # Number of income transactions
+    payment_count: int   # Number of payment transactions
+}
+
+ResExpenseTypeSummaryDto:
+{
+    expense_type_id?: int  # Expense type, null for payments without an expense
+    total: Decimal         # Total spend
+    count: int             # Number of payments
+    min_amount: Decimal    # Smallest payment
+    max_amount: Decimal    # Largest payment
+}
+
+ResContactSummaryDto:
+{
+    contact_id: int      # Contact ID
+    income: Decimal      # Income received from the contact
+    payment: Decimal     # Payments made to the contact
+    count: int           # Number of transactions
+}
+"""
+
+def register_summary_resources(mcp: MCPServer, usecase: SummaryUseCase):
+    @mcp.resource("http://summary/monthly/{start_month}/{end_month}", tables=["monthly_rollups"], kind=REPORT)
+    async def get_monthly_summary(start_month: str, end_month: str) -> List[ResMonthlySummaryDto]:
+        """
+        Get income vs payment per month.
+
+        English:
+        Retrieves total income and payments of every month in the range.
+
+        Thai:
+        ดึงยอดรวมรายรับและรายจ่ายของทุกเดือนในช่วงที่ระบุ
+
+        Args:
+            start_month (str): First month in 'YYYY-MM' format
+            end_month (str): Last month in 'YYYY-MM' format
+
+        Returns:
+            List[ResMonthlySummaryDto]: One summary per month
+        """
+        return await usecase.get_monthly_summary(start_month, end_month)
+
+    @mcp.resource("http://summary/expense-type/{start_month}/{end_month}", tables=["monthly_rollups"], kind=REPORT)
+    async def get_expense_type_summary(start_month: str, end_month: str) -> List[ResExpenseTypeSummaryDto]:
+        """
+        Get spend per expense type.
+
+        English:
+        Retrieves total payments per expense type in the range, largest first.
+
+        Thai:
+        ดึงยอดรวมรายจ่ายตามประเภทค่าใช้จ่ายในช่วงที่ระบุ เรียงจากมากไปน้อย
+
+        Args:
+            start_month (str): First month in 'YYYY-MM' format
+            end_month (str): Last month in 'YYYY-MM' format
+
+        Returns:
+            List[ResExpenseTypeSummaryDto]: Spend per expense type
+        """
+        return await usecase.get_expense_type_summary(start_month, end_month)
+
+    @mcp.resource("http://summary/top-contacts/{start_month}/{end_month}", tables=["monthly_rollups"], kind=REPORT)
+    async def get_top_contacts(start_month: str, end_month: str) -> List[ResContactSummaryDto]:
+        """
+        Get top contacts.
+
+        English:
+        Retrieves the 10 contacts with the largest income plus payment volume
+        in the range.
+
+        Thai:
+        ดึงผู้ติดต่อ 10 อันดับแรกที่มียอดรายรับรวมรายจ่ายสูงสุดในช่วงที่ระบุ
+
+        Args:
+            start_month (str): First month in 'YYYY-MM' format
+            end_month (str): Last month in 'YYYY-MM' format
+
+        Returns:
+            List[ResContactSummaryDto]: Contacts ordered by volume
+        """
+        return await usecase.get_top_contacts(start_month, end_month)
@@ -1,6 +1,9 @@
-from ...server import MCPServer
+from ...server import MCPServer, WRITE, REPORT
 from ...application.usecase.transaction_usecase import TransactionUseCase
-from domain.value_objects.dto import CreateTransactionDto, ResTransactionDto
+from domain.value_objects.dto import (
+    CreateTransactionDto, ResTransactionDto, TransactionFilterDto, ResBalanceAsOfDto,
+    BatchTransactionResultDto, ResDuplicateReportDto, PageDto, ChangesDto
+)
 from returns.result import Result
 from typing import List
 
@@ -15,9 +18,13 @@ It handles income, payments, and provides transaction history.
 Key Features:
 - Record income transactions
 - Record payment transactions
+- Record many transactions at once, all or nothing
 - Retrieve transaction history
 - Filter transactions by type and date
 - Get monthly transaction summaries
+- Get the balance of an asset as of a past date
+- Retry safely with an idempotency key
+- Find transactions recorded twice
 
 Thai:
 โมดูลนี้จัดการธุรกรรมทางการเงินในระบบ
@@ -26,9 +33,13 @@ Thai:
 คุณสมบัติหลัก:
 - บันทึกธุรกรรมรายรับ
 - บันทึกธุรกรรมรายจ่าย
+- บันทึกธุรกรรมหลายรายการพร้อมกัน สำเร็จทั้งหมดหรือไม่สำเร็จเลย
 - ดึงประวัติธุรกรรม
 - กรองธุรกรรมตามประเภทและวันที่
 - ดูสรุปรายเดือนของธุรกรรม
+- ดูยอดคงเหลือของสินทรัพย์ ณ วันที่ในอดีต
+- ส่งคำขอซ้ำได้อย่างปลอดภัยด้วย idempotency key
+- ค้นหาธุรกรรมที่ถูกบันทึกซ้ำ
 
 DTOs Used:
 ----------
@@ -40,6 +51,19 @@ CreateTransactionDto:
     expense_id?: int                      # Optional expense ID for payments
     contact_id?: int                      # Optional contact ID
     note?: str                           # Optional transaction note
+    created_at?: datetime                 # When it happened; now when omitted
+    external_ref?: str                    # Bank's ID of the transaction; recorded once per asset
+    idempotency_key?: str                 # Retrying with the same key returns the first result
+}
+
+TransactionFilterDto:
+{
+    transaction_type?: TransactionTypeEnum # 'Income' or 'Payment'
+    start?: datetime                      # Inclusive lower bound on created_at
+    end?: datetime                        # Exclusive upper bound on created_at
+    asset_id?: int                        # Only this asset
+    expense_id?: int                      # Only this expense
+    contact_id?: int                      # Only this contact
 }
 
 ResTransactionDto:
@@ -54,10 +78,40 @@ ResTransactionDto:
     created_at: datetime                 # Transaction timestamp
     updated_at: datetime                 # Last update timestamp
 }
+
+BatchTransactionResultDto:
+{
+    committed: bool                      # False means nothing in the batch was written
+    ids: [int]                           # Transaction IDs, in request order; an already
+                                         # recorded idempotency key gives the first ID
+    items: [                             # One entry per requested transaction, in order
+        { index: int, success: bool, error?: str }
+    ]
+}
+
+ResDuplicateReportDto:
+{
+    scanned: int                         # Transactions checked
+    duplicates: int                      # Transactions beyond the first of each group
+    groups: [                            # Transactions with the same asset, type, amount,
+        {                                # day, note and bank reference
+            fingerprint: str, asset_id: int, transaction_type: TransactionTypeEnum,
+            amount: Decimal, day: date, ids: [int]  # oldest first
+        }
+    ]
+    truncated: bool                      # More groups exist than were returned
+}
+
+ResBalanceAsOfDto:
+{
+    asset_id: int                        # Asset ID
+    as_of: date                          # Day the balance is taken at (end of day)
+    balance: Decimal                     # Balance at the end of that day
+}
 """
 
 def register_transaction_resources(mcp: MCPServer, usecase: TransactionUseCase):
-    @mcp.resource("http://transaction/income")
+    @mcp.resource("http://transaction/income", kind=WRITE)
     async def record_income(dto: CreateTransactionDto) -> Result[ResTransactionDto, Exception]:
         """
         Record an income transaction.
@@ -76,7 +130,7 @@ def register_transaction_resources(mcp: MCPServer, usecase: TransactionUseCase):
         """
         return await usecase.record_income(dto)
 
-    @mcp.resource("http://transaction/payment")
+    @mcp.resource("http://transaction/payment", kind=WRITE)
     async def record_payment(dto: CreateTransactionDto) -> Result[ResTransactionDto, Exception]:
         """
         Record a payment transaction.
@@ -95,7 +149,30 @@ def register_transaction_resources(mcp: MCPServer, usecase: TransactionUseCase):
         """
         return await usecase.record_payment(dto)
 
-    @mcp.resource("http://transaction/list")
+    @mcp.resource("http://transaction/batch", kind=WRITE)
+    async def record_many(dtos: List[CreateTransactionDto]) -> Result[BatchTransactionResultDto, Exception]:
+        """
+        Record many transactions at once.
+        
+        English:
+        Records a list of income and payment transactions in one database transaction.
+        Every item is checked first; if any item fails, none are recorded and each
+        item reports its result. Returns the IDs of the created transactions.
+        
+        Thai:
+        บันทึกธุรกรรมรายรับและรายจ่ายหลายรายการภายในธุรกรรมฐานข้อมูลเดียว
+        ตรวจสอบทุกรายการก่อน หากมีรายการใดไม่ผ่าน จะไม่มีรายการใดถูกบันทึก และแจ้งผลของแต่ละรายการ
+        คืนค่า ID ของธุรกรรมที่สร้างขึ้น
+        
+        Args:
+            dtos (List[CreateTransactionDto]): Transactions to record, in order
+            
+        Returns:
+            Result[BatchTransactionResultDto, Exception]: Created IDs and per-item results, or error
+        """
+        return await usecase.record_many(dtos)
+
+    @mcp.resource("http://transaction/list", tables=["transactions"])
     async def list_all() -> List[ResTransactionDto]:
         """
         List all transactions.
@@ -111,7 +188,52 @@ def register_transaction_resources(mcp: MCPServer, usecase: TransactionUseCase):
         """
         return await usecase.list_transactions()
 
-    @mcp.resource("http://transaction/income/list")
+    @mcp.resource("http://transaction/list/page/{cursor}", tables=["transactions"])
+    async def list_page(cursor: str) -> PageDto[ResTransactionDto]:
+        """
+        List transactions one page at a time.
+        
+        English:
+        Retrieves up to 100 transactions ordered by ID. Pass "start" as the cursor
+        for the first page, then the returned next_cursor until it is null.
+        
+        Thai:
+        ดึงรายการธุรกรรมทีละหน้าเรียงตาม ID ใช้ cursor เป็น "start" สำหรับหน้าแรก
+        จากนั้นใช้ next_cursor ที่ได้รับจนกว่าจะเป็น null
+        
+        Args:
+            cursor (str): "start" or the next_cursor of the previous page
+            
+        Returns:
+            PageDto[ResTransactionDto]: Transactions on this page and the next cursor
+        """
+        return await usecase.list_transactions_page(cursor)
+
+    @mcp.resource("http://transaction/changes/{cursor}", tables=["transactions", "tombstones"])
+    async def changes(cursor: str) -> ChangesDto[ResTransactionDto]:
+        """
+        Sync transactions incrementally.
+        
+        English:
+        Retrieves up to 100 transactions created, updated or deleted since the cursor,
+        in the order they changed. Pass "start" the first time to get every row,
+        then the returned next_cursor, repeating while has_more is true. Keep
+        the last next_cursor: later calls return only what changed after it.
+        
+        Thai:
+        ดึงธุรกรรมที่ถูกสร้าง แก้ไข หรือลบหลังจาก cursor สูงสุด 100 รายการ ตามลำดับการเปลี่ยนแปลง
+        ครั้งแรกใช้ cursor เป็น "start" เพื่อรับข้อมูลทั้งหมด จากนั้นใช้ next_cursor ที่ได้รับ
+        ซ้ำจนกว่า has_more เป็น false และเก็บ next_cursor ล่าสุดไว้ใช้ดึงเฉพาะส่วนที่เปลี่ยนในครั้งถัดไป
+        
+        Args:
+            cursor (str): "start" or the next_cursor of the previous call
+            
+        Returns:
+            ChangesDto[ResTransactionDto]: Transactions changed, IDs deleted and the next cursor
+        """
+        return await usecase.list_transaction_changes(cursor)
+
+    @mcp.resource("http://transaction/income/list", tables=["transactions"])
     async def list_income() -> List[ResTransactionDto]:
         """
         List income transactions.
@@ -127,7 +249,7 @@ def register_transaction_resources(mcp: MCPServer, usecase: TransactionUseCase):
         """
         return await usecase.get_income_transactions()
 
-    @mcp.resource("http://transaction/payment/list")
+    @mcp.resource("http://transaction/payment/list", tables=["transactions"])
     async def list_payments() -> List[ResTransactionDto]:
         """
         List payment transactions.
@@ -143,7 +265,7 @@ def register_transaction_resources(mcp: MCPServer, usecase: TransactionUseCase):
         """
         return await usecase.get_payment_transactions()
 
-    @mcp.resource("http://transaction/month/{month}")
+    @mcp.resource("http://transaction/month/{month}", tables=["transactions"])
     async def get_by_month(month: str) -> List[ResTransactionDto]:
         """
         Get transactions by month.
@@ -160,4 +282,67 @@ def register_transaction_resources(mcp: MCPServer, usecase: TransactionUseCase):
         Returns:
             List[ResTransactionDto]: List of transactions for the month
         """
-        return await usecase.get_transactions_by_month(month) 
\ No newline at end of file
+        return await usecase.get_transactions_by_month(month)
+
+    @mcp.resource("http://transaction/filter", kind=REPORT)
+    async def filter_transactions(filters: TransactionFilterDto) -> List[ResTransactionDto]:
+        """
+        Filter transactions.
+        
+        English:
+        Retrieves transactions matching the given type, date range,
+        asset, expense and contact. Unset fields are ignored.
+        
+        Thai:
+        ดึงธุรกรรมตามประเภท ช่วงวันที่ สินทรัพย์ ค่าใช้จ่าย และผู้ติดต่อที่ระบุ
+        ฟิลด์ที่ไม่ได้ระบุจะไม่ถูกใช้ในการกรอง
+        
+        Args:
+            filters (TransactionFilterDto): Filter criteria
+            
+        Returns:
+            List[ResTransactionDto]: Matching transactions ordered by date
+        """
+        return await usecase.filter_transactions(filters) 
+
+    @mcp.resource("http://transaction/duplicates", kind=REPORT)
+    async def find_duplicates() -> ResDuplicateReportDto:
+        """
+        Find duplicate transactions.
+        
+        English:
+        Reports groups of transactions with the same asset, type, amount, day,
+        note and bank reference, which are probably one transaction recorded
+        twice, e.g. by overlapping statement imports or a retried request.
+        
+        Thai:
+        รายงานกลุ่มธุรกรรมที่มีสินทรัพย์ ประเภท จำนวนเงิน วันที่ บันทึก และรหัสอ้างอิงของธนาคารเดียวกัน
+        ซึ่งน่าจะเป็นธุรกรรมเดียวที่ถูกบันทึกซ้ำ เช่น จากการนำเข้ารายการเดินบัญชีที่ซ้อนกันหรือการส่งคำขอซ้ำ
+        
+        Returns:
+            ResDuplicateReportDto: Groups of probable duplicates, oldest first
+        """
+        return await usecase.find_duplicates()
+
+    @mcp.resource("http://transaction/balance/{asset_id}/{as_of}", kind=REPORT)
+    async def get_balance_as_of(asset_id: int, as_of: str) -> ResBalanceAsOfDto:
+        """
+        Get the balance of an asset on a past date.
+        
+        English:
+        Returns the balance of the asset at the end of the given day.
+        It starts from the monthly balance checkpoint before that day and
+        only adds the transactions of the same month.
+        
+        Thai:
+        ส่งคืนยอดคงเหลือของสินทรัพย์ ณ สิ้นวันที่ระบุ
+        โดยเริ่มจากยอดปิดรายเดือนก่อนวันนั้น แล้วรวมเฉพาะธุรกรรมในเดือนเดียวกัน
+        
+        Args:
+            asset_id (int): Asset ID
+            as_of (str): Date in 'YYYY-MM-DD' format
+            
+        Returns:
+            ResBalanceAsOfDto: Balance at the end of that day
+        """
+        return await usecase.get_balance_as_of(asset_id, as_of)
@@ -1,7 +1,8 @@
-from ...server import MCPServer
+from ...server import MCPServer, WRITE
 from ...application.usecase.tranfer_usecase import TransferUseCase
-from domain.value_objects.dto import TransferFundDto
+from domain.value_objects.dto import TransferFundDto, BatchTransferResultDto
 from returns.result import Result
+from typing import List
 
 
 """
@@ -14,6 +15,7 @@ It provides endpoints for transferring funds from one asset to another.
 
 Key Features:
 - Transfer funds between different assets
+- Apply many transfers at once, all or nothing
 - Validate transfer amounts and asset existence
 - Maintain transaction history
 
@@ -23,6 +25,7 @@ Thai:
 
 คุณสมบัติหลัก:
 - โอนเงินระหว่างสินทรัพย์ที่แตกต่างกัน
+- โอนเงินหลายรายการพร้อมกัน สำเร็จทั้งหมดหรือไม่สำเร็จเลย
 - ตรวจสอบจำนวนเงินที่โอนและความมีอยู่ของสินทรัพย์
 - บันทึกประวัติการทำธุรกรรม
 
@@ -35,10 +38,18 @@ TransferFundDto:
     amount: Decimal          # Amount to transfer (must be positive)
     note: Optional[str]      # Optional note about the transfer
 }
+
+BatchTransferResultDto:
+{
+    committed: bool          # False means no transfer in the batch was applied
+    items: [                 # One entry per requested transfer, in order
+        { index: int, success: bool, error?: str }
+    ]
+}
 """
 
 def register_transfer_resources(mcp: MCPServer, usecase: TransferUseCase):
-    @mcp.resource("http://transfer/fund")
+    @mcp.resource("http://transfer/fund", kind=WRITE)
     async def transfer_fund(dto: TransferFundDto) -> Result[bool, Exception]:
         """
         Transfer funds between assets.
@@ -57,4 +68,25 @@ def register_transfer_resources(mcp: MCPServer, usecase: TransferUseCase):
         Returns:
             Result[bool, Exception]: Success if transfer completed, Failure with error message if failed
         """
-        return await usecase.transfer_fund(dto) 
\ No newline at end of file
+        return await usecase.transfer_fund(dto)
+
+    @mcp.resource("http://transfer/batch", kind=WRITE)
+    async def transfer_many(dtos: List[TransferFundDto]) -> Result[BatchTransferResultDto, Exception]:
+        """
+        Apply many transfers at once.
+        
+        English:
+        Applies a list of transfers in order inside one database transaction.
+        If any transfer fails, none are applied and each item reports its result.
+        
+        Thai:
+        โอนเงินหลายรายการตามลำดับภายในธุรกรรมฐานข้อมูลเดียว
+        หากมีรายการใดล้มเหลว จะไม่มีรายการใดถูกบันทึก และแจ้งผลของแต่ละรายการ
+        
+        Args:
+            dtos (List[TransferFundDto]): Transfers to apply, in order
+            
+        Returns:
+            Result[BatchTransferResultDto, Exception]: Per-item results, or error
+        """
+        return await usecase.transfer_many(dtos)
@@ -0,0 +1,104 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, Set, Tuple
+from sqlalchemy import Table, event, func, insert, literal, select, update
+from sqlalchemy.sql import Insert
+from sqlalchemy.orm import Session
+from src.domain.entities.schema import Base, ChangeSequence, Tombstone
+
+# Session.info entry collecting, per table, the ids written and the ids
+# deleted in the open DB transaction
+CHANGED_ROWS = "changed_rows"
+
+
+def install_change_feed(session_class: Any) -> None:
+    """
+    Stamps the rows noted by repositories with the next change sequence
+    number of their table, and records tombstones for the deleted ones, as
+    the DB transaction of a session of `session_class` (a sync Session
+    subclass) commits.
+    """
+    event.listen(session_class, "before_commit", _stamp_changes)
+    event.listen(session_class, "after_rollback", _forget)
+
+
+def note_changed(session: Any, table: str, ids: Iterable[int]) -> None:
+    """Records that rows of `table` were inserted or updated in the session's transaction."""
+    _pending(session, table)[0].update(ids)
+
+
+def note_deleted(session: Any, table: str, ids: Iterable[int]) -> None:
+    """Records that rows of `table` were deleted in the session's transaction."""
+    _pending(session, table)[1].update(ids)
+
+
+def _pending(session: Any, table: str) -> Tuple[Set[int], Set[int]]:
+    changes: Dict[str, Tuple[Set[int], Set[int]]] = session.info.setdefault(CHANGED_ROWS, {})
+    return changes.setdefault(table, (set(), set()))
+
+
+def _stamp_changes(session: Session) -> None:
+    # Runs inside the commit, so under the async engine these statements are
+    # issued on the committing connection like any other
+    changes: Dict[str, Tuple[Set[int], Set[int]]] = session.info.pop(CHANGED_ROWS, {})
+    if not any(changed or deleted for changed, deleted in changes.values()):
+        return
+
+    # Taken last, so the counter rows stay locked only for the statements
+    # below and the COMMIT itself; in name order, so two transactions writing
+    # the same tables cannot deadlock on them
+    changes = {name: rows for name, rows in sorted(changes.items()) if rows[0] or rows[1]}
+    seqs = {name: _next_seq(session, name) for name in changes}
+    for name, (changed, deleted) in changes.items():
+        table = Base.metadata.tables[name]
+        seq = seqs[name]
+        alive = changed - deleted
+        if alive:
+            # updated_at is set to itself so its onupdate does not fire: the
+            # row did not change again, it only got its sequence number
+            session.execute(
+                update(table)
+                .where(table.c.id.in_(sorted(alive)))
+                .values(change_seq=seq, updated_at=table.c.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+        if deleted:
+            deleted_at = datetime.now().replace(microsecond=0)
+            session.execute(insert(Tombstone), [
+                {"entity": name, "entity_id": id, "change_seq": seq, "deleted_at": deleted_at}
+                for id in sorted(deleted)
+            ])
+
+
+def seed_sequences(table: Table) -> Insert:
+    """
+    Creates the counter of a change-tracked table, starting past the highest
+    sequence number its rows and tombstones already carry, so cursors handed
+    out before keep working. A counter that exists is left as it is.
+    """
+    highest = func.greatest(
+        select(func.coalesce(func.max(table.c.change_seq), 0)).scalar_subquery(),
+        select(func.coalesce(func.max(Tombstone.change_seq), 0))
+        .where(Tombstone.entity == table.name)
+        .scalar_subquery(),
+    )
+    return (
+        insert(ChangeSequence)
+        .prefix_with("IGNORE")
+        .from_select(["entity", "value"], select(literal(table.name, ChangeSequence.entity.type), highest))
+    )
+
+
+def _next_seq(session: Session, name: str) -> int:
+    taken = update(ChangeSequence).where(ChangeSequence.entity == name).values(value=ChangeSequence.value + 1)
+    result: Any = session.execute(taken.execution_options(synchronize_session=False))
+    if result.rowcount == 0:
+        # create_tables seeds the counters; this only covers a schema made elsewhere
+        session.execute(seed_sequences(Base.metadata.tables[name]))
+        session.execute(taken.execution_options(synchronize_session=False))
+    return session.execute(
+        select(ChangeSequence.value).where(ChangeSequence.entity == name)
+    ).scalar_one()
+
+
+def _forget(session: Session) -> None:
+    session.info.pop(CHANGED_ROWS, None)
@@ -1,11 +1,28 @@
+import asyncio
+import logging
+import logging.handlers
+import queue
+import sys
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar, Union
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
-    AsyncSession, create_async_engine, async_sessionmaker, AsyncEngine
+    AsyncSession, create_async_engine, async_sessionmaker, AsyncEngine, AsyncConnection
 )
 from sqlalchemy.engine import URL
+from sqlalchemy.orm import Session
 from src.config.db_config import DbConfig
-from sqlalchemy.orm import declarative_base
-Base = declarative_base()
+from src.domain.entities.schema import Base, Tombstone
+from .change_feed import install_change_feed, seed_sequences
+from .query_stats import QueryStats
+from .retry import backoff_delay
+from .table_versions import TableVersions
+from .unit_of_work import (
+    UnitOfWork, JoinedSession, current_unit_of_work, set_unit_of_work, reset_unit_of_work
+)
+
+T = TypeVar("T")
 
 
 @dataclass
@@ -14,6 +31,9 @@ class MysqlConnection:
 
     engine: AsyncEngine = field(init=False)
     session_maker: async_sessionmaker[AsyncSession] = field(init=False)
+    table_versions: TableVersions = field(init=False, default_factory=TableVersions)
+    query_stats: QueryStats = field(init=False)
+    _log_listener: Optional[logging.handlers.QueueListener] = field(init=False, default=None)
 
     def __post_init__(self):
         # Create the URL for the SQLAlchemy engine
@@ -26,21 +46,175 @@ class MysqlConnection:
             database=self.config.database
         )
 
-        # Create the async engine
-        self.engine = create_async_engine(url, echo=True, future=True)
+        # Create the async engine. echo is left off on purpose: SQL logging is
+        # routed through a background thread by _configure_sql_logging instead
+        self.engine = create_async_engine(
+            url,
+            future=True,
+            pool_size=self.config.pool_size,
+            max_overflow=self.config.max_overflow,
+            pool_timeout=self.config.pool_timeout,
+            pool_recycle=self.config.pool_recycle,
+            pool_pre_ping=self.config.pool_pre_ping,
+            # LIFO keeps a small hot set of connections busy under light load
+            # and lets the rest go idle and get recycled
+            pool_use_lifo=True,
+        )
+        # A Session class of this connection's own, so the listeners that
+        # bump table versions and stamp change sequence numbers on commit see
+        # only its sessions
+        sync_session_class = type("LedgerSession", (Session,), {})
         self.session_maker = async_sessionmaker(
             bind=self.engine,
             expire_on_commit=False,
-            class_=AsyncSession
+            class_=AsyncSession,
+            sync_session_class=sync_session_class,
         )
+        self.table_versions.install(sync_session_class)
+        install_change_feed(sync_session_class)
+        # Statement counts, DB time and slow queries per MCP request
+        self.query_stats = QueryStats(
+            slow_ms=self.config.slow_query_ms,
+            sample_rate=self.config.slow_query_sample_rate,
+            n_plus_one=self.config.n_plus_one_threshold,
+        )
+        self.query_stats.install(self.engine.sync_engine)
+        self._configure_sql_logging()
 
-    async def get_session(self) -> AsyncSession:
+    async def get_session(self) -> Union[AsyncSession, JoinedSession]:
+        """
+        A new session, or the open unit of work's session if the calling task
+        has one, so every repository call of a request shares one connection
+        and one transaction.
+        """
+        unit = current_unit_of_work()
+        if unit is not None:
+            return JoinedSession(unit)
+        return self.session_maker()
+
+    async def get_detached_session(self) -> AsyncSession:
+        """A session of its own even inside a unit of work, for server-side cursors."""
         return self.session_maker()
 
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[UnitOfWork]:
+        """
+        Opens a unit of work for the calling task, or joins the one already
+        open. It commits when the block ends, unless a repository rolled back
+        or the block raised, in which case everything in it is rolled back.
+
+        Once started, the commit is not interrupted: a request cancelled at
+        its deadline while committing waits for the COMMIT to finish, so its
+        outcome is known and the after-commit callbacks run, then stops.
+        """
+        unit = current_unit_of_work()
+        if unit is not None:
+            yield unit
+            return
+
+        async with self.session_maker() as session:
+            unit = UnitOfWork(session)
+            token = set_unit_of_work(unit)
+            try:
+                yield unit
+                if unit.rollback_only:
+                    await session.rollback()
+                else:
+                    cancelled = await self._commit_to_end(session)
+                    unit.committed()
+                    if cancelled:
+                        raise asyncio.CancelledError()
+            except BaseException:
+                await session.rollback()
+                raise
+            finally:
+                reset_unit_of_work(token)
+
+    @staticmethod
+    async def _commit_to_end(session: AsyncSession) -> bool:
+        """Commits even if cancelled meanwhile; returns whether it was."""
+        # Cancelling the await would only drop the client side of the
+        # connection; the server may still commit, and the caller would
+        # neither know nor bump the table versions of what it wrote
+        commit = asyncio.ensure_future(session.commit())
+        cancelled = False
+        while not commit.done():
+            try:
+                # Unlike awaiting the commit, waiting for it never cancels it
+                await asyncio.wait([commit])
+            except asyncio.CancelledError:
+                cancelled = True
+        commit.result()
+        return cancelled
+
+    async def run_in_unit_of_work(self, operation: Callable[[], Awaitable[T]], attempts: int = 4) -> T:
+        """
+        Runs `operation` in one unit of work, re-running the whole unit when a
+        deadlock rolled it back, with the same backoff as with_deadlock_retry.
+        """
+        if current_unit_of_work() is not None:
+            # Part of a larger unit, which decides about retrying
+            return await operation()
+        for attempt in range(1, attempts + 1):
+            async with self.unit_of_work() as unit:
+                result = await operation()
+            if not unit.retry_requested or attempt == attempts:
+                return result
+            await asyncio.sleep(backoff_delay(attempt, 0.02))
+        raise RuntimeError("unreachable")
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Runs `callback` once the open unit of work commits, or now if there is none."""
+        unit = current_unit_of_work()
+        if unit is not None:
+            unit.after_commit(callback)
+        else:
+            callback()
+
     async def get_connection(self):
         async with self.engine.connect() as conn:
             yield conn
 
+    async def warm_up(self) -> None:
+        """
+        Opens `pool_warmup` connections concurrently and returns them to the pool,
+        so the first requests after startup do not pay for the TCP/auth handshake.
+        """
+        count = min(self.config.pool_warmup, self.config.pool_size)
+        if count <= 0:
+            return
+
+        async def checkout() -> AsyncConnection:
+            conn = await self.engine.connect()
+            await conn.execute(text("SELECT 1"))
+            return conn
+
+        results = await asyncio.gather(*(checkout() for _ in range(count)), return_exceptions=True)
+        warmed = 0
+        for result in results:
+            if isinstance(result, AsyncConnection):
+                await result.close()
+                warmed += 1
+            else:
+                print(f"Error warming up connection pool: {result}", file=sys.stderr)
+        # stdout carries the MCP stdio transport; anything else there breaks it
+        print(f"Connection pool warmed up with {warmed} connection(s).", file=sys.stderr)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the connection pool usage.
+        """
+        pool: Any = self.engine.pool
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": self.config.max_overflow,
+            "timeout": self.config.pool_timeout,
+            "recycle": self.config.pool_recycle,
+        }
+
     async def dispose(self) -> None:
         """
         Disposes the engine and releases any resources held by it.
@@ -50,8 +224,11 @@ class MysqlConnection:
             try:
                 await self.engine.dispose()
             except Exception as e:
-                print(f"Error disposing engine: {e}")
-    
+                print(f"Error disposing engine: {e}", file=sys.stderr)
+        if self._log_listener:
+            self._log_listener.stop()
+            self._log_listener = None
+
     async def create_tables(self) -> None:
         """
         Creates the tables in the database based on the current models.
@@ -61,6 +238,30 @@ class MysqlConnection:
             async with self.engine.begin() as conn:
                 # This creates the tables in the database
                 await conn.run_sync(Base.metadata.create_all)
-            print("Tables created successfully.")
+                # Change sequence counters are updated, never inserted, by writers
+                for table in Base.metadata.sorted_tables:
+                    if "change_seq" in table.c and table is not Tombstone.__table__:
+                        await conn.execute(seed_sequences(table))
+            print("Tables created successfully.", file=sys.stderr)
         except Exception as e:
-            print(f"Error creating tables: {e}")
+            print(f"Error creating tables: {e}", file=sys.stderr)
+
+    def _configure_sql_logging(self) -> None:
+        """
+        Routes sqlalchemy.engine logging through a queue drained by a background
+        thread, so writing statements to stdout never blocks the event loop.
+        """
+        logger = logging.getLogger("sqlalchemy.engine")
+        if self.config.echo == "off":
+            logger.setLevel(logging.WARNING)
+            return
+
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        self._log_listener = logging.handlers.QueueListener(log_queue, handler)
+        self._log_listener.start()
+
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        logger.setLevel(logging.DEBUG if self.config.echo == "debug" else logging.INFO)
+        logger.propagate = False
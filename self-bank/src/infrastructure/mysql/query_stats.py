@@ -0,0 +1,168 @@
+import hashlib
+import logging
+import random
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+T = TypeVar("T")
+
+# Aggregate for the statements issued outside any tracked request, e.g. at
+# startup, by tools or by group-commit batches no request owns
+UNTRACKED = "(untracked)"
+# Connection.info entry holding the start time of the statement in flight;
+# a connection runs one statement at a time, and one that failed is simply
+# overwritten by the next
+QUERY_STARTED = "query_started"
+# Slow queries kept for the metrics resource
+SLOW_QUERY_SAMPLES = 50
+# Characters of a statement kept in logs and metrics
+STATEMENT_PREVIEW = 300
+
+logger = logging.getLogger("self_bank.db")
+
+
+class _Request:
+    def __init__(self, uri: str):
+        self.uri = uri
+        self.statements = 0
+        self.db_time = 0.0
+        self.rows = 0
+        # Statement text -> times run, to spot a statement run once per row
+        self.shapes: Counter[str] = Counter()
+
+
+class _Totals:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.statements = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.most_statements = 0
+        self.slow = 0
+        self.n_plus_one = 0
+        self.repeated: Optional[str] = None  # last statement flagged as N+1
+
+
+class QueryStats:
+    """
+    Counts the SQL statements each MCP request issues, the time they spend
+    in the database and the rows they return, aggregated per resource URI.
+    Statements are seen through the engine's before/after_cursor_execute
+    events and attributed to the request running in the current context.
+
+    A statement slower than `slow_ms` is logged, with a digest of its
+    parameters for a `sample_rate` share of them: the digest tells identical
+    parameters apart without putting account data in the log. A request
+    running one statement `n_plus_one` times or more, i.e. once per row of
+    an earlier result, is flagged as an N+1 pattern.
+    """
+
+    def __init__(self, slow_ms: float = 200, sample_rate: float = 0.1, n_plus_one: int = 10):
+        self._slow = slow_ms / 1000
+        self._sample_rate = sample_rate
+        self._n_plus_one = n_plus_one
+        self._current: ContextVar[Optional[_Request]] = ContextVar("query_stats_request", default=None)
+        self._totals: Dict[str, _Totals] = {}
+        self._slow_queries: Deque[Dict[str, Any]] = deque(maxlen=SLOW_QUERY_SAMPLES)
+
+    def install(self, engine: Engine) -> None:
+        """Follows every statement run on `engine` (the async engine's sync_engine)."""
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    async def track(self, uri: str, operation: Callable[[], Awaitable[T]]) -> T:
+        """Runs `operation`, attributing the statements it issues to `uri`."""
+        request = _Request(uri)
+        token = self._current.set(request)
+        try:
+            return await operation()
+        finally:
+            self._current.reset(token)
+            self._finish(request)
+
+    def stats(self) -> Dict[str, Any]:
+        resources: Dict[str, Any] = {}
+        for uri, totals in sorted(self._totals.items()):
+            # Untracked statements belong to no request
+            requests = totals.requests or 1
+            resources[uri] = {
+                "requests": totals.requests,
+                "statements": totals.statements,
+                "statements_per_request": round(totals.statements / requests, 2),
+                "most_statements": totals.most_statements,
+                "db_time_ms": round(totals.db_time * 1000, 2),
+                "db_time_per_request_ms": round(totals.db_time / requests * 1000, 2),
+                "rows": totals.rows,
+                "slow": totals.slow,
+                "n_plus_one": totals.n_plus_one,
+                "repeated_statement": totals.repeated,
+            }
+        return {
+            "slow_ms": self._slow * 1000,
+            "n_plus_one_threshold": self._n_plus_one,
+            "resources": resources,
+            "slow_queries": list(self._slow_queries),
+        }
+
+    def _before(self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        conn.info[QUERY_STARTED] = time.perf_counter()
+
+    def _after(self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        elapsed = time.perf_counter() - conn.info.pop(QUERY_STARTED, time.perf_counter())
+        # Only a SELECT has a description; a write's rowcount is rows affected.
+        # A server-side cursor reports no count until read, -1 or 2**64 - 1
+        rows = cursor.rowcount if cursor.description is not None and 0 < cursor.rowcount < 2 ** 63 else 0
+
+        request = self._current.get()
+        if request is None:
+            totals = self._totals_of(UNTRACKED)
+            totals.statements += 1
+            totals.db_time += elapsed
+            totals.rows += rows
+        else:
+            request.statements += 1
+            request.db_time += elapsed
+            request.rows += rows
+            request.shapes[statement] += 1
+
+        if elapsed >= self._slow:
+            self._slow_query(request.uri if request is not None else UNTRACKED, statement, parameters, elapsed)
+
+    def _slow_query(self, uri: str, statement: str, parameters: Any, elapsed: float) -> None:
+        self._totals_of(uri).slow += 1
+        digest = None
+        if random.random() < self._sample_rate:
+            digest = hashlib.sha1(repr(parameters).encode()).hexdigest()[:12]
+        preview = " ".join(statement.split())[:STATEMENT_PREVIEW]
+        self._slow_queries.append({
+            "uri": uri,
+            "ms": round(elapsed * 1000, 2),
+            "statement": preview,
+            "params_digest": digest,
+        })
+        logger.warning("slow query %.1fms uri=%s params=%s: %s", elapsed * 1000, uri, digest or "-", preview)
+
+    def _finish(self, request: _Request) -> None:
+        totals = self._totals_of(request.uri)
+        totals.requests += 1
+        totals.statements += request.statements
+        totals.db_time += request.db_time
+        totals.rows += request.rows
+        totals.most_statements = max(totals.most_statements, request.statements)
+
+        repeated: List[Any] = request.shapes.most_common(1)
+        if repeated and repeated[0][1] >= self._n_plus_one:
+            statement, count = repeated[0]
+            totals.n_plus_one += 1
+            totals.repeated = " ".join(statement.split())[:STATEMENT_PREVIEW]
+            logger.warning("possible N+1 uri=%s: statement ran %d times: %s", request.uri, count, totals.repeated)
+
+    def _totals_of(self, uri: str) -> _Totals:
+        totals = self._totals.get(uri)
+        if totals is None:
+            totals = self._totals[uri] = _Totals()
+        return totals
@@ -1,76 +1,30 @@
 from ....domain.repository.i_repository import CrudProtocol
-from typing import Optional, List
-from returns.result import Result, Success, Failure
-from sqlalchemy.future import select
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import select
-from .base_repository import BaseRepository
-from ....domain.entities.schema import Asset
+from typing import Any, Dict, List
+from decimal import Decimal
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from .sql_crud_repository import SqlCrudRepository
+from ....domain.entities.schema import Asset, CurrentSheet, BalanceCheckpoint
 from ....domain.value_objects.dto import CreateAssetDto, UpdateAssetDto, ResAssetDto
-from datetime import datetime
 
 class AssetRepository(
-    BaseRepository,
+    SqlCrudRepository[Asset, CreateAssetDto, UpdateAssetDto, ResAssetDto],
     CrudProtocol[CreateAssetDto, UpdateAssetDto, ResAssetDto],
 ):
-    async def create(self, dto: CreateAssetDto) -> Result[ResAssetDto, Exception]:
-        async with await self._db.get_session() as session:
-            try:
-                # Ensure the created_at field is set explicitly
-                asset = Asset(name=dto.name, asset_type_id=dto.asset_type_id, created_at=datetime.now())
-                session.add(asset)
-                await session.commit()
-                await session.refresh(asset)
-                return Success(ResAssetDto.model_validate(asset))
-            except SQLAlchemyError as e:
-                await session.rollback()
-                return Failure(e)
-
-    async def get(self, id: int) -> Optional[ResAssetDto]:
-        async with await self._db.get_session() as session:
-            result = await session.get(Asset, id)
-            if result:
-                return ResAssetDto.model_validate(result)
-            return None
-
-    async def update(self, id: int, dto: UpdateAssetDto) -> Result[ResAssetDto, Exception]:
-        async with await self._db.get_session() as session:
-            try:
-                instance = await session.get(Asset, id)
-                if not instance:
-                    return Failure(Exception("Asset not found"))
-
-                if dto.name:
-                    setattr(instance, 'name', dto.name)  # Use setattr to set the value
-                if dto.asset_type_id:
-                    setattr(instance, 'asset_type_id', dto.asset_type_id)  # Use setattr to set the value
-
-                await session.commit()
-                await session.refresh(instance)
-                return Success(ResAssetDto.model_validate(instance))
-            except SQLAlchemyError as e:
-                await session.rollback()
-                return Failure(e)
-
-    async def delete(self, id: int) -> Result[bool, Exception]:
-        async with await self._db.get_session() as session:
-            try:
-                instance = await session.get(Asset, id)
-                if not instance:
-                    return Failure(Exception("Asset not found"))
-
-                await session.delete(instance)
-                await session.commit()
-                return Success(True)
-            except SQLAlchemyError as e:
-                await session.rollback()
-                return Failure(e)
-
-    async def list(self) -> List[ResAssetDto]:
-        async with await self._db.get_session() as session:
-            result = await session.execute(select(Asset))
-            records = result.scalars().all()
-            return [ResAssetDto.model_validate(r) for r in records]
+    model = Asset
+    response_dto = ResAssetDto
+    entity_name = "Asset"
+
+    async def _after_insert(self, session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        # Every asset starts with a zero balance sheet, created atomically with it
+        await session.execute(insert(CurrentSheet).values([
+            {"asset_id": row["id"], "balance": Decimal("0"), "updated_at": row["created_at"]}
+            for row in rows
+        ]))
+
+    async def _before_delete(self, session: AsyncSession, ids: List[int]) -> None:
+        await session.execute(delete(CurrentSheet).where(CurrentSheet.asset_id.in_(ids)))
+        await session.execute(delete(BalanceCheckpoint).where(BalanceCheckpoint.asset_id.in_(ids)))
 
 
 
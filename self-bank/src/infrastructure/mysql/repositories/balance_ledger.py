@@ -0,0 +1,253 @@
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple, TypeVar
+from sqlalchemy import case, func, insert, literal_column, select, union_all, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from ....domain.entities.schema import Asset, BalanceCheckpoint, CurrentSheet, Transaction, TransactionType
+
+K = TypeVar("K", bound=Hashable)
+
+# Balance effects keyed by (asset_id, first day of the month they fall in)
+LedgerEffects = Dict[Tuple[int, date], Decimal]
+
+
+def period_start(when: datetime) -> date:
+    """First day of the month `when` falls in; checkpoints are kept per month."""
+    return date(when.year, when.month, 1)
+
+
+def transaction_deltas(
+    transaction_type: Any,
+    amount: Any,
+    asset_id: int,
+    destination_asset_id: Optional[int] = None,
+    sign: int = 1,
+) -> Dict[int, Decimal]:
+    """
+    Returns how a transaction moves balances, per asset id. Use sign=-1 for the
+    reverse effect (deleting the transaction, or the old side of an update).
+    """
+    value = Decimal(amount) * sign
+    kind = TransactionType(transaction_type)
+    if kind == TransactionType.INCOME:
+        return {asset_id: value}
+    if kind == TransactionType.PAYMENT:
+        return {asset_id: -value}
+    # TRANSFER
+    deltas: Dict[int, Decimal] = defaultdict(Decimal)
+    deltas[asset_id] -= value
+    if destination_asset_id is not None:
+        deltas[destination_asset_id] += value
+    return dict(deltas)
+
+
+def transaction_effects(
+    transaction_type: Any,
+    amount: Any,
+    asset_id: int,
+    destination_asset_id: Optional[int],
+    created_at: datetime,
+    sign: int = 1,
+) -> LedgerEffects:
+    """Like `transaction_deltas`, but also keyed by the month the transaction is in."""
+    period = period_start(created_at)
+    return {
+        (asset, period): delta
+        for asset, delta in transaction_deltas(
+            transaction_type, amount, asset_id, destination_asset_id, sign
+        ).items()
+    }
+
+
+def merge_deltas(*parts: Dict[K, Decimal]) -> Dict[K, Decimal]:
+    merged: Dict[K, Decimal] = defaultdict(Decimal)
+    for part in parts:
+        for key, delta in part.items():
+            merged[key] += delta
+    return dict(merged)
+
+
+async def lock_sheets(session: AsyncSession, asset_ids: Iterable[int]) -> Dict[int, Decimal]:
+    """
+    Locks the CurrentSheet rows of the given assets with SELECT ... FOR UPDATE
+    and returns their balances. Rows are locked in ascending asset_id order so
+    two writers touching the same assets can never deadlock on each other.
+    """
+    ids = sorted(set(asset_ids))
+    result = await session.execute(
+        select(CurrentSheet.asset_id, CurrentSheet.balance)
+        .where(CurrentSheet.asset_id.in_(ids))
+        .order_by(CurrentSheet.asset_id)
+        .with_for_update()
+    )
+    return {row.asset_id: Decimal(row.balance or 0) for row in result}
+
+
+async def apply_ledger_effects(session: AsyncSession, effects: LedgerEffects) -> None:
+    """
+    Applies transaction effects to both the current balances and the monthly
+    balance checkpoints. Sheets are updated first: the UPDATE row-locks each
+    sheet, which serializes the checkpoint maintenance of the same asset.
+    A change moving an amount between months of one asset nets to zero on its
+    sheet, so that sheet is locked explicitly.
+    """
+    effects = {key: delta for key, delta in effects.items() if delta}
+    if not effects:
+        return
+    sheet_deltas: Dict[int, Decimal] = defaultdict(Decimal)
+    for (asset_id, _), delta in effects.items():
+        sheet_deltas[asset_id] += delta
+    if not all(sheet_deltas.values()):
+        # All of them, in asset_id order like the UPDATE below, so the lock
+        # order stays the same for every writer
+        await lock_sheets(session, sheet_deltas)
+    await apply_balance_deltas(session, sheet_deltas)
+    await apply_checkpoint_deltas(session, effects)
+
+
+async def apply_balance_deltas(session: AsyncSession, deltas: Dict[int, Decimal]) -> None:
+    """
+    Adds each delta to its asset's balance in a single UPDATE statement
+    (balance = balance + CASE asset_id ... END), without reading the rows back.
+    An asset without a sheet gets one on first use, holding only this delta:
+    a database from before sheets were maintained needs rebuild_balances.py
+    run once to start from the ledger.
+    """
+    deltas = {asset_id: delta for asset_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    result: Any = await session.execute(
+        update(CurrentSheet)
+        .where(CurrentSheet.asset_id.in_(sorted(deltas)))
+        .values(balance=CurrentSheet.balance + case(deltas, value=CurrentSheet.asset_id))
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount < len(deltas):
+        existing = await session.execute(
+            select(CurrentSheet.asset_id).where(CurrentSheet.asset_id.in_(sorted(deltas)))
+        )
+        missing = set(deltas) - set(existing.scalars())
+        if missing:
+            # Two first writers of one asset may both get here; the second one
+            # adds its delta to the sheet the first created instead of failing
+            # on the unique asset_id index
+            stmt = mysql_insert(CurrentSheet).values([
+                {"asset_id": asset_id, "balance": deltas[asset_id]} for asset_id in sorted(missing)
+            ])
+            await session.execute(stmt.on_duplicate_key_update(
+                balance=CurrentSheet.balance + stmt.inserted.balance,
+            ))
+
+
+async def apply_checkpoint_deltas(session: AsyncSession, effects: LedgerEffects) -> None:
+    """
+    Keeps BalanceCheckpoint.closing_balance correct for every month at or after
+    the one a change falls in. A month without a checkpoint yet is created from
+    the closest earlier checkpoint, so closing balances never need the full
+    ledger to be recomputed.
+
+    The checkpoint is found with a locking read: a plain read would see the
+    transaction's snapshot, taken before the sheet lock was, and miss the
+    checkpoints a writer that held the lock before committed meanwhile.
+    """
+    for (asset_id, period), delta in sorted(effects.items()):
+        if not delta:
+            continue
+        latest = (await session.execute(
+            select(BalanceCheckpoint.period_start, BalanceCheckpoint.closing_balance)
+            .where(BalanceCheckpoint.asset_id == asset_id, BalanceCheckpoint.period_start <= period)
+            .order_by(BalanceCheckpoint.period_start.desc())
+            .limit(1)
+            .with_for_update()
+        )).first()
+
+        if latest is None or latest.period_start != period:
+            opening = Decimal(latest.closing_balance) if latest is not None else Decimal("0")
+            await session.execute(insert(BalanceCheckpoint).values(
+                asset_id=asset_id, period_start=period, closing_balance=opening + delta,
+            ))
+            later = BalanceCheckpoint.period_start > period
+        else:
+            later = BalanceCheckpoint.period_start >= period
+
+        # Every later month closes with the change carried forward
+        await session.execute(
+            update(BalanceCheckpoint)
+            .where(BalanceCheckpoint.asset_id == asset_id, later)
+            .values(closing_balance=BalanceCheckpoint.closing_balance + delta)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def _ledger_movements() -> Any:
+    """
+    Every balance movement of the ledger as (asset_id, created_at, delta):
+    incomes add, payments and outgoing transfers subtract, incoming transfers add.
+    """
+    return union_all(
+        select(
+            Transaction.asset_id.label("asset_id"),
+            Transaction.created_at.label("created_at"),
+            case(
+                (Transaction.transaction_type == TransactionType.INCOME, Transaction.amount),
+                else_=-Transaction.amount,
+            ).label("delta"),
+        ),
+        select(
+            Transaction.destination_asset_id.label("asset_id"),
+            Transaction.created_at.label("created_at"),
+            Transaction.amount.label("delta"),
+        ).where(
+            Transaction.transaction_type == TransactionType.TRANSFER,
+            Transaction.destination_asset_id.is_not(None),
+        ),
+    ).subquery()
+
+
+def ledger_balances_select() -> Any:
+    """
+    SELECT computing the balance of every asset straight from the ledger.
+    Assets without transactions come out with a zero balance.
+    """
+    movements = _ledger_movements()
+    totals = (
+        select(movements.c.asset_id, func.sum(movements.c.delta).label("balance"))
+        .group_by(movements.c.asset_id)
+        .subquery()
+    )
+    return (
+        select(Asset.id.label("asset_id"), func.coalesce(totals.c.balance, literal_column("0")).label("balance"))
+        .select_from(Asset)
+        .outerjoin(totals, totals.c.asset_id == Asset.id)
+    )
+
+
+def ledger_checkpoints_select() -> Any:
+    """
+    SELECT computing every monthly checkpoint straight from the ledger: one
+    row per asset and month with transactions, closing with the running sum
+    of the asset's movements up to the end of that month.
+    """
+    movements = _ledger_movements()
+    month = func.date_format(movements.c.created_at, "%Y-%m-01")
+    monthly = (
+        select(
+            movements.c.asset_id,
+            month.label("period_start"),
+            func.sum(movements.c.delta).label("delta"),
+        )
+        .where(movements.c.asset_id.is_not(None))
+        # By the alias: a repeated DATE_FORMAT would get its own bound format
+        # string, which ONLY_FULL_GROUP_BY does not see as the same expression
+        .group_by(movements.c.asset_id, literal_column("period_start"))
+        .subquery()
+    )
+    return select(
+        monthly.c.asset_id,
+        monthly.c.period_start,
+        func.sum(monthly.c.delta).over(
+            partition_by=monthly.c.asset_id, order_by=monthly.c.period_start
+        ).label("closing_balance"),
+    )
@@ -1,9 +1,145 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Type, TypeVar
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from ...mysql.mysql_connection import MysqlConnection
+from ....domain.value_objects.dto import PageDto
+from ....domain.value_objects.pagination import clamp_page_size, encode_page_cursor
+
+TDto = TypeVar("TDto", bound=BaseModel)
+
+# Rows per multi-row INSERT, keeping each statement well under max_allowed_packet
+INSERT_CHUNK_SIZE = 1000
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(dto: Type[BaseModel]) -> TypeAdapter[List[Any]]:
+    return TypeAdapter(List[dto])  # type: ignore[valid-type]
+
 
 class BaseRepository:
     def __init__(self, db: MysqlConnection):
         self._db = db
 
     async def get_session(self) -> AsyncSession:
-        return await self._db.get_session()
\ No newline at end of file
+        return await self._db.get_session()
+
+    @staticmethod
+    def _now() -> datetime:
+        # DATETIME columns store whole seconds (MySQL rounds the fraction), so
+        # truncating here makes the timestamp we answer with the one stored
+        return datetime.now().replace(microsecond=0)
+
+    @staticmethod
+    async def _insert_row(session: AsyncSession, model: Any, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Runs a single INSERT and returns the written values plus the generated
+        id, so the response can be built without reading the row back.
+        """
+        result = await session.execute(insert(model).values(**values))
+        return {**values, "id": result.inserted_primary_key[0]}
+
+    @staticmethod
+    async def _insert_rows(session: AsyncSession, model: Any, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Inserts rows with one multi-row INSERT per chunk and returns them with
+        their generated ids. MySQL reports the id of the first row of a
+        multi-row INSERT, and InnoDB allocates the ids of such a statement
+        together, so the others follow it consecutively.
+        """
+        if len(rows) == 1:
+            return [await BaseRepository._insert_row(session, model, rows[0])]
+
+        inserted: List[Dict[str, Any]] = []
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            chunk = rows[start:start + INSERT_CHUNK_SIZE]
+            result: Any = await session.execute(insert(model.__table__).values(chunk))
+            first_id = result.lastrowid
+            inserted.extend({**row, "id": first_id + offset} for offset, row in enumerate(chunk))
+        return inserted
+
+    @staticmethod
+    async def _update_row(
+        session: AsyncSession,
+        model: Any,
+        id: int,
+        values: Dict[str, Any],
+        columns: Iterable[str],
+        known: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Runs a single UPDATE by primary key (stamping updated_at) and returns
+        the row as `columns`. Only the columns neither set by the update nor
+        already `known` by the caller are read back, in the same transaction;
+        when nothing is missing there is no SELECT at all.
+        Returns None when no row matched, as reported by the rowcount.
+        """
+        values = {**values, "updated_at": BaseRepository._now()}
+        result: Any = await session.execute(
+            update(model).where(model.id == id).values(**values).execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            return None
+
+        row: Dict[str, Any] = {**(known or {}), **values, "id": id}
+        missing = [name for name in columns if name not in row]
+        if missing:
+            read = await session.execute(
+                select(*(getattr(model, name) for name in missing)).where(model.id == id)
+            )
+            row.update(read.one()._mapping)
+        return row
+
+    async def _list_page(
+        self, model: Any, dto: Type[TDto], after_id: Optional[int], limit: int
+    ) -> PageDto[TDto]:
+        # Keyset pagination: seek past the last id instead of OFFSET so every
+        # page is a primary-key range scan regardless of how deep it is
+        limit = clamp_page_size(limit)
+        stmt = select(*self._dto_columns(model, dto)).order_by(model.id).limit(limit + 1)
+        if after_id is not None:
+            stmt = stmt.where(model.id > after_id)
+
+        async with await self._db.get_session() as session:
+            result = await session.execute(stmt)
+            records = result.all()
+
+        # One extra row tells us whether another page exists without a COUNT
+        has_more = len(records) > limit
+        items = self._rows_to_dtos(dto, records[:limit])
+        next_cursor = encode_page_cursor(items[-1].id) if has_more else None  # type: ignore[attr-defined]
+        return PageDto[dto](items=items, next_cursor=next_cursor)  # type: ignore[valid-type]
+
+    async def _iter_all(self, model: Any, dto: Type[TDto], chunk_size: int) -> AsyncIterator[TDto]:
+        # Server-side cursor: rows are pulled from MySQL chunk_size at a time,
+        # so memory stays flat and the first row is available immediately
+        stmt = (
+            select(*self._dto_columns(model, dto))
+            .order_by(model.id)
+            .execution_options(yield_per=clamp_page_size(chunk_size))
+        )
+        # A session of its own: the open cursor would block a shared one
+        async with await self._db.get_detached_session() as session:
+            result = await session.stream(stmt)
+            # Plain rows, not ORM objects, so nothing is kept past its partition
+            async for partition in result.partitions():
+                for item in self._rows_to_dtos(dto, partition):
+                    yield item
+
+    @staticmethod
+    def _dto_columns(model: Any, dto: Type[BaseModel]) -> List[Any]:
+        # Only the columns the response carries, in field order, as plain rows
+        return [model.__table__.c[name] for name in dto.model_fields]
+
+    @staticmethod
+    def _rows_to_dtos(dto: Type[TDto], rows: Sequence[Any]) -> List[TDto]:
+        """
+        Builds DTOs from rows selected with _dto_columns. The rows are zipped
+        with the field names and validated as one list by a cached
+        TypeAdapter, which is one call into pydantic-core instead of one per
+        row; the DTOs are still fully validated.
+        """
+        fields = tuple(dto.model_fields)
+        return _list_adapter(dto).validate_python([dict(zip(fields, row)) for row in rows])
@@ -1,78 +1,61 @@
-from ....domain.repository.i_repository import CrudProtocol
-from typing import Optional, List
-from decimal import Decimal 
-from returns.result import Result, Success, Failure
-from sqlalchemy.future import select
-from sqlalchemy.exc import SQLAlchemyError
-from .base_repository import BaseRepository
-from ....domain.entities.schema import CurrentSheet
+from ....domain.repository.i_current_sheet_repository import CurrentSheetRepositoryProtocol
+from typing import Optional, Dict, Any
+from decimal import Decimal
+from sqlalchemy import bindparam, delete, insert, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from .balance_ledger import ledger_balances_select, ledger_checkpoints_select
+from .sql_crud_repository import SqlCrudRepository
+from ...mysql.mysql_connection import MysqlConnection
+from ....domain.entities.schema import BalanceCheckpoint, CurrentSheet
 from ....domain.value_objects.dto import (
     CreateCurrentSheetDto,
     UpdateCurrentSheetDto,
-    ResCurrentSheetDto
+    ResCurrentSheetDto,
 )
 
 
 class CurrentSheetRepository(
-    BaseRepository,
-    CrudProtocol[CreateCurrentSheetDto, UpdateCurrentSheetDto, ResCurrentSheetDto]
+    SqlCrudRepository[CurrentSheet, CreateCurrentSheetDto, UpdateCurrentSheetDto, ResCurrentSheetDto],
+    CurrentSheetRepositoryProtocol,
 ):
-    async def create(self, dto: CreateCurrentSheetDto) -> Result[ResCurrentSheetDto, Exception]:
-        async with await self._db.get_session() as session:
-            try:
-                current_sheet = CurrentSheet(
-                    asset_id=dto.asset_id,
-                    balance=dto.balance
-                )
-                session.add(current_sheet)
-                await session.commit()
-                await session.refresh(current_sheet)
-                return Success(ResCurrentSheetDto.model_validate(current_sheet))
-            except SQLAlchemyError as e:
-                await session.rollback()
-                return Failure(e)
+    model = CurrentSheet
+    response_dto = ResCurrentSheetDto
+    entity_name = "CurrentSheet"
 
-    async def get(self, id: int) -> Optional[ResCurrentSheetDto]:
-        async with await self._db.get_session() as session:
-            result = await session.get(CurrentSheet, id)
-            if result:
-                return ResCurrentSheetDto.model_validate(result)
-            return None
+    def __init__(self, db: MysqlConnection):
+        super().__init__(db)
+        self._by_asset_stmt = select(*self._columns).where(CurrentSheet.asset_id == bindparam("asset_id"))
 
-    async def update(self, id: int, dto: UpdateCurrentSheetDto) -> Result[ResCurrentSheetDto, Exception]:
+    async def get_by_asset(self, asset_id: int) -> Optional[ResCurrentSheetDto]:
+        # Single-row lookup on the unique asset_id index
         async with await self._db.get_session() as session:
-            try:
-                current_sheet = await session.get(CurrentSheet, id)
-                if not current_sheet:
-                    return Failure(Exception("CurrentSheet not found"))
-
-                if dto.balance is not None:
-                    # Use setattr to dynamically set the balance column
-                    setattr(current_sheet, 'balance', Decimal(dto.balance))  # Set the balance value as Decimal
-
-                await session.commit()
-                await session.refresh(current_sheet)
-                return Success(ResCurrentSheetDto.model_validate(current_sheet))
-            except SQLAlchemyError as e:
-                await session.rollback()
-                return Failure(e)
-
-    async def delete(self, id: int) -> Result[bool, Exception]:
+            row = (await session.execute(self._by_asset_stmt, {"asset_id": asset_id})).first()
+        return self._to_response(row._mapping) if row else None
+
+    def _create_values(self, dto: CreateCurrentSheetDto, now: Any) -> Dict[str, Any]:
+        values = super()._create_values(dto, now)
+        values["balance"] = Decimal(dto.balance)
+        return values
+
+    async def rebuild_balances(self) -> None:
+        """
+        Recomputes every asset's balance from the ledger in one DB transaction,
+        creating missing sheets.
+        """
         async with await self._db.get_session() as session:
-            try:
-                current_sheet = await session.get(CurrentSheet, id)
-                if not current_sheet:
-                    return Failure(Exception("CurrentSheet not found"))
-
-                await session.delete(current_sheet)
-                await session.commit()
-                return Success(True)
-            except SQLAlchemyError as e:
-                await session.rollback()
-                return Failure(e)
-
-    async def list(self) -> List[ResCurrentSheetDto]:
+            async with session.begin():
+                stmt = mysql_insert(CurrentSheet).from_select(["asset_id", "balance"], ledger_balances_select())
+                await session.execute(stmt.on_duplicate_key_update(balance=stmt.inserted.balance))
+
+    async def rebuild_checkpoints(self) -> int:
+        """
+        Recomputes every monthly balance checkpoint from the ledger, replacing
+        the old ones in one DB transaction. Returns the number of rows written.
+        """
         async with await self._db.get_session() as session:
-            result = await session.execute(select(CurrentSheet))
-            records = result.scalars().all()
-            return [ResCurrentSheetDto.model_validate(r) for r in records]
+            async with session.begin():
+                await session.execute(delete(BalanceCheckpoint))
+                result: Any = await session.execute(insert(BalanceCheckpoint).from_select(
+                    ["asset_id", "period_start", "closing_balance"], ledger_checkpoints_select()
+                ))
+                return max(result.rowcount, 0)
@@ -1,75 +1,29 @@
+from typing import Any, Dict
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ....domain.repository.i_repository import CrudProtocol
-from typing import Optional, List
-from returns.result import Result, Success, Failure
-from sqlalchemy.future import select
-from sqlalchemy.exc import SQLAlchemyError
-from .base_repository import BaseRepository
+from .rollup_ledger import move_expense_rollups
+from .sql_crud_repository import SqlCrudRepository
 from ....domain.entities.schema import Expense
 from ....domain.value_objects.dto import CreateExpenseDto, UpdateExpenseDto, ResExpenseDto
-from datetime import datetime
 
 class ExpenseRepository(
-    BaseRepository,
+    SqlCrudRepository[Expense, CreateExpenseDto, UpdateExpenseDto, ResExpenseDto],
     CrudProtocol[CreateExpenseDto, UpdateExpenseDto, ResExpenseDto]
 ):
-    async def create(self, dto: CreateExpenseDto) -> Result[ResExpenseDto, Exception]:
-        async with await self._db.get_session() as session:
-            try:
-                # Ensure that created_at and updated_at are set to the current datetime
-                expense = Expense(
-                    description=dto.description,
-                    expense_type_id=dto.expense_type_id,
-                    created_at=datetime.now(),  # Explicitly set created_at to the current datetime
-                    updated_at=datetime.now()   # Optionally, set updated_at to the same datetime
-                )
-                session.add(expense)
-                await session.commit()
-                await session.refresh(expense)
-                return Success(ResExpenseDto.model_validate(expense))
-            except SQLAlchemyError as e:
-                await session.rollback()
-                return Failure(e)
+    model = Expense
+    response_dto = ResExpenseDto
+    entity_name = "Expense"
 
-    async def get(self, id: int) -> Optional[ResExpenseDto]:
-        async with await self._db.get_session() as session:
-            result = await session.get(Expense, id)
-            if result:
-                return ResExpenseDto.model_validate(result)
+    async def _before_update(self, session: AsyncSession, id: int, values: Dict[str, Any]) -> Any:
+        if "expense_type_id" not in values:
             return None
-
-    async def update(self, id: int, dto: UpdateExpenseDto) -> Result[ResExpenseDto, Exception]:
-        async with await self._db.get_session() as session:
-            try:
-                instance = await session.get(Expense, id)
-                if not instance:
-                    return Failure(Exception("Expense not found"))
-
-                for field, value in dto.model_dump(exclude_unset=True).items():
-                    setattr(instance, field, value)
-
-                await session.commit()
-                await session.refresh(instance)
-                return Success(ResExpenseDto.model_validate(instance))
-            except SQLAlchemyError as e:
-                await session.rollback()
-                return Failure(e)
-
-    async def delete(self, id: int) -> Result[bool, Exception]:
-        async with await self._db.get_session() as session:
-            try:
-                instance = await session.get(Expense, id)
-                if not instance:
-                    return Failure(Exception("Expense not found"))
-
-                await session.delete(instance)
-                await session.commit()
-                return Success(True)
-            except SQLAlchemyError as e:
-                await session.rollback()
-                return Failure(e)
-
-    async def list(self) -> List[ResExpenseDto]:
-        async with await self._db.get_session() as session:
-            result = await session.execute(select(Expense))
-            records = result.scalars().all()
-            return [ResExpenseDto.model_validate(r) for r in records]
+        # Locked until commit, so transactions written meanwhile wait for the
+        # new type before keying their rollups by it
+        return await session.scalar(select(Expense.expense_type_id).where(Expense.id == id).with_for_update())
+
+    async def _after_update(self, session: AsyncSession, id: int, values: Dict[str, Any], before: Any) -> None:
+        # Rollups are keyed by expense type, so a retyped expense's
+        # transactions move to the rows of the new type in the same transaction
+        if "expense_type_id" in values and values["expense_type_id"] != before:
+            await move_expense_rollups(session, id, before)
@@ -0,0 +1,42 @@
+import hashlib
+import re
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+# Hex SHA-1; the width of the fingerprint and derived idempotency key columns
+FINGERPRINT_LENGTH = 40
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize_note(note: Optional[str]) -> str:
+    """Lowercased words only, so spacing and punctuation do not tell two notes apart."""
+    return " ".join(_WORD.findall((note or "").lower()))
+
+
+def transaction_fingerprint(values: Dict[str, Any]) -> str:
+    """
+    Fingerprint of a transaction: asset, type, amount, day, normalized note and
+    external reference. Two rows with the same fingerprint are probably the
+    same real-world transaction recorded twice.
+    """
+    created_at: datetime = values["created_at"]
+    parts = (
+        str(values["asset_id"]),
+        _enum_value(values["transaction_type"]),
+        str(Decimal(values["amount"]).normalize()),
+        created_at.date().isoformat(),
+        normalize_note(values.get("note")),
+        values.get("external_ref") or "",
+    )
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def reference_key(asset_id: int, external_ref: str) -> str:
+    """Idempotency key of a transaction the bank identified: one per asset and reference."""
+    return "ref:" + hashlib.sha1(f"{asset_id}\x1f{external_ref}".encode("utf-8")).hexdigest()
+
+
+def _enum_value(value: Any) -> str:
+    return str(getattr(value, "value", value))
@@ -0,0 +1,137 @@
+from ....domain.repository.i_import_job_repository import ImportJobRepositoryProtocol
+from typing import Any, Dict, List, Optional
+from returns.result import Result, Success, Failure
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from .base_repository import BaseRepository
+from .transaction_repo import TransactionRepository
+from ..retry import with_deadlock_retry, is_retryable_error
+from ...mysql.mysql_connection import MysqlConnection
+from ....domain.entities.schema import ImportJob
+from ....domain.value_objects.dto import (
+    CreateTransactionDto,
+    ResImportJobDto,
+    ImportStatusEnum,
+    StatementFormatEnum,
+)
+
+# Errors are stored on the job row, which bounds their length
+MAX_ERROR_LENGTH = 1024
+
+
+class ImportJobRepository(BaseRepository, ImportJobRepositoryProtocol):
+    """
+    Bank-statement import jobs. Each chunk of imported transactions is written
+    together with the job's new offset in one DB transaction, so after a crash
+    the saved offset is exactly the number of records already written.
+    """
+
+    def __init__(self, db: MysqlConnection, transactions: TransactionRepository):
+        super().__init__(db)
+        self._transactions = transactions
+
+    async def create_job(
+        self, source: str, file_format: StatementFormatEnum, asset_id: int
+    ) -> Result[ResImportJobDto, Exception]:
+        async with await self._db.get_session() as session:
+            try:
+                now = self._now()
+                job = await self._insert_row(session, ImportJob, {
+                    "source": source,
+                    "file_format": file_format.value,
+                    "asset_id": asset_id,
+                    "status": ImportStatusEnum.RUNNING.value,
+                    "next_offset": 0,
+                    "imported_count": 0,
+                    "skipped_count": 0,
+                    "duplicate_count": 0,
+                    "error": None,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+                await session.commit()
+                return Success(ResImportJobDto.model_validate(job))
+            except SQLAlchemyError as e:
+                await session.rollback()
+                return Failure(e)
+
+    async def get(self, id: int) -> Optional[ResImportJobDto]:
+        async with await self._db.get_session() as session:
+            row = (await session.execute(
+                select(*self._dto_columns(ImportJob, ResImportJobDto)).where(ImportJob.id == id)
+            )).first()
+        return ResImportJobDto.model_validate(dict(row._mapping)) if row else None
+
+    async def write_chunk(
+        self, id: int, dtos: List[CreateTransactionDto], expected_offset: int, next_offset: int, skipped: int
+    ) -> Result[ResImportJobDto, Exception]:
+        try:
+            return await with_deadlock_retry(
+                lambda: self._write_chunk_once(id, dtos, expected_offset, next_offset, skipped)
+            )
+        except SQLAlchemyError as e:
+            return Failure(e)
+
+    async def _write_chunk_once(
+        self, id: int, dtos: List[CreateTransactionDto], expected_offset: int, next_offset: int, skipped: int
+    ) -> Result[ResImportJobDto, Exception]:
+        async with await self._db.get_session() as session:
+            try:
+                async with session.begin():
+                    # The job row lock serializes runs of the same job, and the
+                    # offset check stops a second run from writing a chunk twice
+                    job = await self._lock_job(session, id)
+                    if job is None:
+                        return Failure(Exception("Import job not found"))
+                    if job["next_offset"] != expected_offset:
+                        return Failure(Exception(
+                            f"Import job {id} is at offset {job['next_offset']}, not {expected_offset}; "
+                            "another run may be importing it"
+                        ))
+
+                    # Records the ledger already has, by bank reference, are
+                    # counted as duplicates rather than written again
+                    inserted = 0
+                    if dtos:
+                        _, inserted = await self._transactions.insert_unique(session, dtos)
+                    updated = await self._update_row(
+                        session, ImportJob, id,
+                        {
+                            "next_offset": next_offset,
+                            "imported_count": job["imported_count"] + inserted,
+                            "skipped_count": job["skipped_count"] + skipped,
+                            "duplicate_count": job["duplicate_count"] + len(dtos) - inserted,
+                        },
+                        ResImportJobDto.model_fields, known=job,
+                    )
+                return Success(ResImportJobDto.model_validate(updated))
+            except SQLAlchemyError as e:
+                if is_retryable_error(e):
+                    raise
+                return Failure(e)
+
+    async def set_status(
+        self, id: int, status: ImportStatusEnum, error: Optional[str] = None
+    ) -> Result[ResImportJobDto, Exception]:
+        async with await self._db.get_session() as session:
+            try:
+                job = await self._update_row(
+                    session, ImportJob, id,
+                    {"status": status.value, "error": error[:MAX_ERROR_LENGTH] if error else None},
+                    ResImportJobDto.model_fields,
+                )
+                if job is None:
+                    return Failure(Exception("Import job not found"))
+                await session.commit()
+                return Success(ResImportJobDto.model_validate(job))
+            except SQLAlchemyError as e:
+                await session.rollback()
+                return Failure(e)
+
+    @staticmethod
+    async def _lock_job(session: AsyncSession, id: int) -> Optional[Dict[str, Any]]:
+        row = (await session.execute(
+            select(ImportJob.__table__).where(ImportJob.id == id).with_for_update()
+        )).first()
+        return dict(row._mapping) if row else None
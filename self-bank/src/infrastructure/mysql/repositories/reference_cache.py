@@ -0,0 +1,115 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def normalize_name(name: str) -> str:
+    """Key used for case-insensitive name lookups and uniqueness."""
+    return name.strip().lower()
+
+
+class ReferenceCache(Generic[T]):
+    """
+    In-process read-through cache of a small reference table (asset, expense
+    and contact types), indexed by id and by normalized name.
+
+    The whole table is loaded on the first lookup and served from memory after
+    that. Repository writes invalidate or evict it once they have committed;
+    the TTL only bounds how long writes made by another process can stay
+    invisible.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Awaitable[List[T]]],
+        name_loader: Optional[Callable[[str], Awaitable[Optional[T]]]] = None,
+        ttl_seconds: float = 300.0,
+    ):
+        self._loader = loader
+        self._name_loader = name_loader
+        self._ttl = ttl_seconds
+        self._by_id: Dict[int, T] = {}
+        self._by_name: Dict[str, T] = {}
+        self._loaded_at: Optional[float] = None
+        # Bumped by every write so a load racing with a write is not installed
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+
+    async def get(self, id: int) -> Optional[T]:
+        by_id, _ = await self._snapshot()
+        return by_id.get(id)
+
+    async def get_by_name(self, name: str) -> Optional[T]:
+        _, by_name = await self._snapshot()
+        item = by_name.get(normalize_name(name))
+        if item is None and self._name_loader is not None:
+            # Not cached: ask the name index, in case another process added it
+            self.misses += 1
+            item = await self._name_loader(normalize_name(name))
+            if item is not None:
+                self.put(item)
+        return item
+
+    async def list(self) -> List[T]:
+        by_id, _ = await self._snapshot()
+        return [by_id[id] for id in sorted(by_id)]
+
+    def put(self, item: T) -> None:
+        """Adds or replaces one committed row, e.g. one found by name."""
+        self._generation += 1
+        id: int = getattr(item, "id")
+        old = self._by_id.get(id)
+        if old is not None:
+            self._by_name.pop(normalize_name(getattr(old, "name")), None)
+        if self._loaded_at is not None:
+            self._by_id[id] = item
+            self._by_name[normalize_name(getattr(item, "name"))] = item
+
+    def evict(self, id: int) -> None:
+        """Write-through after a delete has been committed."""
+        self._generation += 1
+        old = self._by_id.pop(id, None)
+        if old is not None:
+            self._by_name.pop(normalize_name(getattr(old, "name")), None)
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._loaded_at = None
+        self._by_id, self._by_name = {}, {}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "loads": self.loads,
+            "size": len(self._by_id),
+        }
+
+    async def _snapshot(self) -> Tuple[Dict[int, T], Dict[str, T]]:
+        if self._is_fresh():
+            self.hits += 1
+            return self._by_id, self._by_name
+
+        self.misses += 1
+        async with self._lock:
+            # Another caller may have loaded it while we waited for the lock
+            if self._is_fresh():
+                return self._by_id, self._by_name
+
+            generation = self._generation
+            rows = await self._loader()
+            self.loads += 1
+            by_id = {getattr(row, "id"): row for row in rows}
+            by_name = {normalize_name(getattr(row, "name")): row for row in rows}
+            if generation == self._generation:
+                self._by_id, self._by_name = by_id, by_name
+                self._loaded_at = time.monotonic()
+            return by_id, by_name
+
+    def _is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self._ttl
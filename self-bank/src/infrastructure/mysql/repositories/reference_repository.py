@@ -0,0 +1,84 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy import bindparam, select
+from sqlalchemy.exc import IntegrityError
+from .reference_cache import ReferenceCache, normalize_name
+from .sql_crud_repository import SqlCrudRepository, TModel, TCreate, TUpdate, TRes
+from ...mysql.mysql_connection import MysqlConnection
+
+# MySQL's ER_DUP_ENTRY, raised by a unique index
+DUPLICATE_ENTRY = 1062
+
+
+class SqlReferenceRepository(SqlCrudRepository[TModel, TCreate, TUpdate, TRes]):
+    """
+    CRUD for a small lookup table with a unique, case-insensitive name (asset,
+    expense and contact types). The table is tiny and read constantly, so
+    reads are served from a ReferenceCache. The cache is shared by every
+    request, so it is loaded outside any unit of work, from committed rows
+    only, and dropped once a write has committed.
+    """
+
+    def __init__(self, db: MysqlConnection):
+        super().__init__(db)
+        # Point lookup on the unique normalized_name index
+        self._by_name_stmt = select(*self._columns).where(
+            self._table.c.normalized_name == bindparam("normalized_name")
+        )
+        self.cache: ReferenceCache[TRes] = ReferenceCache(self._load_all, name_loader=self._select_by_name)
+
+    async def get(self, id: int) -> Optional[TRes]:
+        return await self.cache.get(id)
+
+    async def get_by_name(self, name: str) -> Optional[TRes]:
+        return await self.cache.get_by_name(name)
+
+    async def list(self) -> List[TRes]:
+        return await self.cache.list()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    def _create_values(self, dto: TCreate, now: Any) -> Dict[str, Any]:
+        values = super()._create_values(dto, now)
+        values["normalized_name"] = normalize_name(values["name"])
+        return values
+
+    def _update_values(self, dto: TUpdate) -> Dict[str, Any]:
+        values = super()._update_values(dto)
+        if "name" in values:
+            values["normalized_name"] = normalize_name(values["name"])
+        return values
+
+    async def _known(self, id: int) -> Optional[Dict[str, Any]]:
+        # The cached row supplies the unchanged columns, so the UPDATE is the
+        # only statement
+        cached = await self.cache.get(id)
+        return cached.model_dump() if cached else None
+
+    def _on_saved(self, item: TRes) -> None:
+        # Reloaded from the committed rows rather than patched with the
+        # written values, which may carry columns of a stale cached pre-image
+        self.cache.invalidate()
+
+    def _on_removed(self, id: int) -> None:
+        self.cache.evict(id)
+
+    def _integrity_error(self, error: IntegrityError) -> Exception:
+        # The unique name index rejects duplicates without scanning the table
+        # first; foreign key and NOT NULL violations are reported as they are
+        args = getattr(error.orig, "args", ())
+        if args and args[0] == DUPLICATE_ENTRY and "normalized_name" in str(error.orig):
+            return Exception(f"{self.entity_name} with this name already exists")
+        return error
+
+    async def _load_all(self) -> List[TRes]:
+        # A detached session: the unit of work's would show the cache rows
+        # its own transaction may still roll back
+        async with await self._db.get_detached_session() as session:
+            rows = (await session.execute(self._list_stmt)).all()
+        return self._rows_to_dtos(self.response_dto, rows)
+
+    async def _select_by_name(self, normalized_name: str) -> Optional[TRes]:
+        async with await self._db.get_detached_session() as session:
+            row = (await session.execute(self._by_name_stmt, {"normalized_name": normalized_name})).first()
+        return self._to_response(row._mapping) if row else None
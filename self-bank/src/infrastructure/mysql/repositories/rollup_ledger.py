@@ -0,0 +1,267 @@
+import logging
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import and_, delete, func, literal, literal_column, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from ....domain.entities.schema import Expense, MonthlyRollup, Transaction, TransactionType
+
+# (year_month, asset_id, expense_type_id, contact_id, transaction_type), 0 meaning "none"
+RollupKey = Tuple[str, int, int, int, TransactionType]
+RollupEntry = Tuple[RollupKey, Decimal]
+
+logger = logging.getLogger(__name__)
+
+
+def year_month(when: datetime) -> str:
+    return f"{when.year:04d}-{when.month:02d}"
+
+
+def month_bounds(ym: str) -> Tuple[datetime, datetime]:
+    """[first instant, first instant of the next month) of a 'YYYY-MM' month."""
+    start = datetime.strptime(ym, "%Y-%m")
+    if start.month == 12:
+        return start, start.replace(year=start.year + 1, month=1)
+    return start, start.replace(month=start.month + 1)
+
+
+async def rollup_key(
+    session: AsyncSession,
+    transaction_type: Any,
+    asset_id: Optional[int],
+    expense_id: Optional[int],
+    contact_id: Optional[int],
+    created_at: datetime,
+) -> RollupKey:
+    """
+    Builds the rollup key of a transaction, resolving its expense to the
+    expense type. The expense is read with a shared lock, so a write racing
+    a change of the expense's type waits for it and keys by the new type.
+    """
+    expense_type_id = None
+    if expense_id is not None:
+        expense_type_id = await session.scalar(
+            select(Expense.expense_type_id).where(Expense.id == expense_id).with_for_update(read=True)
+        )
+    return (
+        year_month(created_at),
+        asset_id or 0,
+        expense_type_id or 0,
+        contact_id or 0,
+        TransactionType(transaction_type),
+    )
+
+
+async def rollup_keys(session: AsyncSession, transactions: Sequence[Dict[str, Any]]) -> List[RollupKey]:
+    """
+    Rollup keys of many transaction rows, resolving every expense they
+    reference with one query instead of one per row, shared-locked like in
+    rollup_key.
+    """
+    expense_ids = {t["expense_id"] for t in transactions if t.get("expense_id") is not None}
+    expense_types: Dict[int, int] = {}
+    if expense_ids:
+        result = await session.execute(
+            select(Expense.id, Expense.expense_type_id)
+            .where(Expense.id.in_(sorted(expense_ids)))
+            .with_for_update(read=True)
+        )
+        expense_types = {row.id: row.expense_type_id for row in result}
+    return [
+        (
+            year_month(t["created_at"]),
+            t["asset_id"] or 0,
+            expense_types.get(t.get("expense_id")) or 0,
+            t.get("contact_id") or 0,
+            TransactionType(t["transaction_type"]),
+        )
+        for t in transactions
+    ]
+
+
+async def add_to_rollups(session: AsyncSession, entries: Iterable[RollupEntry]) -> None:
+    """
+    Folds new transactions into their rollup rows with one
+    INSERT ... ON DUPLICATE KEY UPDATE. Entries are pre-aggregated per key, so
+    a batch of writes costs one row per distinct key, and rows are written in
+    key order so concurrent writers lock them in the same order.
+    """
+    stats: Dict[RollupKey, List[Any]] = {}
+    for key, amount in entries:
+        amount = Decimal(amount)
+        row = stats.get(key)
+        if row is None:
+            stats[key] = [amount, 1, amount, amount]
+        else:
+            row[0] += amount
+            row[1] += 1
+            row[2] = min(row[2], amount)
+            row[3] = max(row[3], amount)
+    if not stats:
+        return
+
+    stmt = mysql_insert(MonthlyRollup).values([
+        {
+            "year_month": key[0],
+            "asset_id": key[1],
+            "expense_type_id": key[2],
+            "contact_id": key[3],
+            "transaction_type": key[4],
+            "total": total,
+            "tx_count": count,
+            "min_amount": low,
+            "max_amount": high,
+        }
+        for key, (total, count, low, high) in sorted(stats.items())
+    ])
+    await session.execute(stmt.on_duplicate_key_update(
+        total=MonthlyRollup.total + stmt.inserted.total,
+        tx_count=MonthlyRollup.tx_count + stmt.inserted.tx_count,
+        min_amount=func.least(MonthlyRollup.min_amount, stmt.inserted.min_amount),
+        max_amount=func.greatest(MonthlyRollup.max_amount, stmt.inserted.max_amount),
+    ))
+
+
+async def remove_from_rollups(session: AsyncSession, entries: Iterable[RollupEntry]) -> None:
+    """
+    Takes removed (deleted, or the old side of updated) transactions out of
+    their rollup rows. Must run after the change is flushed: when a removed
+    amount was the row's min or max, those are recomputed from the remaining
+    transactions of that one key and month.
+    """
+    removed: Dict[RollupKey, List[Decimal]] = defaultdict(list)
+    for key, amount in entries:
+        removed[key].append(Decimal(amount))
+
+    for key, amounts in sorted(removed.items()):
+        row = (await session.execute(
+            select(MonthlyRollup.id, MonthlyRollup.tx_count, MonthlyRollup.min_amount, MonthlyRollup.max_amount)
+            .where(_key_clause(key))
+            .with_for_update()
+        )).first()
+        if row is None:
+            # Written before rollups were maintained, or the rollups drifted;
+            # only a rebuild can set the key right again
+            logger.warning(
+                "monthly rollup %s not found while removing %d transaction(s); "
+                "run rebuild_rollups.py to recompute the rollups", key, len(amounts),
+            )
+            continue
+
+        if row.tx_count <= len(amounts):
+            await session.execute(delete(MonthlyRollup).where(MonthlyRollup.id == row.id))
+            continue
+
+        values: Dict[str, Any] = {
+            "total": MonthlyRollup.total - sum(amounts),
+            "tx_count": MonthlyRollup.tx_count - len(amounts),
+        }
+        if any(a == row.min_amount or a == row.max_amount for a in amounts):
+            low, high = (await session.execute(_key_range_query(key))).one()
+            if low is not None:
+                values["min_amount"], values["max_amount"] = low, high
+        await session.execute(
+            update(MonthlyRollup)
+            .where(MonthlyRollup.id == row.id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def move_expense_rollups(session: AsyncSession, expense_id: int, old_expense_type_id: Optional[int]) -> None:
+    """
+    Moves the transactions of an expense from the rollup rows of its old
+    expense type to those of its current one. Must run after the expense's
+    new type is written: min and max of the old rows are then recomputed
+    without these transactions. They are read with a locking read, so
+    transactions committed since this DB transaction's snapshot are moved too;
+    a write of one of them racing the move may deadlock with it, and InnoDB
+    then rolls one of the two back rather than letting the rollups drift.
+    """
+    rows = (await session.execute(
+        select(
+            Transaction.transaction_type, Transaction.amount, Transaction.asset_id,
+            Transaction.expense_id, Transaction.contact_id, Transaction.created_at,
+        )
+        .where(Transaction.expense_id == expense_id)
+        .with_for_update(read=True)
+    )).mappings().all()
+    if not rows:
+        return
+
+    new_keys = await rollup_keys(session, rows)
+    old_entries: List[RollupEntry] = [
+        ((ym, asset_id, old_expense_type_id or 0, contact_id, kind), row["amount"])
+        for (ym, asset_id, _, contact_id, kind), row in zip(new_keys, rows)
+    ]
+    await remove_from_rollups(session, old_entries)
+    await add_to_rollups(session, [(key, row["amount"]) for key, row in zip(new_keys, rows)])
+
+
+def rollup_select(ym: str) -> Any:
+    """
+    SELECT computing every rollup row of one month straight from the ledger,
+    shaped to be the source of an INSERT INTO monthly_rollups ... SELECT.
+    """
+    start, end = month_bounds(ym)
+    # Inline 0s keep the select list and GROUP BY textually identical, which
+    # ONLY_FULL_GROUP_BY needs to match them
+    none = literal_column("0")
+    expense_type_id = func.coalesce(Expense.expense_type_id, none)
+    asset_id = func.coalesce(Transaction.asset_id, none)
+    contact_id = func.coalesce(Transaction.contact_id, none)
+    return (
+        select(
+            literal(ym).label("year_month"),
+            asset_id.label("asset_id"),
+            expense_type_id.label("expense_type_id"),
+            contact_id.label("contact_id"),
+            Transaction.transaction_type,
+            func.sum(Transaction.amount).label("total"),
+            func.count().label("tx_count"),
+            func.min(Transaction.amount).label("min_amount"),
+            func.max(Transaction.amount).label("max_amount"),
+        )
+        .select_from(Transaction)
+        .outerjoin(Expense, Expense.id == Transaction.expense_id)
+        .where(Transaction.created_at >= start, Transaction.created_at < end)
+        .group_by(asset_id, expense_type_id, contact_id, Transaction.transaction_type)
+    )
+
+
+def _key_clause(key: RollupKey) -> Any:
+    ym, asset_id, expense_type_id, contact_id, transaction_type = key
+    return and_(
+        MonthlyRollup.year_month == ym,
+        MonthlyRollup.asset_id == asset_id,
+        MonthlyRollup.expense_type_id == expense_type_id,
+        MonthlyRollup.contact_id == contact_id,
+        MonthlyRollup.transaction_type == transaction_type,
+    )
+
+
+def _key_range_query(key: RollupKey) -> Any:
+    # Bounded to one month of one asset via ix_transactions_asset_created_at.
+    # A locking read: it sees rows committed after the transaction's snapshot,
+    # and its range locks keep a concurrent insert of the same key from
+    # landing between this read and the rollup update
+    ym, asset_id, expense_type_id, contact_id, transaction_type = key
+    start, end = month_bounds(ym)
+    return (
+        select(func.min(Transaction.amount), func.max(Transaction.amount))
+        .select_from(Transaction)
+        .outerjoin(Expense, Expense.id == Transaction.expense_id)
+        .where(
+            func.coalesce(Transaction.asset_id, 0) == asset_id
+            if asset_id == 0 else Transaction.asset_id == asset_id,
+            Transaction.created_at >= start,
+            Transaction.created_at < end,
+            Transaction.transaction_type == transaction_type,
+            func.coalesce(Transaction.contact_id, 0) == contact_id,
+            func.coalesce(Expense.expense_type_id, 0) == expense_type_id,
+        )
+        # Expenses are only read; rollup_key takes them with shared locks
+        .with_for_update(of=Transaction)
+    )
@@ -0,0 +1,299 @@
+import heapq
+from typing import Any, AsyncIterator, Dict, Generic, List, Optional, Sequence, Set, Tuple, Type, TypeVar, get_args
+from pydantic import BaseModel
+from returns.result import Result, Success, Failure
+from sqlalchemy import and_, bindparam, delete, or_, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from .base_repository import BaseRepository
+from ...mysql.change_feed import note_changed, note_deleted
+from ...mysql.mysql_connection import MysqlConnection
+from ....domain.entities.schema import Tombstone
+from ....domain.value_objects.dto import ChangesDto, PageDto
+from ....domain.value_objects.pagination import DEFAULT_PAGE_SIZE, clamp_page_size, encode_change_cursor
+
+TModel = TypeVar("TModel")
+TCreate = TypeVar("TCreate", bound=BaseModel)
+TUpdate = TypeVar("TUpdate", bound=BaseModel)
+TRes = TypeVar("TRes", bound=BaseModel)
+
+
+class SqlCrudRepository(BaseRepository, Generic[TModel, TCreate, TUpdate, TRes]):
+    """
+    CRUD over one table, answering with `response_dto`s. Subclasses set
+    `model`, `response_dto` and `entity_name`, and adjust behaviour through
+    the hooks below instead of re-implementing the methods.
+
+    Reads select only the response columns, never whole ORM objects. The
+    statements that do not depend on their arguments are built once, with
+    bound parameters, so SQLAlchemy computes their cache key and compiles
+    them once and every call only binds values.
+    """
+
+    model: Type[TModel]
+    response_dto: Type[TRes]
+    entity_name: str = "Record"
+
+    def __init__(self, db: MysqlConnection):
+        super().__init__(db)
+        table: Any = self.model.__table__  # type: ignore[attr-defined]
+        self._table = table
+        self._columns = self._dto_columns(self.model, self.response_dto)
+        self._table_columns: Set[str] = set(table.c.keys())
+        # Fields the response allows to be None; an explicit None in an
+        # update only clears these and is ignored for the others
+        self._nullable: Set[str] = {
+            name for name, field in self.response_dto.model_fields.items()
+            if type(None) in get_args(field.annotation)
+        }
+
+        ids = bindparam("ids", expanding=True)
+        self._get_stmt = select(*self._columns).where(table.c.id == bindparam("id"))
+        self._get_many_stmt = select(*self._columns).where(table.c.id.in_(ids)).order_by(table.c.id)
+        self._list_stmt = select(*self._columns).order_by(table.c.id)
+        self._delete_stmt = delete(table).where(table.c.id == bindparam("id"))
+        self._delete_many_stmt = delete(table).where(table.c.id.in_(ids))
+
+        # Tables with a change_seq column feed changes_since; writes to them
+        # are noted so the commit stamps them and records their tombstones
+        self._tracked = "change_seq" in table.c
+        if self._tracked:
+            # Keyset over (change_seq, id): a row written after a cursor was
+            # taken gets a higher sequence number, so it always sorts past it
+            seq, after_id = bindparam("seq"), bindparam("after_id")
+            self._changed_stmt = (
+                select(*self._columns, table.c.change_seq)
+                .where(or_(table.c.change_seq > seq, and_(table.c.change_seq == seq, table.c.id > after_id)))
+                .order_by(table.c.change_seq, table.c.id)
+            )
+            self._deleted_stmt = (
+                select(Tombstone.entity_id, Tombstone.change_seq)
+                .where(
+                    Tombstone.entity == table.name,
+                    or_(Tombstone.change_seq > seq, and_(Tombstone.change_seq == seq, Tombstone.entity_id > after_id)),
+                )
+                .order_by(Tombstone.change_seq, Tombstone.entity_id)
+            )
+
+    async def create(self, dto: TCreate) -> Result[TRes, Exception]:
+        result = await self.create_many([dto])
+        return result.map(lambda items: items[0])
+
+    async def create_many(self, dtos: Sequence[TCreate]) -> Result[List[TRes], Exception]:
+        """
+        Inserts every row in one transaction with multi-row INSERTs, building
+        the responses from the written values.
+        """
+        if not dtos:
+            return Success([])
+        async with await self._db.get_session() as session:
+            try:
+                rows = await self.insert_many(session, dtos)
+                await session.commit()
+            except IntegrityError as e:
+                await session.rollback()
+                return Failure(self._integrity_error(e))
+            except SQLAlchemyError as e:
+                await session.rollback()
+                return Failure(e)
+        items = [self._to_response(row) for row in rows]
+
+        def saved() -> None:
+            for item in items:
+                self._on_saved(item)
+        self._db.after_commit(saved)
+        return Success(items)
+
+    async def insert_many(self, session: AsyncSession, dtos: Sequence[TCreate]) -> List[Dict[str, Any]]:
+        """
+        Writes the rows, and whatever _after_insert adds, inside the caller's
+        transaction without committing it; returns the written rows.
+        """
+        now = self._now()
+        rows = await self._insert_rows(session, self.model, [self._create_values(dto, now) for dto in dtos])
+        self._note_changed(session, [row["id"] for row in rows])
+        await self._after_insert(session, rows)
+        return rows
+
+    async def get(self, id: int) -> Optional[TRes]:
+        async with await self._db.get_session() as session:
+            row = (await session.execute(self._get_stmt, {"id": id})).first()
+        return self._to_response(row._mapping) if row else None
+
+    async def get_many(self, ids: Sequence[int]) -> List[TRes]:
+        """The rows with these ids that exist, in id order, in one query."""
+        if not ids:
+            return []
+        async with await self._db.get_session() as session:
+            rows = (await session.execute(self._get_many_stmt, {"ids": list(ids)})).all()
+        return self._rows_to_dtos(self.response_dto, rows)
+
+    async def update(self, id: int, dto: TUpdate) -> Result[TRes, Exception]:
+        async with await self._db.get_session() as session:
+            try:
+                values = self._update_values(dto)
+                before = await self._before_update(session, id, values)
+                row = await self._update_row(
+                    session, self.model, id, values,
+                    self.response_dto.model_fields, known=await self._known(id),
+                )
+                if row is None:
+                    self._on_removed(id)
+                    return Failure(self._not_found())
+
+                await self._after_update(session, id, values, before)
+                self._note_changed(session, [id])
+                await session.commit()
+            except IntegrityError as e:
+                await session.rollback()
+                return Failure(self._integrity_error(e))
+            except SQLAlchemyError as e:
+                await session.rollback()
+                return Failure(e)
+        item = self._to_response(row)
+        self._db.after_commit(lambda: self._on_saved(item))
+        return Success(item)
+
+    async def delete(self, id: int) -> Result[bool, Exception]:
+        async with await self._db.get_session() as session:
+            try:
+                await self._before_delete(session, [id])
+                result: Any = await session.execute(self._delete_stmt, {"id": id})
+                if result.rowcount == 0:
+                    await session.rollback()
+                    return Failure(self._not_found())
+
+                self._note_deleted(session, [id])
+                await session.commit()
+            except SQLAlchemyError as e:
+                await session.rollback()
+                return Failure(e)
+        self._db.after_commit(lambda: self._on_removed(id))
+        return Success(True)
+
+    async def delete_many(self, ids: Sequence[int]) -> Result[int, Exception]:
+        """Deletes the rows with these ids in one statement; returns how many existed."""
+        if not ids:
+            return Success(0)
+        async with await self._db.get_session() as session:
+            try:
+                await self._before_delete(session, list(ids))
+                result: Any = await session.execute(self._delete_many_stmt, {"ids": list(ids)})
+                if result.rowcount:
+                    self._note_deleted(session, ids)
+                await session.commit()
+            except SQLAlchemyError as e:
+                await session.rollback()
+                return Failure(e)
+
+        def removed() -> None:
+            for id in ids:
+                self._on_removed(id)
+        self._db.after_commit(removed)
+        return Success(max(result.rowcount, 0))
+
+    async def list(self) -> List[TRes]:
+        async with await self._db.get_session() as session:
+            rows = (await session.execute(self._list_stmt)).all()
+        return self._rows_to_dtos(self.response_dto, rows)
+
+    async def list_page(
+        self, after_id: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> PageDto[TRes]:
+        return await self._list_page(self.model, self.response_dto, after_id, limit)
+
+    def iter_all(self, chunk_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[TRes]:
+        return self._iter_all(self.model, self.response_dto, chunk_size)
+
+    async def changes_since(
+        self, after: Tuple[int, int] = (0, 0), limit: int = DEFAULT_PAGE_SIZE
+    ) -> ChangesDto[TRes]:
+        """
+        Rows written and rows deleted after the (change_seq, id) position
+        `after`, in sequence order, at most `limit` of them together. Both
+        reads are index range scans, so a sync costs what changed, not the
+        size of the table.
+        """
+        if not self._tracked:
+            raise TypeError(f"Changes of {self._table.name} are not tracked")
+        limit = clamp_page_size(limit)
+        params = {"seq": after[0], "after_id": after[1]}
+        async with await self._db.get_session() as session:
+            rows = (await session.execute(self._changed_stmt.limit(limit + 1), params)).all()
+            gone = (await session.execute(self._deleted_stmt.limit(limit + 1), params)).all()
+
+        # Each list is in (change_seq, id) order; merged, the first `limit`
+        # entries are the next changes whichever table they come from
+        merged = list(heapq.merge(
+            (((row.change_seq, row.id), row) for row in rows),
+            (((tomb.change_seq, tomb.entity_id), None) for tomb in gone),
+            key=lambda entry: entry[0],
+        ))
+        taken = merged[:limit]
+        changed = [row for _, row in taken if row is not None]
+        return ChangesDto[self.response_dto](  # type: ignore[name-defined]
+            # The trailing change_seq column is not a response field and is
+            # dropped when the rows are zipped with the field names
+            items=self._rows_to_dtos(self.response_dto, changed),
+            deleted_ids=[position[1] for position, row in taken if row is None],
+            next_cursor=encode_change_cursor(*(taken[-1][0] if taken else after)),
+            has_more=len(merged) > limit,
+        )
+
+    def _note_changed(self, session: AsyncSession, ids: Sequence[int]) -> None:
+        if self._tracked:
+            note_changed(session, self._table.name, ids)
+
+    def _note_deleted(self, session: AsyncSession, ids: Sequence[int]) -> None:
+        if self._tracked:
+            note_deleted(session, self._table.name, ids)
+
+    # --- hooks -------------------------------------------------------------
+
+    def _create_values(self, dto: TCreate, now: Any) -> Dict[str, Any]:
+        """Column values of a new row. Timestamps are set here so the response needs no reload."""
+        values = {name: value for name, value in dto.model_dump().items() if name in self._table_columns}
+        for stamp in ("created_at", "updated_at"):
+            if stamp in self._table_columns:
+                values[stamp] = now
+        return values
+
+    def _update_values(self, dto: TUpdate) -> Dict[str, Any]:
+        """Columns to change: the fields that were sent, except a None the response cannot hold."""
+        return {
+            name: value
+            for name, value in dto.model_dump(exclude_unset=True).items()
+            if name in self._table_columns and (value is not None or name in self._nullable)
+        }
+
+    async def _known(self, id: int) -> Optional[Dict[str, Any]]:
+        """Pre-image of a row, if the repository already has it, so an update need not read it."""
+        return None
+
+    async def _after_insert(self, session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """Runs in the inserting transaction, after the rows are written."""
+
+    async def _before_update(self, session: AsyncSession, id: int, values: Dict[str, Any]) -> Any:
+        """Runs in the updating transaction, before the row is written; the result goes to _after_update."""
+        return None
+
+    async def _after_update(self, session: AsyncSession, id: int, values: Dict[str, Any], before: Any) -> None:
+        """Runs in the updating transaction, after the row is written."""
+
+    async def _before_delete(self, session: AsyncSession, ids: List[int]) -> None:
+        """Runs in the deleting transaction, before the rows are deleted."""
+
+    def _on_saved(self, item: TRes) -> None:
+        """Called after a create or update has been committed, or its unit of work has."""
+
+    def _on_removed(self, id: int) -> None:
+        """Called after a delete has been committed, or when an update found no row."""
+
+    def _integrity_error(self, error: IntegrityError) -> Exception:
+        return error
+
+    def _not_found(self) -> Exception:
+        return Exception(f"{self.entity_name} not found")
+
+    def _to_response(self, row: Any) -> TRes:
+        return self.response_dto.model_validate(dict(row))
@@ -0,0 +1,161 @@
+from ....domain.repository.i_summary_repository import SummaryRepositoryProtocol
+from typing import Any, List
+from decimal import Decimal
+from sqlalchemy import case, delete, func, insert, select
+from .base_repository import BaseRepository
+from .rollup_ledger import month_bounds, rollup_select, year_month
+from ....domain.entities.schema import MonthlyRollup, Transaction, TransactionType
+from ....domain.value_objects.dto import (
+    ResMonthlySummaryDto,
+    ResExpenseTypeSummaryDto,
+    ResContactSummaryDto,
+)
+
+_ROLLUP_COLUMNS = [
+    "year_month", "asset_id", "expense_type_id", "contact_id", "transaction_type",
+    "total", "tx_count", "min_amount", "max_amount",
+]
+
+
+class SummaryRepository(BaseRepository, SummaryRepositoryProtocol):
+    """
+    Reads summaries from monthly_rollups only, so their cost depends on the
+    number of months and dimensions asked for, never on the size of the ledger.
+    """
+
+    async def monthly_totals(self, start_month: str, end_month: str) -> List[ResMonthlySummaryDto]:
+        income = self._sum_if(MonthlyRollup.total, TransactionType.INCOME)
+        payment = self._sum_if(MonthlyRollup.total, TransactionType.PAYMENT)
+        stmt = (
+            select(
+                MonthlyRollup.year_month,
+                income.label("income"),
+                payment.label("payment"),
+                self._sum_if(MonthlyRollup.tx_count, TransactionType.INCOME).label("income_count"),
+                self._sum_if(MonthlyRollup.tx_count, TransactionType.PAYMENT).label("payment_count"),
+            )
+            .where(self._month_range(start_month, end_month))
+            .group_by(MonthlyRollup.year_month)
+            .order_by(MonthlyRollup.year_month)
+        )
+        async with await self._db.get_session() as session:
+            rows = (await session.execute(stmt)).all()
+        return [
+            ResMonthlySummaryDto(
+                year_month=row.year_month,
+                income=Decimal(row.income),
+                payment=Decimal(row.payment),
+                net=Decimal(row.income) - Decimal(row.payment),
+                income_count=int(row.income_count),
+                payment_count=int(row.payment_count),
+            )
+            for row in rows
+        ]
+
+    async def expense_type_totals(self, start_month: str, end_month: str) -> List[ResExpenseTypeSummaryDto]:
+        total = func.sum(MonthlyRollup.total)
+        stmt = (
+            select(
+                MonthlyRollup.expense_type_id,
+                total.label("total"),
+                func.sum(MonthlyRollup.tx_count).label("count"),
+                func.min(MonthlyRollup.min_amount).label("min_amount"),
+                func.max(MonthlyRollup.max_amount).label("max_amount"),
+            )
+            .where(
+                self._month_range(start_month, end_month),
+                MonthlyRollup.transaction_type == TransactionType.PAYMENT,
+            )
+            .group_by(MonthlyRollup.expense_type_id)
+            .order_by(total.desc())
+        )
+        async with await self._db.get_session() as session:
+            rows = (await session.execute(stmt)).all()
+        return [
+            ResExpenseTypeSummaryDto(
+                expense_type_id=row.expense_type_id or None,
+                total=Decimal(row.total),
+                count=int(row.count),
+                min_amount=Decimal(row.min_amount),
+                max_amount=Decimal(row.max_amount),
+            )
+            for row in rows
+        ]
+
+    async def top_contacts(self, start_month: str, end_month: str, limit: int) -> List[ResContactSummaryDto]:
+        income = self._sum_if(MonthlyRollup.total, TransactionType.INCOME)
+        payment = self._sum_if(MonthlyRollup.total, TransactionType.PAYMENT)
+        stmt = (
+            select(
+                MonthlyRollup.contact_id,
+                income.label("income"),
+                payment.label("payment"),
+                func.sum(MonthlyRollup.tx_count).label("count"),
+            )
+            .where(
+                self._month_range(start_month, end_month),
+                MonthlyRollup.contact_id != 0,
+                MonthlyRollup.transaction_type.in_([TransactionType.INCOME, TransactionType.PAYMENT]),
+            )
+            .group_by(MonthlyRollup.contact_id)
+            .order_by((income + payment).desc(), MonthlyRollup.contact_id)
+            .limit(limit)
+        )
+        async with await self._db.get_session() as session:
+            rows = (await session.execute(stmt)).all()
+        return [
+            ResContactSummaryDto(
+                contact_id=row.contact_id,
+                income=Decimal(row.income),
+                payment=Decimal(row.payment),
+                count=int(row.count),
+            )
+            for row in rows
+        ]
+
+    async def ledger_months(self) -> List[str]:
+        """Every month from the oldest to the newest transaction, as 'YYYY-MM'."""
+        async with await self._db.get_session() as session:
+            first, last = (await session.execute(
+                select(func.min(Transaction.created_at), func.max(Transaction.created_at))
+            )).one()
+        if first is None:
+            return []
+
+        months: List[str] = []
+        current, last_month = year_month(first), year_month(last)
+        while current <= last_month:
+            months.append(current)
+            current = year_month(month_bounds(current)[1])
+        return months
+
+    async def rebuild_month(self, year_month: str) -> int:
+        """
+        Recomputes the rollup rows of one month from the ledger, replacing the
+        old ones in the same DB transaction. Returns the number of rows written.
+        """
+        async with await self._db.get_session() as session:
+            async with session.begin():
+                await session.execute(delete(MonthlyRollup).where(MonthlyRollup.year_month == year_month))
+                result: Any = await session.execute(
+                    insert(MonthlyRollup).from_select(_ROLLUP_COLUMNS, rollup_select(year_month))
+                )
+                return max(result.rowcount, 0)
+
+    async def prune_except(self, months: List[str]) -> int:
+        """Deletes rollup rows of every month not in `months`."""
+        async with await self._db.get_session() as session:
+            async with session.begin():
+                result: Any = await session.execute(
+                    delete(MonthlyRollup).where(MonthlyRollup.year_month.not_in(months))
+                )
+                return max(result.rowcount, 0)
+
+    @staticmethod
+    def _month_range(start_month: str, end_month: str) -> Any:
+        # 'YYYY-MM' strings sort like the months they name
+        return MonthlyRollup.year_month.between(start_month, end_month)
+
+    @staticmethod
+    def _sum_if(column: Any, transaction_type: TransactionType) -> Any:
+        return func.coalesce(func.sum(case((MonthlyRollup.transaction_type == transaction_type, column), else_=0)), 0)
@@ -1,54 +1,141 @@
+from decimal import Decimal
+from datetime import datetime
+from typing import Dict, List, Optional
+from collections import defaultdict
 from returns.result import Result, Success, Failure
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import select
 
 from .base_repository import BaseRepository
-from ....domain.entities.schema import CurrentSheet, Transaction, TransactionType
+from .balance_ledger import LedgerEffects, lock_sheets, transaction_effects, merge_deltas, apply_ledger_effects
+from .rollup_ledger import RollupEntry, RollupKey, add_to_rollups, year_month
+from ..change_feed import note_changed
+from ..retry import with_deadlock_retry, is_retryable_error
+from ....domain.entities.schema import Transaction, TransactionType
 from ....domain.repository.i_tranfer_repository import TranferRepositoryProtocol
-from ....domain.value_objects.dto import TransferFundDto
+from ....domain.value_objects.dto import (
+    TransferFundDto,
+    TransferItemResultDto,
+    BatchTransferResultDto,
+)
 
 
 class TransferRepository(BaseRepository, TranferRepositoryProtocol):
     async def transfer_fund(self, dto: TransferFundDto) -> Result[bool, Exception]:
+        try:
+            return await with_deadlock_retry(lambda: self._transfer_once(dto))
+        except SQLAlchemyError as e:
+            return Failure(e)
+
+    async def _transfer_once(self, dto: TransferFundDto) -> Result[bool, Exception]:
+        amount = Decimal(dto.amount)
         async with await self._db.get_session() as session:
             try:
-                # Fetch source balance
-                source_result = await session.execute(
-                    select(CurrentSheet).where(CurrentSheet.asset_id == dto.source_asset_id)
-                )
-                source_sheet = source_result.scalar_one_or_none()
-
-                # Fetch destination balance
-                dest_result = await session.execute(
-                    select(CurrentSheet).where(CurrentSheet.asset_id == dto.destination_asset_id)
-                )
-                dest_sheet = dest_result.scalar_one_or_none()
-
-                if not source_sheet or not dest_sheet:
-                    return Failure(Exception("Source or destination asset not found."))
-
-                current_source_balance = float(source_sheet.balance.value)
-                current_dest_balance = float(dest_sheet.balance.value)
-
-                if current_source_balance < float(dto.amount):
-                    return Failure(Exception("Insufficient funds in source asset."))
-
-                # Create transaction
-                txn = Transaction(
-                    transaction_type=TransactionType.TRANSFER,
-                    amount=dto.amount,
-                    asset_id=dto.source_asset_id,
-                    destination_asset_id=dto.destination_asset_id,
-                    note=dto.note
-                )
-                session.add(txn)
-
-                # Update balances using setattr
-                setattr(source_sheet, 'balance', current_source_balance - float(dto.amount))
-                setattr(dest_sheet, 'balance', current_dest_balance + float(dto.amount))
-
-                await session.commit()
+                # One short transaction: lock both sheets, check, write, commit
+                async with session.begin():
+                    balances = await lock_sheets(
+                        session, (dto.source_asset_id, dto.destination_asset_id)
+                    )
+                    if dto.source_asset_id not in balances or dto.destination_asset_id not in balances:
+                        return Failure(Exception("Source or destination asset not found."))
+
+                    if balances[dto.source_asset_id] < amount:
+                        return Failure(Exception("Insufficient funds in source asset."))
+
+                    created_at = self._now()
+                    row = await self._insert_row(session, Transaction, {
+                        "transaction_type": TransactionType.TRANSFER,
+                        "amount": amount,
+                        "asset_id": dto.source_asset_id,
+                        "destination_asset_id": dto.destination_asset_id,
+                        "note": dto.note,
+                        "created_at": created_at,
+                    })
+                    note_changed(session, Transaction.__tablename__, [row["id"]])
+                    await apply_ledger_effects(session, transaction_effects(
+                        TransactionType.TRANSFER, amount,
+                        dto.source_asset_id, dto.destination_asset_id, created_at,
+                    ))
+                    await add_to_rollups(session, [self._rollup_entry(dto, created_at)])
                 return Success(True)
             except SQLAlchemyError as e:
-                await session.rollback()
+                # Deadlocks bubble up so with_deadlock_retry can run us again
+                if is_retryable_error(e):
+                    raise
+                return Failure(e)
+
+    async def transfer_many(self, dtos: List[TransferFundDto]) -> Result[BatchTransferResultDto, Exception]:
+        try:
+            return await with_deadlock_retry(lambda: self._transfer_many_once(dtos))
+        except SQLAlchemyError as e:
+            return Failure(e)
+
+    async def _transfer_many_once(self, dtos: List[TransferFundDto]) -> Result[BatchTransferResultDto, Exception]:
+        async with await self._db.get_session() as session:
+            try:
+                async with session.begin():
+                    # Every sheet the batch touches, locked once in sorted order
+                    balances = await lock_sheets(
+                        session,
+                        [dto.source_asset_id for dto in dtos] + [dto.destination_asset_id for dto in dtos],
+                    )
+
+                    # Replay the transfers in order against the locked balances so
+                    # each item sees the effect of the ones before it
+                    deltas: Dict[int, Decimal] = defaultdict(Decimal)
+                    items: List[TransferItemResultDto] = []
+                    for index, dto in enumerate(dtos):
+                        error = self._check_transfer(dto, balances, deltas)
+                        if error is None:
+                            deltas[dto.source_asset_id] -= Decimal(dto.amount)
+                            deltas[dto.destination_asset_id] += Decimal(dto.amount)
+                        items.append(TransferItemResultDto(index=index, success=error is None, error=error))
+
+                    if any(not item.success for item in items):
+                        # Nothing was written yet; leaving the block just releases the locks
+                        return Success(BatchTransferResultDto(committed=False, items=items))
+
+                    created_at = self._now()
+                    # Multi-row INSERTs rather than executemany, so the ids
+                    # are known for the change feed
+                    rows = await self._insert_rows(session, Transaction, [
+                        {
+                            "transaction_type": TransactionType.TRANSFER,
+                            "amount": Decimal(dto.amount),
+                            "asset_id": dto.source_asset_id,
+                            "destination_asset_id": dto.destination_asset_id,
+                            "note": dto.note,
+                            "created_at": created_at,
+                        }
+                        for dto in dtos
+                    ])
+                    note_changed(session, Transaction.__tablename__, (row["id"] for row in rows))
+                    effects: LedgerEffects = merge_deltas(*(
+                        transaction_effects(
+                            TransactionType.TRANSFER, dto.amount,
+                            dto.source_asset_id, dto.destination_asset_id, created_at,
+                        )
+                        for dto in dtos
+                    ))
+                    await apply_ledger_effects(session, effects)
+                    await add_to_rollups(session, [self._rollup_entry(dto, created_at) for dto in dtos])
+                return Success(BatchTransferResultDto(committed=True, items=items))
+            except SQLAlchemyError as e:
+                if is_retryable_error(e):
+                    raise
                 return Failure(e)
+
+    @staticmethod
+    def _check_transfer(
+        dto: TransferFundDto, balances: Dict[int, Decimal], deltas: Dict[int, Decimal]
+    ) -> Optional[str]:
+        if dto.source_asset_id not in balances or dto.destination_asset_id not in balances:
+            return "Source or destination asset not found."
+        if balances[dto.source_asset_id] + deltas[dto.source_asset_id] < Decimal(dto.amount):
+            return "Insufficient funds in source asset."
+        return None
+
+    @staticmethod
+    def _rollup_entry(dto: TransferFundDto, created_at: datetime) -> RollupEntry:
+        # Transfers carry no expense or contact, so the key needs no lookup
+        key: RollupKey = (year_month(created_at), dto.source_asset_id, 0, 0, TransactionType.TRANSFER)
+        return key, Decimal(dto.amount)
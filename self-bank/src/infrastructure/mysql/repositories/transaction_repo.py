@@ -1,80 +1,344 @@
-from ....domain.repository.i_repository import CrudProtocol
-from typing import Optional, List
+from ....domain.repository.i_transaction_repository import TransactionRepositoryProtocol
+from typing import List, Dict, Any, AsyncIterator, Optional, Sequence, Tuple
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
 from returns.result import Result, Success, Failure
 from sqlalchemy.future import select
-from sqlalchemy.exc import SQLAlchemyError
-from .base_repository import BaseRepository
-from ....domain.entities.schema import Transaction
+from sqlalchemy import bindparam, case, exists, func, or_
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from .sql_crud_repository import SqlCrudRepository
+from .rollup_ledger import RollupEntry, rollup_key, rollup_keys, add_to_rollups, remove_from_rollups
+from .balance_ledger import LedgerEffects, period_start, transaction_effects, merge_deltas, apply_ledger_effects
+from .fingerprint import transaction_fingerprint, reference_key
+from ...mysql.mysql_connection import MysqlConnection
+from ....domain.entities.schema import Transaction, TransactionType, BalanceCheckpoint
 from ....domain.value_objects.dto import (
     CreateTransactionDto,
     UpdateTransactionDto,
-    ResTransactionDto
+    ResTransactionDto,
+    TransactionFilterDto,
+    DuplicateGroupDto,
+    ResDuplicateReportDto,
 )
 
+CENT = Decimal("0.01")
+# Groups returned by one duplicate report; the scan still counts them all
+MAX_DUPLICATE_GROUPS = 1000
+# Rows pulled from the server at a time while scanning fingerprints
+DUPLICATE_SCAN_CHUNK = 1000
+
 
 class TransactionRepository(
-    BaseRepository,
-    CrudProtocol[CreateTransactionDto, UpdateTransactionDto, ResTransactionDto]
+    SqlCrudRepository[Transaction, CreateTransactionDto, UpdateTransactionDto, ResTransactionDto],
+    TransactionRepositoryProtocol,
 ):
-    async def create(self, dto: CreateTransactionDto) -> Result[ResTransactionDto, Exception]:
-        async with await self._db.get_session() as session:
-            try:
-                transaction = Transaction(
-                    transaction_type=dto.transaction_type,
-                    amount=dto.amount,
-                    asset_id=dto.asset_id,
-                    expense_id=dto.expense_id,
-                    contact_id=dto.contact_id,
-                    note=dto.note,
-                )
-                session.add(transaction)
-                await session.commit()
-                await session.refresh(transaction)
-                return Success(ResTransactionDto.model_validate(transaction))
-            except SQLAlchemyError as e:
-                await session.rollback()
-                return Failure(e)
+    model = Transaction
+    response_dto = ResTransactionDto
+    entity_name = "Transaction"
 
-    async def get(self, id: int) -> Optional[ResTransactionDto]:
-        async with await self._db.get_session() as session:
-            result = await session.get(Transaction, id)
-            if result:
-                return ResTransactionDto.model_validate(result)
-            return None
+    def __init__(self, db: MysqlConnection):
+        super().__init__(db)
+        self._by_keys_stmt = select(Transaction.idempotency_key, *self._columns).where(
+            Transaction.idempotency_key.in_(bindparam("keys", expanding=True))
+        )
+        self._duplicate_scan_stmt = (
+            select(
+                Transaction.fingerprint, Transaction.id, Transaction.asset_id,
+                Transaction.transaction_type, Transaction.amount, Transaction.created_at,
+            )
+            .where(Transaction.fingerprint.isnot(None))
+            .order_by(Transaction.fingerprint, Transaction.id)
+            .execution_options(yield_per=DUPLICATE_SCAN_CHUNK)
+        )
+
+    async def insert_many(self, session: AsyncSession, dtos: Sequence[CreateTransactionDto]) -> List[Dict[str, Any]]:
+        rows, _ = await self.insert_unique(session, dtos)
+        return rows
+
+    async def insert_unique(
+        self, session: AsyncSession, dtos: Sequence[CreateTransactionDto]
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Like insert_many, but a transaction whose idempotency key is already
+        recorded, or repeats an earlier one of the batch, is not written again:
+        its row is the recorded one. The keys are checked with one IN lookup on
+        the unique index. Returns the rows in request order and how many of
+        them were inserted.
+        """
+        keys = [self._idempotency_key(dto) for dto in dtos]
+        recorded = await self._recorded(session, [key for key in keys if key is not None])
+
+        fresh: List[CreateTransactionDto] = []
+        seen = set(recorded)
+        for dto, key in zip(dtos, keys):
+            if key is None or key not in seen:
+                fresh.append(dto)
+                if key is not None:
+                    seen.add(key)
+        written = iter(await super().insert_many(session, fresh) if fresh else [])
+
+        rows: List[Dict[str, Any]] = []
+        for key in keys:
+            if key is not None and key in recorded:
+                rows.append(recorded[key])
+                continue
+            row = next(written)
+            if key is not None:
+                recorded[key] = row
+            rows.append(row)
+        return rows, len(fresh)
+
+    async def duplicate_report(self, max_groups: int = MAX_DUPLICATE_GROUPS) -> ResDuplicateReportDto:
+        """
+        Groups of transactions sharing a fingerprint. Rows are streamed in
+        fingerprint order off the fingerprint index, so copies are adjacent and
+        one merge pass finds them all, holding one run in memory at a time
+        instead of comparing every pair.
+        """
+        scanned = duplicates = group_count = 0
+        groups: List[DuplicateGroupDto] = []
+        async for run in self._fingerprint_runs():
+            scanned += len(run)
+            if len(run) < 2:
+                continue
+            duplicates += len(run) - 1
+            group_count += 1
+            if len(groups) < max_groups:
+                first = run[0]
+                groups.append(DuplicateGroupDto(
+                    fingerprint=first.fingerprint,
+                    asset_id=first.asset_id,
+                    transaction_type=first.transaction_type.value,
+                    amount=first.amount,
+                    day=first.created_at.date(),
+                    ids=[row.id for row in run],
+                ))
+        return ResDuplicateReportDto(
+            scanned=scanned, duplicates=duplicates, groups=groups, truncated=group_count > len(groups),
+        )
+
+    async def _fingerprint_runs(self) -> AsyncIterator[List[Any]]:
+        # Server-side cursor, so the whole ledger is never held at once; on a
+        # session of its own, since the open cursor would block a shared one
+        run: List[Any] = []
+        async with await self._db.get_detached_session() as session:
+            result = await session.stream(self._duplicate_scan_stmt)
+            async for partition in result.partitions():
+                for row in partition:
+                    if run and row.fingerprint != run[0].fingerprint:
+                        yield run
+                        run = []
+                    run.append(row)
+        if run:
+            yield run
 
     async def update(self, id: int, dto: UpdateTransactionDto) -> Result[ResTransactionDto, Exception]:
         async with await self._db.get_session() as session:
             try:
-                transaction = await session.get(Transaction, id)
-                if not transaction:
-                    return Failure(Exception("Transaction not found"))
+                # Lock the row so the old values we reverse are the ones we replace
+                locked = await self._select_for_update(session, [id])
+                if not locked:
+                    return Failure(self._not_found())
+                before = locked[0]
 
-                for field, value in dto.model_dump(exclude_unset=True).items():
-                    setattr(transaction, field, value)
+                # The locked pre-image supplies every unchanged column, so the
+                # UPDATE is not followed by a reload
+                values = self._update_values(dto)
+                values["fingerprint"] = transaction_fingerprint({**before, **values})
+                after = await self._update_row(
+                    session, Transaction, id, values,
+                    ResTransactionDto.model_fields, known=before,
+                )
+                if after is None:
+                    return Failure(self._not_found())
 
+                await apply_ledger_effects(
+                    session, merge_deltas(self._effects(before, sign=-1), self._effects(after))
+                )
+                await remove_from_rollups(session, [await self._rollup_entry(session, before)])
+                await add_to_rollups(session, [await self._rollup_entry(session, after)])
+
+                self._note_changed(session, [id])
                 await session.commit()
-                await session.refresh(transaction)
-                return Success(ResTransactionDto.model_validate(transaction))
+                return Success(ResTransactionDto.model_validate(after))
             except SQLAlchemyError as e:
                 await session.rollback()
                 return Failure(e)
 
     async def delete(self, id: int) -> Result[bool, Exception]:
+        result = await self.delete_many([id])
+        if isinstance(result, Failure):
+            return result
+        if result.unwrap() == 0:
+            return Failure(self._not_found())
+        return Success(True)
+
+    async def delete_many(self, ids: Sequence[int]) -> Result[int, Exception]:
+        if not ids:
+            return Success(0)
         async with await self._db.get_session() as session:
             try:
-                transaction = await session.get(Transaction, id)
-                if not transaction:
-                    return Failure(Exception("Transaction not found"))
-
-                await session.delete(transaction)
+                transactions = await self._select_for_update(session, ids)
+                if transactions:
+                    await apply_ledger_effects(
+                        session, merge_deltas(*(self._effects(t, sign=-1) for t in transactions))
+                    )
+                    await session.execute(self._delete_many_stmt, {"ids": [t["id"] for t in transactions]})
+                    keys = await rollup_keys(session, transactions)
+                    await remove_from_rollups(
+                        session, [(key, t["amount"]) for key, t in zip(keys, transactions)]
+                    )
+                    self._note_deleted(session, [t["id"] for t in transactions])
                 await session.commit()
-                return Success(True)
+                return Success(len(transactions))
             except SQLAlchemyError as e:
                 await session.rollback()
                 return Failure(e)
 
-    async def list(self) -> List[ResTransactionDto]:
+    async def list_filtered(self, filters: TransactionFilterDto) -> List[ResTransactionDto]:
+        stmt = select(*self._columns)
+        if filters.transaction_type is not None:
+            stmt = stmt.where(Transaction.transaction_type == TransactionType(filters.transaction_type.value))
+        if filters.asset_id is not None:
+            stmt = stmt.where(Transaction.asset_id == filters.asset_id)
+        if filters.expense_id is not None:
+            stmt = stmt.where(Transaction.expense_id == filters.expense_id)
+        if filters.contact_id is not None:
+            stmt = stmt.where(Transaction.contact_id == filters.contact_id)
+        # Half-open range keeps the predicate sargable on the created_at indexes
+        if filters.start is not None:
+            stmt = stmt.where(Transaction.created_at >= filters.start)
+        if filters.end is not None:
+            stmt = stmt.where(Transaction.created_at < filters.end)
+        stmt = stmt.order_by(Transaction.created_at, Transaction.id)
+
         async with await self._db.get_session() as session:
-            result = await session.execute(select(Transaction))
-            records = result.scalars().all()
-            return [ResTransactionDto.model_validate(r) for r in records]
+            rows = (await session.execute(stmt)).all()
+        return self._rows_to_dtos(ResTransactionDto, rows)
+
+    async def balance_as_of(self, asset_id: int, until: datetime) -> Decimal:
+        """
+        Balance of an asset just before `until`: the closing balance of the last
+        monthly checkpoint before `until`'s month, plus only the transactions of
+        that month up to `until`. Both parts run as scalar subqueries of a single
+        statement, so the answer costs one round trip and at most a month of rows.
+        An asset with no checkpoint before that month, e.g. one whose history
+        predates checkpoints and was not backfilled, is summed over its whole
+        ledger instead.
+        """
+        month_start = period_start(until)
+        earlier = (BalanceCheckpoint.asset_id == asset_id, BalanceCheckpoint.period_start < month_start)
+        opening = (
+            select(BalanceCheckpoint.closing_balance)
+            .where(*earlier)
+            .order_by(BalanceCheckpoint.period_start.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        signed_amount = case(
+            (Transaction.destination_asset_id == asset_id, Transaction.amount),
+            (Transaction.transaction_type == TransactionType.INCOME, Transaction.amount),
+            else_=-Transaction.amount,
+        )
+        movement = (
+            select(func.sum(signed_amount))
+            .where(
+                or_(Transaction.asset_id == asset_id, Transaction.destination_asset_id == asset_id),
+                # Uncorrelated, so evaluated once rather than per row
+                or_(~exists().where(*earlier), Transaction.created_at >= month_start),
+                Transaction.created_at < until,
+            )
+            .scalar_subquery()
+        )
+        async with await self._db.get_session() as session:
+            balance = await session.scalar(
+                select(func.coalesce(opening, 0) + func.coalesce(movement, 0))
+            )
+            return Decimal(balance or 0)
+
+    def _create_values(self, dto: CreateTransactionDto, now: Any) -> Dict[str, Any]:
+        # created_at is set explicitly so we know which monthly balance
+        # checkpoint the row falls in; imported history brings its own
+        values = super()._create_values(dto, now)
+        values["amount"] = self._amount(values["amount"])
+        if dto.created_at is not None:
+            created_at = dto.created_at
+            if created_at.tzinfo is not None:
+                created_at = created_at.astimezone().replace(tzinfo=None)
+            values["created_at"] = created_at.replace(microsecond=0)
+        values["idempotency_key"] = self._idempotency_key(dto)
+        values["fingerprint"] = transaction_fingerprint(values)
+        return values
+
+    def _update_values(self, dto: UpdateTransactionDto) -> Dict[str, Any]:
+        values = super()._update_values(dto)
+        if "amount" in values:
+            values["amount"] = self._amount(values["amount"])
+        return values
+
+    async def _after_insert(self, session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        # Balances and rollups move with the rows in the same DB transaction
+        await apply_ledger_effects(session, merge_deltas(*(self._effects(row) for row in rows)))
+        keys = await rollup_keys(session, rows)
+        await add_to_rollups(session, [(key, row["amount"]) for key, row in zip(keys, rows)])
+
+    def _integrity_error(self, error: IntegrityError) -> Exception:
+        if "idempotency_key" in str(error.orig):
+            # Another request with the same key committed first; a retry returns its row
+            return Exception("A transaction with this idempotency key is already being recorded")
+        return error
+
+    async def _recorded(self, session: AsyncSession, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not keys:
+            return {}
+        rows = (await session.execute(self._by_keys_stmt, {"keys": list(set(keys))})).all()
+        return {row[0]: dict(zip(ResTransactionDto.model_fields, row[1:])) for row in rows}
+
+    @staticmethod
+    def _idempotency_key(dto: CreateTransactionDto) -> Optional[str]:
+        if dto.idempotency_key:
+            return dto.idempotency_key
+        if dto.external_ref:
+            return reference_key(dto.asset_id, dto.external_ref)
+        return None
+
+    @staticmethod
+    def _amount(value: Any) -> Decimal:
+        # Rounded the way the NUMERIC(10, 2) column stores it, so the response
+        # and the ledger effects use the stored amount
+        return Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+
+    @staticmethod
+    async def _select_for_update(session: AsyncSession, ids: Sequence[int]) -> List[Dict[str, Any]]:
+        # Locked in id order so concurrent writers queue instead of deadlocking
+        rows = (await session.execute(
+            select(Transaction.__table__)
+            .where(Transaction.id.in_(list(ids)))
+            .order_by(Transaction.id)
+            .with_for_update()
+        )).all()
+        return [dict(row._mapping) for row in rows]
+
+    @staticmethod
+    def _effects(transaction: Dict[str, Any], sign: int = 1) -> LedgerEffects:
+        return transaction_effects(
+            transaction["transaction_type"],
+            transaction["amount"],
+            transaction["asset_id"],
+            transaction.get("destination_asset_id"),
+            transaction["created_at"],
+            sign=sign,
+        )
+
+    @staticmethod
+    async def _rollup_entry(session: AsyncSession, transaction: Dict[str, Any]) -> RollupEntry:
+        key = await rollup_key(
+            session,
+            transaction["transaction_type"],
+            transaction["asset_id"],
+            transaction["expense_id"],
+            transaction["contact_id"],
+            transaction["created_at"],
+        )
+        return key, Decimal(transaction["amount"])
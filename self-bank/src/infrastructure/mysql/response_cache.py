@@ -0,0 +1,79 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Sequence
+from pydantic_core import to_json
+from .table_versions import TableVersions
+
+
+@dataclass
+class _Entry:
+    token: str
+    value: Any
+    size: int
+    stored_at: float
+
+
+class ResponseCache:
+    """
+    In-process LRU cache of read responses, each stored under the version
+    token of the tables it was read from. A write to one of those tables
+    changes the token, so the entry is simply never matched again and ages
+    out; nothing has to be invalidated explicitly.
+
+    The cache is bounded by the JSON size of the responses it holds. The TTL
+    only bounds how long writes made by another process can stay invisible.
+    """
+
+    def __init__(self, versions: TableVersions, max_bytes: int = 32 * 1024 * 1024, ttl_seconds: float = 60.0):
+        self._versions = versions
+        self._max_bytes = max_bytes
+        self._ttl = ttl_seconds
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def token(self, tables: Sequence[str]) -> str:
+        return self._versions.token(tables)
+
+    async def get_or_load(self, key: Hashable, tables: Sequence[str], load: Callable[[], Awaitable[Any]]) -> Any:
+        """The cached response for `key` if its tables are unchanged, else a fresh one from `load`."""
+        # Read before loading: a write committed while loading moves the
+        # version past this token, so the loaded value cannot outlive it
+        token = self._versions.token(tables)
+        entry = self._entries.get(key)
+        if entry is not None and entry.token == token and time.monotonic() - entry.stored_at < self._ttl:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+        self.misses += 1
+        value = await load()
+        self._store(key, _Entry(token, value, len(to_json(value, fallback=str)), time.monotonic()))
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "versions": self._versions.snapshot(),
+        }
+
+    def _store(self, key: Hashable, entry: _Entry) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        if entry.size > self._max_bytes:
+            return
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
@@ -0,0 +1,51 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, TypeVar
+from sqlalchemy.exc import DBAPIError
+from .unit_of_work import current_unit_of_work
+
+T = TypeVar("T")
+
+# MySQL error codes worth retrying: the transaction was rolled back (or never
+# got its locks) and can safely be run again from the start
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+RETRYABLE_ERROR_CODES = (ER_LOCK_WAIT_TIMEOUT, ER_LOCK_DEADLOCK)
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    if not isinstance(error, DBAPIError) or error.orig is None:
+        return False
+    args = getattr(error.orig, "args", ())
+    return bool(args) and args[0] in RETRYABLE_ERROR_CODES
+
+
+async def with_deadlock_retry(
+    operation: Callable[[], Awaitable[T]],
+    attempts: int = 4,
+    base_delay: float = 0.02,
+) -> T:
+    """
+    Runs `operation` and re-runs it when MySQL reports a deadlock or lock wait
+    timeout. `operation` must open its own transaction so every attempt starts
+    clean. Backoff is exponential with jitter so colliding callers spread out.
+
+    Inside a unit of work the deadlock has rolled back the unit's whole
+    transaction, so the error is passed up and the unit is re-run instead.
+    """
+    unit = current_unit_of_work()
+    for attempt in range(1, attempts + 1):
+        try:
+            return await operation()
+        except DBAPIError as e:
+            if unit is not None and is_retryable_error(e):
+                unit.request_retry()
+                raise
+            if attempt == attempts or not is_retryable_error(e):
+                raise
+            await asyncio.sleep(backoff_delay(attempt, base_delay))
+    raise RuntimeError("unreachable")
+
+
+def backoff_delay(attempt: int, base_delay: float) -> float:
+    return base_delay * (2 ** (attempt - 1)) * (1 + random.random())
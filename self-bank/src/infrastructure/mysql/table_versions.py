@@ -0,0 +1,64 @@
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Set
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+# Session.info entry collecting the tables written in the open DB transaction
+WRITTEN_TABLES = "written_tables"
+
+
+class TableVersions:
+    """
+    A write counter per table, bumped once a DB transaction that inserted,
+    updated or deleted rows of it has committed. Anything derived from a
+    table's rows stays valid for as long as the table's version is unchanged.
+
+    Versions move only after the commit: a reader that started earlier may
+    still see the old rows, and whatever it derives lands under the old
+    version, which is already outdated.
+    """
+
+    def __init__(self) -> None:
+        self._versions: Dict[str, int] = defaultdict(int)
+        self._listeners: List[Callable[[Set[str]], None]] = []
+
+    def install(self, session_class: Any) -> None:
+        """Follows the writes of every session of `session_class` (a sync Session subclass)."""
+        event.listen(session_class, "do_orm_execute", self._record_write)
+        event.listen(session_class, "after_commit", self._committed)
+        event.listen(session_class, "after_rollback", self._rolled_back)
+
+    def listen(self, listener: Callable[[Set[str]], None]) -> None:
+        """Calls `listener` with the tables of every bump; it must not block."""
+        self._listeners.append(listener)
+
+    def token(self, tables: Iterable[str]) -> str:
+        """Version token of a set of tables, e.g. 'assets:4,asset_types:2'."""
+        return ",".join(f"{table}:{self._versions[table]}" for table in tables)
+
+    def bump(self, tables: Iterable[str]) -> None:
+        bumped = set(tables)
+        for table in bumped:
+            self._versions[table] += 1
+        if bumped:
+            for listener in self._listeners:
+                listener(bumped)
+
+    def snapshot(self) -> Dict[str, int]:
+        return dict(sorted(self._versions.items()))
+
+    @staticmethod
+    def _record_write(state: ORMExecuteState) -> None:
+        if not (state.is_insert or state.is_update or state.is_delete):
+            return
+        table = getattr(state.statement, "table", None)
+        if table is not None:
+            written: Set[str] = state.session.info.setdefault(WRITTEN_TABLES, set())
+            written.add(table.name)
+
+    def _committed(self, session: Session) -> None:
+        self.bump(session.info.pop(WRITTEN_TABLES, ()))
+
+    @staticmethod
+    def _rolled_back(session: Session) -> None:
+        session.info.pop(WRITTEN_TABLES, None)
@@ -0,0 +1,95 @@
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Callable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class UnitOfWork:
+    """
+    One session and one DB transaction shared by every repository call made
+    while it is open, committed once at the end. Repositories keep calling
+    get_session() as before and are handed a JoinedSession on this one.
+
+    A repository that rolls back, or a transaction block that fails, makes
+    the whole unit roll back, so a multi-step usecase is all or nothing.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        # The unit belongs to the task that opened it; tasks it spawns
+        # inherit the context var but must not share the session concurrently
+        self.task = asyncio.current_task()
+        self.rollback_only = False
+        self.retry_requested = False
+        self._after_commit: List[Callable[[], None]] = []
+
+    def fail(self) -> None:
+        self.rollback_only = True
+
+    def request_retry(self) -> None:
+        """A deadlock rolled back the shared transaction; only re-running the whole unit helps."""
+        self.rollback_only = True
+        self.retry_requested = True
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        self._after_commit.append(callback)
+
+    def committed(self) -> None:
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+
+_current: ContextVar[Optional[UnitOfWork]] = ContextVar("unit_of_work", default=None)
+
+
+def current_unit_of_work() -> Optional[UnitOfWork]:
+    """The unit of work the running task opened, if any."""
+    unit = _current.get()
+    if unit is None or unit.task is not asyncio.current_task():
+        return None
+    return unit
+
+
+def set_unit_of_work(unit: Optional[UnitOfWork]) -> Any:
+    return _current.set(unit)
+
+
+def reset_unit_of_work(token: Any) -> None:
+    _current.reset(token)
+
+
+class JoinedSession:
+    """
+    The unit's session as a repository sees it. Closing does nothing, commit
+    only flushes, and rollback marks the unit to roll back at its end; every
+    other attribute is the real session's.
+    """
+
+    def __init__(self, unit: UnitOfWork):
+        self._unit = unit
+        self._session = unit.session
+
+    async def __aenter__(self) -> "JoinedSession":
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        if exc is not None:
+            self._unit.fail()
+        return False
+
+    def begin(self) -> "JoinedSession":
+        # The unit's transaction is already open; a failing block dooms it
+        return self
+
+    async def commit(self) -> None:
+        await self._session.flush()
+
+    async def rollback(self) -> None:
+        self._unit.fail()
+
+    async def close(self) -> None:
+        pass
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
@@ -0,0 +1,204 @@
+import csv
+import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+from ...domain.value_objects.dto import ImportMappingDto, StatementFormatEnum
+from ...domain.value_objects.statement import StatementLine
+
+"""
+Streaming readers for bank statements. Each one is a generator over the
+open file, so memory stays flat however long the statement is; records are
+numbered from 0 and a reader asked to start at an offset skips the earlier
+records without interpreting them.
+"""
+
+DEFAULT_CSV_DATE_FORMAT = "%Y-%m-%d"
+DEFAULT_QIF_DATE_FORMAT = "%m/%d/%Y"
+QIF_LIST_SECTIONS = {"type:cat", "type:class", "type:memorized", "type:prices", "type:security"}
+# Bytes read from an OFX file at a time
+OFX_READ_SIZE = 64 * 1024
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def read_statement(
+    path: str, file_format: StatementFormatEnum, mapping: ImportMappingDto, start: int = 0
+) -> Iterator[StatementLine]:
+    """Reads the statement at `path` lazily, from record `start` on."""
+    with open(path, newline="", encoding=mapping.encoding, errors="replace") as file:
+        if file_format == StatementFormatEnum.CSV:
+            yield from read_csv(file, mapping, start)
+        elif file_format == StatementFormatEnum.OFX:
+            yield from read_ofx(file, mapping, start)
+        else:
+            yield from read_qif(file, mapping, start)
+
+
+def read_csv(file: TextIO, mapping: ImportMappingDto, start: int = 0) -> Iterator[StatementLine]:
+    rows = csv.reader(file, delimiter=mapping.delimiter)
+    header = next(rows, None)
+    if header is None:
+        return
+    columns = {name.strip(): index for index, name in enumerate(header)}
+    for name in (mapping.date_column, mapping.amount_column, mapping.debit_column, mapping.credit_column,
+                 mapping.description_column, mapping.payee_column, mapping.reference_column):
+        if name is not None and name not in columns and not _uses_debit_credit(mapping, name):
+            raise ValueError(f"Column '{name}' is not in the CSV header")
+
+    date_format = mapping.date_format or DEFAULT_CSV_DATE_FORMAT
+    for offset, row in enumerate(islice(rows, start, None), start):
+        if not any(cell.strip() for cell in row):
+            continue
+        try:
+            amount = _csv_amount(row, columns, mapping)
+            yield StatementLine(
+                offset=offset,
+                posted_at=datetime.strptime(_cell(row, columns, mapping.date_column), date_format),
+                amount=amount,
+                payee=_cell(row, columns, mapping.payee_column),
+                description=_cell(row, columns, mapping.description_column),
+                reference=_cell(row, columns, mapping.reference_column),
+            )
+        except (ValueError, InvalidOperation, IndexError) as e:
+            yield _unreadable(offset, e)
+
+
+def read_ofx(file: TextIO, mapping: ImportMappingDto, start: int = 0) -> Iterator[StatementLine]:
+    # OFX 1.x is SGML whose leaf elements are often left unclosed, so tags are
+    # tokenised from a sliding buffer rather than handed to an XML parser
+    offset = 0
+    fields: Optional[Dict[str, str]] = None
+    for closing, tag, text in _ofx_tokens(file):
+        tag = tag.upper()
+        if tag == "STMTTRN" and not closing:
+            fields = {}
+        elif tag == "STMTTRN" and closing and fields is not None:
+            if offset >= start:
+                yield _ofx_line(offset, fields, mapping)
+            offset += 1
+            fields = None
+        elif fields is not None and not closing and offset >= start:
+            fields[tag] = text.strip()
+
+
+def read_qif(file: TextIO, mapping: ImportMappingDto, start: int = 0) -> Iterator[StatementLine]:
+    date_format = mapping.date_format or DEFAULT_QIF_DATE_FORMAT
+    offset = 0
+    section = ""
+    fields: Dict[str, str] = {}
+    for raw in file:
+        line = raw.strip()
+        if line.startswith("!"):
+            section = line[1:].lower()
+            fields = {}
+            continue
+        if not line or not _qif_has_transactions(section):
+            continue
+        if line != "^":
+            if offset >= start:
+                # Split lines (L, S, E, $) repeat; the first of each is kept
+                fields.setdefault(line[0], line[1:].strip())
+            continue
+        if offset >= start:
+            yield _qif_line(offset, fields, mapping, date_format)
+        offset += 1
+        fields = {}
+
+
+def _qif_has_transactions(section: str) -> bool:
+    # Account lists, categories, classes and memorized payees also end their
+    # records with ^ but hold no transactions
+    return section.startswith("type:") and section not in QIF_LIST_SECTIONS
+
+
+def _uses_debit_credit(mapping: ImportMappingDto, name: str) -> bool:
+    # The default amount column is not required when debit/credit columns are used
+    return name == mapping.amount_column and (mapping.debit_column is not None or mapping.credit_column is not None)
+
+
+def _cell(row: List[str], columns: Dict[str, int], name: Optional[str]) -> str:
+    if name is None or name not in columns:
+        return ""
+    return row[columns[name]].strip()
+
+
+def _csv_amount(row: List[str], columns: Dict[str, int], mapping: ImportMappingDto) -> Decimal:
+    if mapping.debit_column is not None or mapping.credit_column is not None:
+        debit = _cell(row, columns, mapping.debit_column)
+        credit = _cell(row, columns, mapping.credit_column)
+        return (parse_amount(credit, mapping.decimal_separator) if credit else Decimal("0")) - (
+            abs(parse_amount(debit, mapping.decimal_separator)) if debit else Decimal("0")
+        )
+    return parse_amount(_cell(row, columns, mapping.amount_column), mapping.decimal_separator)
+
+
+def parse_amount(text: str, decimal_separator: str = ".") -> Decimal:
+    """Parses '1,234.50', '(12.00)', '-12', '12.00-' or '$12' into a Decimal."""
+    value = text.strip().replace(" ", "").replace("\u00a0", "")
+    negative = value.startswith("(") and value.endswith(")") or value.endswith("-")
+    value = value.strip("()").rstrip("-")
+    value = re.sub(r"[^0-9,.\-+]", "", value)
+    thousands = "," if decimal_separator == "." else "."
+    value = value.replace(thousands, "").replace(decimal_separator, ".")
+    if not value:
+        raise ValueError(f"Invalid amount '{text}'")
+    amount = Decimal(value)
+    return -amount if negative else amount
+
+
+def _ofx_tokens(file: TextIO) -> Iterator[Tuple[str, str, str]]:
+    buffer = ""
+    while True:
+        chunk = file.read(OFX_READ_SIZE)
+        buffer += chunk
+        # Keep the last, possibly incomplete, tag for the next round
+        cut = len(buffer) if not chunk else buffer.rfind("<")
+        for match in _OFX_TAG.finditer(buffer, 0, max(cut, 0)):
+            yield match.group(1), match.group(2), match.group(3)
+        if not chunk:
+            return
+        buffer = buffer[cut:] if cut > 0 else buffer
+
+
+def _ofx_line(offset: int, fields: Dict[str, str], mapping: ImportMappingDto) -> StatementLine:
+    try:
+        # YYYYMMDD[HHMMSS[.XXX]][[offset:TZ]]; the time zone is ignored
+        posted = fields.get("DTPOSTED", "")
+        digits = re.match(r"\d{8}(\d{6})?", posted)
+        if digits is None:
+            raise ValueError(f"Invalid DTPOSTED '{posted}'")
+        stamp = digits.group(0)
+        posted_at = datetime.strptime(stamp, "%Y%m%d%H%M%S" if len(stamp) == 14 else "%Y%m%d")
+        return StatementLine(
+            offset=offset,
+            posted_at=posted_at,
+            amount=parse_amount(fields.get("TRNAMT", ""), mapping.decimal_separator),
+            payee=fields.get("NAME") or fields.get("PAYEE", ""),
+            description=fields.get("MEMO", ""),
+            reference=fields.get("FITID", ""),
+        )
+    except (ValueError, InvalidOperation) as e:
+        return _unreadable(offset, e)
+
+
+def _qif_line(offset: int, fields: Dict[str, str], mapping: ImportMappingDto, date_format: str) -> StatementLine:
+    try:
+        # Quicken writes years after 1999 as 1/31'24
+        date_text = fields.get("D", "").replace("'", "/").replace(" ", "")
+        if "%Y" in date_format and re.search(r"/\d{2}$", date_text):
+            date_text = date_text[:-2] + "20" + date_text[-2:]
+        return StatementLine(
+            offset=offset,
+            posted_at=datetime.strptime(date_text, date_format),
+            amount=parse_amount(fields.get("T") or fields.get("U", ""), mapping.decimal_separator),
+            payee=fields.get("P", ""),
+            description=" ".join(part for part in (fields.get("M", ""), fields.get("L", "")) if part),
+        )
+    except (ValueError, InvalidOperation) as e:
+        return _unreadable(offset, e)
+
+
+def _unreadable(offset: int, error: Exception) -> StatementLine:
+    return StatementLine(offset=offset, posted_at=None, amount=None, payee="", description="", error=str(error))
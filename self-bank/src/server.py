@@ -1,12 +1,38 @@
 from dataclasses import dataclass, field
 from mcp.server.fastmcp import FastMCP  # type: ignore
 from di_container import DIContainer
-from typing import Any, Callable, Protocol
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Pattern, Protocol, Sequence, Set, Tuple
+import functools
 import re
 
+# Container entry that runs one request's work in a unit of work:
+# async (operation) -> result. Resources run unwrapped when it is absent
+UNIT_OF_WORK = "unit_of_work"
+# Container entry caching read responses by table version: an object with
+# get_or_load(key, tables, load) and token(tables). Nothing is cached without it
+RESPONSE_CACHE = "response_cache"
+# Container entry delivering the tables written by committed DB transactions:
+# an object with subscribe(async handler(tables)). Without it resources cannot
+# be subscribed to
+EVENT_BUS = "event_bus"
+# Container entry admitting requests by class: an object with
+# async run(kind, operation). Nothing is limited without it
+ADMISSION = "admission"
+# Container entry attributing the SQL statements a request issues to its
+# resource: an object with async track(uri, operation). Nothing is counted
+# without it
+QUERY_STATS = "query_stats"
+
+# Request classes, each admitted against its own concurrency limit
+READ = "read"
+WRITE = "write"
+REPORT = "report"
+
 
 class MCPProtocol(Protocol):
-    def resource(self, path: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]: ...
+    def resource(
+        self, path: str, tables: Optional[Sequence[str]] = None, kind: Optional[str] = READ
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]: ...
     def tool(self) -> Callable[[Callable[..., Any]], Callable[..., Any]]: ...
     def start(self) -> None: ...
 
@@ -16,13 +42,44 @@ class MCPServer:
     name: str
     _container: DIContainer
     _mcp: Any = field(init=False)  # FastMCP is dynamically typed
+    # URI patterns of the resources that name their tables, with those tables
+    _watched: List[Tuple[Pattern[str], Sequence[str]]] = field(init=False, default_factory=list)
+    # Subscribed resource URI -> sessions to notify when it may have changed
+    _subscriptions: Dict[str, Set[Any]] = field(init=False, default_factory=dict)
 
     def __post_init__(self):
         self._mcp = FastMCP(self.name)
+        bus = self._container.get(EVENT_BUS)
+        if bus is not None:
+            self._enable_subscriptions()
+            bus.subscribe(self._tables_changed)
 
-    def resource(self, path: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def resource(
+        self, path: str, tables: Optional[Sequence[str]] = None, kind: Optional[str] = READ
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """
+        Registers a resource. A read-only resource names the `tables` its
+        response is built from; it is then served from the response cache
+        until one of them is written, a resource without parameters also
+        gets '<path>/version', whose token changes whenever the response may,
+        and clients subscribed to it are notified when one of them is written.
+        Requests are admitted by `kind` (READ, WRITE or REPORT), after the
+        response cache, so a cached answer never waits; None admits always.
+        Once admitted, the statements a request issues, its commit included,
+        are counted under `path`.
+        """
         route_path = self._translate_path(path)
-        return self._mcp.resource(route_path)
+        register = self._mcp.resource(route_path)
+
+        def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+            handler = self._admitted(kind, self._tracked(path, self._in_unit_of_work(fn)))
+            if tables:
+                handler = self._cached(route_path, tables, handler)
+                self._register_version(path, route_path, fn, tables)
+                self._watch(path, route_path, tables)
+            register(handler)
+            return fn
+        return decorator
 
     def tool(self) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
         return self._mcp.tool()
@@ -30,6 +87,130 @@ class MCPServer:
     def start(self) -> None:
         self._mcp.start()
 
+    def _in_unit_of_work(self, fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """
+        Wraps a resource so every repository call it makes shares one session
+        and commits once at the end. Tools are not wrapped: a statement import
+        commits chunk by chunk on purpose, so it can be resumed.
+        """
+        run = self._container.get(UNIT_OF_WORK)
+        if run is None:
+            return fn
+
+        # wraps keeps the signature FastMCP reads the parameters from
+        @functools.wraps(fn)
+        async def handler(*args: Any, **kwargs: Any) -> Any:
+            return await run(lambda: fn(*args, **kwargs))
+        return handler
+
+    def _admitted(
+        self, kind: Optional[str], fn: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[Any]]:
+        """
+        Outside the unit of work, so a request waiting for admission holds
+        no session or connection.
+        """
+        admission = self._container.get(ADMISSION)
+        if admission is None or kind is None:
+            return fn
+
+        @functools.wraps(fn)
+        async def handler(*args: Any, **kwargs: Any) -> Any:
+            return await admission.run(kind, lambda: fn(*args, **kwargs))
+        return handler
+
+    def _tracked(self, path: str, fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        stats = self._container.get(QUERY_STATS)
+        if stats is None:
+            return fn
+
+        @functools.wraps(fn)
+        async def handler(*args: Any, **kwargs: Any) -> Any:
+            return await stats.track(path, lambda: fn(*args, **kwargs))
+        return handler
+
+    def _cached(
+        self, route_path: str, tables: Sequence[str], fn: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[Any]]:
+        cache = self._container.get(RESPONSE_CACHE)
+        if cache is None:
+            return fn
+
+        @functools.wraps(fn)
+        async def handler(*args: Any, **kwargs: Any) -> Any:
+            key = (route_path, args, tuple(sorted(kwargs.items())))
+            return await cache.get_or_load(key, tables, lambda: fn(*args, **kwargs))
+        return handler
+
+    def _register_version(
+        self, path: str, route_path: str, fn: Callable[..., Any], tables: Sequence[str]
+    ) -> None:
+        cache = self._container.get(RESPONSE_CACHE)
+        if cache is None or "{" in path:
+            return
+
+        async def version() -> str:
+            return cache.token(tables)
+        version.__name__ = f"{fn.__name__}_version"
+        version.__doc__ = (
+            f"Version token of {path}.\n\n"
+            f"English:\nChanges whenever {path} may return something different; a client "
+            f"holding a response with the same token can skip reading it again.\n\n"
+            f"Thai:\nเปลี่ยนทุกครั้งที่ {path} อาจส่งผลลัพธ์ต่างไปจากเดิม "
+            f"หาก token ยังเหมือนเดิม ไม่จำเป็นต้องอ่านข้อมูลนั้นซ้ำ"
+        )
+        self._mcp.resource(f"{route_path}/version")(version)
+        self._watch(f"{path}/version", f"{route_path}/version", tables)
+
+    def _watch(self, path: str, route_path: str, tables: Sequence[str]) -> None:
+        # Clients may subscribe by either form of the URI
+        for uri in (path, route_path):
+            pattern = re.sub(r"\\\{\w+\\\}", "[^/]+", re.escape(uri))
+            self._watched.append((re.compile(pattern), tables))
+
+    def _enable_subscriptions(self) -> None:
+        server = self._mcp._mcp_server
+
+        @server.subscribe_resource()
+        async def subscribe(uri: Any) -> None:
+            self._subscriptions.setdefault(str(uri), set()).add(server.request_context.session)
+
+        @server.unsubscribe_resource()
+        async def unsubscribe(uri: Any) -> None:
+            sessions = self._subscriptions.get(str(uri))
+            if sessions is not None:
+                sessions.discard(server.request_context.session)
+                if not sessions:
+                    del self._subscriptions[str(uri)]
+
+        # The low-level server always advertises subscribe=False; clients
+        # only subscribe when the capability says they can
+        get_capabilities = server.get_capabilities
+
+        def capabilities(*args: Any, **kwargs: Any) -> Any:
+            result = get_capabilities(*args, **kwargs)
+            if result.resources is not None:
+                result.resources.subscribe = True
+            return result
+        server.get_capabilities = capabilities
+
+    async def _tables_changed(self, tables: Set[str]) -> None:
+        """Sends one resources/updated notification per subscribed URI built from `tables`."""
+        for uri, sessions in list(self._subscriptions.items()):
+            if not any(
+                pattern.fullmatch(uri) and tables.intersection(watched)
+                for pattern, watched in self._watched
+            ):
+                continue
+            for session in list(sessions):
+                try:
+                    await session.send_resource_updated(uri)
+                except Exception:
+                    # The client went away; stop notifying it
+                    sessions.discard(session)
+            if not sessions:
+                self._subscriptions.pop(uri, None)
+
     def _translate_path(self, uri: str) -> str:
         """
         Converts custom URI schemes like 'contact://create' to
@@ -0,0 +1,22 @@
+import os
+import sys
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
+
+from src.config.db_config import DbConfig  # noqa: E402
+
+
+@pytest.fixture
+def mysql_config() -> DbConfig:
+    """
+    Settings of the MySQL database the integration tests write to. They run
+    only against a database named by MYSQL_TEST_DATABASE_NAME, never the one
+    the server uses; without it they are skipped.
+    """
+    database = os.environ.get("MYSQL_TEST_DATABASE_NAME")
+    if not database:
+        pytest.skip("MYSQL_TEST_DATABASE_NAME is not set")
+    return DbConfig(database=database)
@@ -0,0 +1,164 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from src.application.admission import AdmissionController, LaneLimit, Overloaded
+from src.config.db_config import DbConfig
+from src.infrastructure.mysql.mysql_connection import MysqlConnection
+from src.server import READ, REPORT, WRITE
+
+
+def _controller(capacity: int = 8, reserved: int = 0, deadline: float = 5) -> AdmissionController:
+    return AdmissionController({
+        WRITE: LaneLimit(4, 4, deadline, priority=0),
+        READ: LaneLimit(4, 1, deadline, priority=1),
+        REPORT: LaneLimit(1, 1, deadline, priority=2),
+    }, capacity=capacity, reserved=reserved)
+
+
+async def _hold(admission: AdmissionController, kind: str, release: asyncio.Event) -> str:
+    async def operation() -> str:
+        await release.wait()
+        return kind
+    return await admission.run(kind, operation)
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_full_queue_rejects_at_once():
+    async def scenario() -> None:
+        admission = _controller()
+        release = asyncio.Event()
+        running = asyncio.create_task(_hold(admission, REPORT, release))
+        queued = asyncio.create_task(_hold(admission, REPORT, release))
+        await _settle()
+
+        with pytest.raises(Overloaded) as rejected:
+            await _hold(admission, REPORT, release)
+        assert rejected.value.kind == REPORT
+        assert rejected.value.retry_after > 0
+
+        release.set()
+        assert await asyncio.gather(running, queued) == [REPORT, REPORT]
+        stats = admission.stats()["classes"][REPORT]
+        assert (stats["admitted"], stats["queued"], stats["rejected"]) == (2, 1, 1)
+    asyncio.run(scenario())
+
+
+def test_reserved_slots_are_kept_for_writes():
+    async def scenario() -> None:
+        admission = _controller(capacity=2, reserved=1)
+        release = asyncio.Event()
+        first_read = asyncio.create_task(_hold(admission, READ, release))
+        await _settle()
+        # One slot is left, and it is the reserved one
+        second_read = asyncio.create_task(_hold(admission, READ, release))
+        await _settle()
+        write = asyncio.create_task(_hold(admission, WRITE, release))
+        await _settle()
+
+        stats = admission.stats()
+        assert stats["running"] == 2
+        assert stats["classes"][READ]["active"] == 1
+        assert stats["classes"][READ]["waiting"] == 1
+        assert stats["classes"][WRITE]["active"] == 1
+
+        release.set()
+        assert await asyncio.gather(first_read, second_read, write) == [READ, READ, WRITE]
+        assert admission.stats()["running"] == 0
+    asyncio.run(scenario())
+
+
+def test_freed_slot_goes_to_a_waiting_write_first():
+    async def scenario() -> None:
+        admission = _controller(capacity=1)
+        release = asyncio.Event()
+        order: List[str] = []
+
+        async def note(kind: str) -> None:
+            order.append(kind)
+
+        holder = asyncio.create_task(_hold(admission, REPORT, release))
+        await _settle()
+        read = asyncio.create_task(admission.run(READ, lambda: note(READ)))
+        await _settle()
+        write = asyncio.create_task(admission.run(WRITE, lambda: note(WRITE)))
+        await _settle()
+
+        release.set()
+        await asyncio.gather(holder, read, write)
+        assert order == [WRITE, READ]
+    asyncio.run(scenario())
+
+
+def test_deadline_expires_while_queued():
+    async def scenario() -> None:
+        admission = AdmissionController({
+            WRITE: LaneLimit(1, 1, 5, priority=0),
+            READ: LaneLimit(1, 1, 0.05, priority=1),
+        }, capacity=1)
+        release = asyncio.Event()
+        write = asyncio.create_task(_hold(admission, WRITE, release))
+        await _settle()
+
+        with pytest.raises(TimeoutError):
+            await _hold(admission, READ, release)
+
+        stats = admission.stats()
+        assert stats["classes"][READ]["timed_out"] == 1
+        # The expired request left the queue and never took a slot
+        assert stats["classes"][READ]["waiting"] == 0
+        assert stats["running"] == 1
+
+        release.set()
+        assert await write == WRITE
+        assert admission.stats()["running"] == 0
+    asyncio.run(scenario())
+
+
+class SlowCommitSession:
+    """Stands in for an AsyncSession whose COMMIT takes `commit_time`."""
+
+    def __init__(self, commit_time: float):
+        self.commit_time = commit_time
+        self.log: List[str] = []
+
+    async def __aenter__(self) -> "SlowCommitSession":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.log.append("close")
+
+    async def commit(self) -> None:
+        await asyncio.sleep(self.commit_time)
+        self.log.append("commit")
+
+    async def rollback(self) -> None:
+        self.log.append("rollback")
+
+
+def test_deadline_expiring_mid_commit_lets_the_commit_finish():
+    async def scenario() -> None:
+        db = MysqlConnection(DbConfig(user="test", password="test", database="test"))
+        session = SlowCommitSession(commit_time=0.2)
+        db.session_maker = lambda: session  # type: ignore[assignment]
+        admission = _controller(deadline=0.05)
+        callbacks: List[str] = []
+
+        async def write() -> None:
+            db.after_commit(lambda: callbacks.append("committed"))
+
+        with pytest.raises(TimeoutError):
+            await admission.run(WRITE, lambda: db.run_in_unit_of_work(write))
+
+        # The COMMIT ran to its end and its callbacks ran before the timeout
+        assert session.log[0] == "commit"
+        assert callbacks == ["committed"]
+        assert admission.stats()["classes"][WRITE]["timed_out"] == 1
+        assert admission.stats()["running"] == 0
+        await db.engine.dispose()
+    asyncio.run(scenario())
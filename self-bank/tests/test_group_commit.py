@@ -0,0 +1,146 @@
+import asyncio
+from decimal import Decimal
+from typing import List, Optional
+
+from returns.result import Failure, Result, Success
+
+from src.application.group_commit import GroupCommit
+from src.application.usecase.transaction_usecase import TransactionUseCase
+from src.domain.value_objects.dto import CreateTransactionDto, ResTransactionDto, TransactionTypeEnum
+
+
+class Recorder:
+    """A flush that records its batches and doubles every item."""
+
+    def __init__(self, release: Optional[asyncio.Event] = None) -> None:
+        self.batches: List[List[int]] = []
+        self.release = release
+
+    async def __call__(self, items: List[int]) -> List[Result[int, Exception]]:
+        self.batches.append(list(items))
+        if self.release is not None:
+            await self.release.wait()
+        return [Success(item * 2) for item in items]
+
+
+def test_a_full_batch_is_written_at_once():
+    async def scenario() -> None:
+        flush = Recorder()
+        # A latency long enough that only the size can trigger the write
+        group = GroupCommit(flush, max_batch=3, max_latency=60)
+
+        results = await asyncio.gather(*(group.submit(item) for item in (1, 2, 3)))
+
+        assert flush.batches == [[1, 2, 3]]
+        assert [result.unwrap() for result in results] == [2, 4, 6]
+    asyncio.run(scenario())
+
+
+def test_a_partial_batch_is_written_when_the_timer_fires():
+    async def scenario() -> None:
+        flush = Recorder()
+        group = GroupCommit(flush, max_batch=100, max_latency=0.01)
+
+        results = await asyncio.wait_for(asyncio.gather(group.submit(1), group.submit(2)), timeout=5)
+
+        assert flush.batches == [[1, 2]]
+        assert [result.unwrap() for result in results] == [2, 4]
+        assert group.stats()["batches"] == 1
+    asyncio.run(scenario())
+
+
+def test_items_arriving_during_a_write_form_the_next_batch():
+    async def scenario() -> None:
+        release = asyncio.Event()
+        flush = Recorder(release)
+        group = GroupCommit(flush, max_batch=2, max_latency=60)
+
+        first = [asyncio.create_task(group.submit(item)) for item in (1, 2)]
+        await asyncio.sleep(0)
+        # The first batch is being written; these queue behind it, and more
+        # than max_batch of them split into two batches
+        later = [asyncio.create_task(group.submit(item)) for item in (3, 4, 5)]
+        await asyncio.sleep(0)
+        assert flush.batches == [[1, 2]]
+
+        release.set()
+        await asyncio.wait_for(asyncio.gather(*first, *later), timeout=5)
+
+        assert flush.batches == [[1, 2], [3, 4], [5]]
+        assert group.stats()["largest_batch"] == 2
+    asyncio.run(scenario())
+
+
+def test_a_failing_flush_fails_every_item_of_its_batch():
+    async def scenario() -> None:
+        async def flush(items: List[int]) -> List[Result[int, Exception]]:
+            raise ConnectionError("lost")
+
+        group = GroupCommit(flush, max_batch=2, max_latency=60)
+        results = await asyncio.gather(group.submit(1), group.submit(2))
+
+        assert all(isinstance(result, Failure) for result in results)
+        assert all(isinstance(result.failure(), ConnectionError) for result in results)
+        assert group.stats()["errors"] == 1
+    asyncio.run(scenario())
+
+
+class FakeTransactions:
+    """Writes a batch only when no amount in it is negative, like a CHECK constraint would."""
+
+    def __init__(self) -> None:
+        self.batches: List[int] = []
+        self.singles: List[Decimal] = []
+
+    async def create_many(self, dtos: List[CreateTransactionDto]) -> Result[List[ResTransactionDto], Exception]:
+        self.batches.append(len(dtos))
+        if any(dto.amount < 0 for dto in dtos):
+            return Failure(ValueError("amount out of range"))
+        return Success([self._row(index, dto) for index, dto in enumerate(dtos, 1)])
+
+    async def create(self, dto: CreateTransactionDto) -> Result[ResTransactionDto, Exception]:
+        self.singles.append(dto.amount)
+        if dto.amount < 0:
+            return Failure(ValueError("amount out of range"))
+        return Success(self._row(len(self.singles), dto))
+
+    @staticmethod
+    def _row(id: int, dto: CreateTransactionDto) -> ResTransactionDto:
+        return ResTransactionDto(
+            id=id, transaction_type=dto.transaction_type, amount=dto.amount, asset_id=dto.asset_id,
+            expense_id=dto.expense_id, contact_id=dto.contact_id, note=dto.note, created_at=None, updated_at=None,
+        )
+
+
+def _income(amount: str) -> CreateTransactionDto:
+    return CreateTransactionDto(transaction_type=TransactionTypeEnum.INCOME, amount=Decimal(amount), asset_id=1)
+
+
+def test_a_failed_batch_is_retried_one_by_one():
+    async def scenario() -> None:
+        repository = FakeTransactions()
+        usecase = TransactionUseCase(repository, group_commit=True, group_commit_max_batch=3)
+
+        results = await asyncio.gather(*(
+            usecase.record_income(_income(amount)) for amount in ("10", "-1", "30")
+        ))
+
+        assert repository.batches == [3]
+        assert repository.singles == [Decimal("10"), Decimal("-1"), Decimal("30")]
+        # Only the bad row's caller sees the error
+        assert [isinstance(result, Failure) for result in results] == [False, True, False]
+        assert results[2].unwrap().amount == Decimal("30")
+    asyncio.run(scenario())
+
+
+def test_a_good_batch_is_written_once():
+    async def scenario() -> None:
+        repository = FakeTransactions()
+        usecase = TransactionUseCase(repository, group_commit=True, group_commit_max_batch=2)
+
+        results = await asyncio.gather(usecase.record_income(_income("10")), usecase.record_income(_income("20")))
+
+        assert repository.batches == [2]
+        assert repository.singles == []
+        assert [result.unwrap().amount for result in results] == [Decimal("10"), Decimal("20")]
+    asyncio.run(scenario())
@@ -0,0 +1,135 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pytest
+from returns.result import Failure, Result, Success
+
+from src.application.usecase.import_usecase import ImportUseCase
+from src.domain.value_objects.dto import (
+    CreateTransactionDto,
+    ImportMappingDto,
+    ImportStatementDto,
+    ImportStatusEnum,
+    ResImportJobDto,
+    StatementFormatEnum,
+)
+from src.infrastructure.statements.statement_reader import read_statement
+
+RECORDS = 7
+
+
+class InMemoryImportJobs:
+    """ImportJobRepositoryProtocol over dicts, recording the transactions written."""
+
+    def __init__(self) -> None:
+        self.jobs: Dict[int, ResImportJobDto] = {}
+        self.written: List[CreateTransactionDto] = []
+
+    async def create_job(
+        self, source: str, file_format: StatementFormatEnum, asset_id: int
+    ) -> Result[ResImportJobDto, Exception]:
+        job = ResImportJobDto(
+            id=len(self.jobs) + 1, source=source, file_format=file_format, asset_id=asset_id,
+            status=ImportStatusEnum.RUNNING, next_offset=0, imported_count=0, skipped_count=0,
+            duplicate_count=0, error=None, created_at=datetime.now(), updated_at=datetime.now(),
+        )
+        self.jobs[job.id] = job
+        return Success(job)
+
+    async def get(self, id: int) -> Optional[ResImportJobDto]:
+        return self.jobs.get(id)
+
+    async def write_chunk(
+        self, id: int, dtos: List[CreateTransactionDto], expected_offset: int, next_offset: int, skipped: int
+    ) -> Result[ResImportJobDto, Exception]:
+        job = self.jobs[id]
+        if job.next_offset != expected_offset:
+            return Failure(Exception("Import job moved on"))
+        self.written.extend(dtos)
+        job = job.model_copy(update={
+            "next_offset": next_offset,
+            "imported_count": job.imported_count + len(dtos),
+            "skipped_count": job.skipped_count + skipped,
+        })
+        self.jobs[id] = job
+        return Success(job)
+
+    async def set_status(
+        self, id: int, status: ImportStatusEnum, error: Optional[str] = None
+    ) -> Result[ResImportJobDto, Exception]:
+        self.jobs[id] = self.jobs[id].model_copy(update={"status": status, "error": error})
+        return Success(self.jobs[id])
+
+
+@pytest.fixture
+def import_dir(tmp_path):
+    rows = [f"2024-01-{day + 1:02d},-{day + 1}.00,Record {day}" for day in range(RECORDS)]
+    rows[3] = "2024-01-04,abc,Record 3"
+    (tmp_path / "statement.csv").write_text("Date,Amount,Description\n" + "\n".join(rows) + "\n")
+    return tmp_path
+
+
+def _statement(**kwargs) -> ImportStatementDto:
+    return ImportStatementDto(
+        path="statement.csv", asset_id=1, mapping=ImportMappingDto(default_expense_id=1), batch_size=2, **kwargs
+    )
+
+
+def test_import_writes_every_record_in_chunks(import_dir):
+    jobs = InMemoryImportJobs()
+    usecase = ImportUseCase(jobs, read_statement, str(import_dir))
+    progress: List[int] = []
+
+    async def report(job: ResImportJobDto) -> None:
+        progress.append(job.next_offset)
+
+    result = asyncio.run(usecase.import_statement(_statement(), report)).unwrap()
+
+    assert progress == [2, 4, 6, 7]
+    assert result.job.status == ImportStatusEnum.COMPLETED
+    assert (result.job.imported_count, result.job.skipped_count) == (RECORDS - 1, 1)
+    assert [error.offset for error in result.errors] == [3]
+    assert [dto.note for dto in jobs.written] == [f"Record {i}" for i in range(RECORDS) if i != 3]
+
+
+def test_failed_import_resumes_from_next_offset(import_dir):
+    jobs = InMemoryImportJobs()
+    usecase = ImportUseCase(jobs, read_statement, str(import_dir))
+
+    async def stop_after_two_chunks(job: ResImportJobDto) -> None:
+        if job.next_offset >= 4:
+            raise RuntimeError("client went away")
+
+    stopped = asyncio.run(usecase.import_statement(_statement(), stop_after_two_chunks))
+    assert isinstance(stopped, Failure)
+    job = jobs.jobs[1]
+    assert (job.status, job.next_offset) == (ImportStatusEnum.FAILED, 4)
+
+    resumed = asyncio.run(usecase.import_statement(_statement(job_id=job.id))).unwrap()
+
+    assert resumed.job.status == ImportStatusEnum.COMPLETED
+    assert resumed.job.next_offset == RECORDS
+    # Every record once: the resumed run started where the first one stopped
+    assert [dto.note for dto in jobs.written] == [f"Record {i}" for i in range(RECORDS) if i != 3]
+
+
+def test_start_offset_overrides_the_jobs_offset(import_dir):
+    jobs = InMemoryImportJobs()
+    usecase = ImportUseCase(jobs, read_statement, str(import_dir))
+
+    result = asyncio.run(usecase.import_statement(_statement(start_offset=5))).unwrap()
+
+    assert [dto.note for dto in jobs.written] == ["Record 5", "Record 6"]
+    assert result.job.next_offset == RECORDS
+
+
+@pytest.mark.parametrize("path", ["../statement.csv", "/etc/passwd"])
+def test_paths_outside_the_import_directory_are_rejected(import_dir, path):
+    jobs = InMemoryImportJobs()
+    usecase = ImportUseCase(jobs, read_statement, str(import_dir / "nested"))
+
+    result = asyncio.run(usecase.import_statement(_statement().model_copy(update={"path": path})))
+
+    assert isinstance(result, Failure)
+    assert jobs.jobs == {}
@@ -0,0 +1,114 @@
+import asyncio
+from typing import Any, List
+
+from src.infrastructure.mysql.response_cache import ResponseCache
+from src.infrastructure.mysql.table_versions import TableVersions
+
+
+class Loader:
+    """Counts loads and returns a new value for each."""
+
+    def __init__(self) -> None:
+        self.loads = 0
+
+    async def __call__(self) -> List[Any]:
+        self.loads += 1
+        return [{"load": self.loads}]
+
+
+def test_hit_while_the_tables_are_unchanged():
+    async def scenario() -> None:
+        cache = ResponseCache(TableVersions())
+        load = Loader()
+
+        first = await cache.get_or_load("assets", ["assets"], load)
+        second = await cache.get_or_load("assets", ["assets"], load)
+
+        assert load.loads == 1
+        assert second is first
+        assert (cache.hits, cache.misses) == (1, 1)
+    asyncio.run(scenario())
+
+
+def test_a_write_to_one_of_the_tables_changes_the_token():
+    async def scenario() -> None:
+        versions = TableVersions()
+        cache = ResponseCache(versions)
+        load = Loader()
+        tables = ["assets", "asset_types"]
+
+        before = cache.token(tables)
+        await cache.get_or_load("assets", tables, load)
+        versions.bump(["asset_types"])
+        assert cache.token(tables) != before
+
+        assert await cache.get_or_load("assets", tables, load) == [{"load": 2}]
+        # Unrelated tables leave the entry valid
+        versions.bump(["contacts"])
+        assert await cache.get_or_load("assets", tables, load) == [{"load": 2}]
+        assert load.loads == 2
+    asyncio.run(scenario())
+
+
+def test_a_write_committed_while_loading_is_not_hidden():
+    async def scenario() -> None:
+        versions = TableVersions()
+        cache = ResponseCache(versions)
+        loads = 0
+
+        async def load() -> int:
+            nonlocal loads
+            loads += 1
+            if loads == 1:
+                # Committed after the load read its rows
+                versions.bump(["assets"])
+            return loads
+
+        assert await cache.get_or_load("assets", ["assets"], load) == 1
+        # Stored under the token read before loading, which is already outdated
+        assert await cache.get_or_load("assets", ["assets"], load) == 2
+    asyncio.run(scenario())
+
+
+def test_entries_expire_after_the_ttl():
+    async def scenario() -> None:
+        cache = ResponseCache(TableVersions(), ttl_seconds=0)
+        load = Loader()
+        await cache.get_or_load("assets", ["assets"], load)
+        await cache.get_or_load("assets", ["assets"], load)
+        assert load.loads == 2
+    asyncio.run(scenario())
+
+
+def test_least_recently_used_entries_are_evicted_past_max_bytes():
+    async def scenario() -> None:
+        # Room for two of the ~12-byte responses below, not three
+        cache = ResponseCache(TableVersions(), max_bytes=30)
+        load = Loader()
+        await cache.get_or_load("a", ["assets"], load)
+        await cache.get_or_load("b", ["assets"], load)
+        await cache.get_or_load("a", ["assets"], load)
+        await cache.get_or_load("c", ["assets"], load)
+
+        assert cache.evictions == 1
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["bytes"] <= 30
+        # "b" was the least recently used one
+        loads = load.loads
+        await cache.get_or_load("a", ["assets"], load)
+        assert load.loads == loads
+        await cache.get_or_load("b", ["assets"], load)
+        assert load.loads == loads + 1
+    asyncio.run(scenario())
+
+
+def test_bump_notifies_listeners_once_per_commit():
+    versions = TableVersions()
+    seen: List[Any] = []
+    versions.listen(seen.append)
+
+    versions.bump(["assets", "assets", "current_sheets"])
+    versions.bump([])
+
+    assert seen == [{"assets", "current_sheets"}]
+    assert versions.snapshot() == {"assets": 1, "current_sheets": 1}
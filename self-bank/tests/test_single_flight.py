@@ -0,0 +1,118 @@
+import asyncio
+from typing import Any, List
+
+import pytest
+
+from src.application.single_flight import SingleFlight, coalesced, single_flight
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    async def scenario() -> None:
+        flight = SingleFlight()
+        release = asyncio.Event()
+        executions: List[int] = []
+
+        async def load() -> List[int]:
+            executions.append(1)
+            await release.wait()
+            return [1, 2, 3]
+
+        callers = [asyncio.create_task(flight.do("load", "key", load)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*callers)
+
+        assert len(executions) == 1
+        assert all(result is results[0] for result in results)
+        assert flight.stats()["load"] == {"calls": 5, "executed": 1, "coalesced": 4, "errors": 0}
+    asyncio.run(scenario())
+
+
+def test_different_keys_are_not_coalesced():
+    async def scenario() -> None:
+        flight = SingleFlight()
+
+        async def load(value: int) -> int:
+            await asyncio.sleep(0)
+            return value
+
+        assert await asyncio.gather(flight.do("load", 1, lambda: load(1)), flight.do("load", 2, lambda: load(2))) == [1, 2]
+        assert flight.stats()["load"]["executed"] == 2
+    asyncio.run(scenario())
+
+
+def test_exception_reaches_every_waiter():
+    async def scenario() -> None:
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fail() -> None:
+            await release.wait()
+            raise LookupError("gone")
+
+        callers = [asyncio.create_task(flight.do("fail", "key", fail)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+
+        assert all(isinstance(result, LookupError) for result in results)
+        assert flight.stats()["fail"]["errors"] == 1
+    asyncio.run(scenario())
+
+
+def test_nothing_is_kept_once_a_call_finishes():
+    async def scenario() -> None:
+        flight = SingleFlight()
+        values = iter([1, 2])
+
+        async def load() -> int:
+            return next(values)
+
+        assert await flight.do("load", "key", load) == 1
+        assert await flight.do("load", "key", load) == 2
+    asyncio.run(scenario())
+
+
+def test_a_caller_giving_up_does_not_cancel_the_others():
+    async def scenario() -> None:
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def load() -> str:
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("load", "key", load))
+        second = asyncio.create_task(flight.do("load", "key", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+    asyncio.run(scenario())
+
+
+class Reads:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    @coalesced
+    async def get(self, id: int) -> Any:
+        self.calls += 1
+        await asyncio.sleep(0)
+        return {"id": id}
+
+
+def test_coalesced_methods_share_calls_with_equal_arguments():
+    async def scenario() -> None:
+        reads = Reads()
+        results = await asyncio.gather(reads.get(1), reads.get(1), reads.get(id=1), reads.get(2))
+
+        # Positional and keyword arguments make different keys
+        assert reads.calls == 3
+        assert results[0] is results[1]
+        assert results[3] == {"id": 2}
+        assert single_flight.stats()[Reads.get.__qualname__]["coalesced"] >= 1
+    asyncio.run(scenario())
@@ -0,0 +1,122 @@
+import io
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from src.domain.value_objects.dto import ImportMappingDto
+from src.infrastructure.statements.statement_reader import parse_amount, read_csv, read_ofx, read_qif
+
+CSV = (
+    "Date,Amount,Description,Payee,Ref\n"
+    "2024-01-02,-12.50,Coffee,Cafe,r1\n"
+    "not a date,5.00,Broken date,,r2\n"
+    "\n"
+    "2024-01-04,abc,Broken amount,,r3\n"
+    "2024-01-05,\"1,200.00\",Salary,Employer,r4\n"
+)
+
+OFX = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240102120000.000[-5:EST]<TRNAMT>-12.50<FITID>F1<NAME>Cafe<MEMO>Coffee</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>yesterday<TRNAMT>5.00<FITID>F2<NAME>Nobody</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240105<TRNAMT>1200.00<FITID>F3<NAME>Employer</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+QIF = """!Type:Cat
+NGroceries
+^
+!Type:Bank
+D01/02/2024
+T-12.50
+PCafe
+MCoffee
+LFood
+^
+D31/31/2024
+T5.00
+PNobody
+^
+D1/5'24
+T1,200.00
+PEmployer
+^
+"""
+
+
+def test_csv_reads_records_and_reports_malformed_ones():
+    mapping = ImportMappingDto(payee_column="Payee", reference_column="Ref")
+    lines = list(read_csv(io.StringIO(CSV), mapping))
+
+    # The blank row is skipped but keeps its offset
+    assert [line.offset for line in lines] == [0, 1, 3, 4]
+    assert lines[0].posted_at == datetime(2024, 1, 2)
+    assert lines[0].amount == Decimal("-12.50")
+    assert (lines[0].payee, lines[0].description, lines[0].reference) == ("Cafe", "Coffee", "r1")
+    assert lines[1].error is not None and lines[1].amount is None
+    assert lines[2].error is not None and lines[2].amount is None
+    assert lines[3].amount == Decimal("1200.00")
+
+
+def test_csv_starts_at_an_offset():
+    lines = list(read_csv(io.StringIO(CSV), ImportMappingDto(), start=3))
+    assert [line.offset for line in lines] == [3, 4]
+
+
+def test_csv_debit_and_credit_columns():
+    text = "Date,Debit,Credit\n2024-01-02,12.50,\n2024-01-03,,7.00\n"
+    mapping = ImportMappingDto(debit_column="Debit", credit_column="Credit", description_column=None)
+    assert [line.amount for line in read_csv(io.StringIO(text), mapping)] == [Decimal("-12.50"), Decimal("7.00")]
+
+
+def test_csv_rejects_a_missing_column():
+    with pytest.raises(ValueError):
+        list(read_csv(io.StringIO("When,Amount\n2024-01-02,1\n"), ImportMappingDto()))
+
+
+def test_ofx_reads_records_and_reports_malformed_ones():
+    lines = list(read_ofx(io.StringIO(OFX), ImportMappingDto()))
+
+    assert [line.offset for line in lines] == [0, 1, 2]
+    assert lines[0].posted_at == datetime(2024, 1, 2, 12, 0, 0)
+    assert lines[0].amount == Decimal("-12.50")
+    assert (lines[0].payee, lines[0].description, lines[0].reference) == ("Cafe", "Coffee", "F1")
+    assert lines[1].error is not None and lines[1].amount is None
+    assert lines[2].posted_at == datetime(2024, 1, 5)
+    assert [line.offset for line in read_ofx(io.StringIO(OFX), ImportMappingDto(), start=2)] == [2]
+
+
+def test_qif_reads_records_and_reports_malformed_ones():
+    lines = list(read_qif(io.StringIO(QIF), ImportMappingDto()))
+
+    # The category list ends its records with ^ too but holds no transactions
+    assert [line.offset for line in lines] == [0, 1, 2]
+    assert lines[0].posted_at == datetime(2024, 1, 2)
+    assert lines[0].amount == Decimal("-12.50")
+    assert (lines[0].payee, lines[0].description) == ("Cafe", "Coffee Food")
+    assert lines[1].error is not None and lines[1].amount is None
+    assert (lines[2].posted_at, lines[2].amount) == (datetime(2024, 1, 5), Decimal("1200.00"))
+    assert [line.offset for line in read_qif(io.StringIO(QIF), ImportMappingDto(), start=1)] == [1, 2]
+
+
+@pytest.mark.parametrize("text, separator, expected", [
+    ("12.50", ".", "12.50"),
+    ("-12.50", ".", "-12.50"),
+    ("+12.50", ".", "12.50"),
+    ("12.50-", ".", "-12.50"),
+    ("(12.50)", ".", "-12.50"),
+    ("(1,234.50)", ".", "-1234.50"),
+    ("1,234,567.89", ".", "1234567.89"),
+    ("$ 1,234.50", ".", "1234.50"),
+    ("1.234,50", ",", "1234.50"),
+    ("-1 234,50", ",", "-1234.50"),
+])
+def test_parse_amount(text, separator, expected):
+    assert parse_amount(text, separator) == Decimal(expected)
+
+
+@pytest.mark.parametrize("text", ["", "abc", "()", "-"])
+def test_parse_amount_rejects_text_without_digits(text):
+    with pytest.raises(ValueError):
+        parse_amount(text)
@@ -0,0 +1,132 @@
+import asyncio
+import random
+import uuid
+from decimal import Decimal
+from typing import Dict, List
+
+from returns.result import Failure
+from sqlalchemy import func, select
+
+from src.application.usecase.tranfer_usecase import TransferUseCase
+from src.config.db_config import DbConfig
+from src.domain.entities.schema import CurrentSheet, Transaction, TransactionType
+from src.domain.value_objects.dto import (
+    CreateAssetDto,
+    CreateAssetTypeDto,
+    CreateTransactionDto,
+    TransactionTypeEnum,
+    TransferFundDto,
+)
+from src.infrastructure.mysql.mysql_connection import MysqlConnection
+from src.infrastructure.mysql.repositories.assest_repo import AssetRepository
+from src.infrastructure.mysql.repositories.assest_type_repo import AssetTypeRepository
+from src.infrastructure.mysql.repositories.tranfer_repo import TransferRepository
+from src.infrastructure.mysql.repositories.transaction_repo import TransactionRepository
+
+ASSETS = 4
+OPENING_BALANCE = Decimal("10000.00")
+TRANSFERS = 400
+BATCHES = 40
+
+
+async def _open_assets(db: MysqlConnection) -> List[int]:
+    """Creates ASSETS fresh assets, each funded with OPENING_BALANCE."""
+    asset_type = (await AssetTypeRepository(db).create(
+        CreateAssetTypeDto(name=f"stress-{uuid.uuid4().hex[:12]}")
+    )).unwrap()
+    assets = AssetRepository(db)
+    transactions = TransactionRepository(db)
+    ids: List[int] = []
+    for index in range(ASSETS):
+        asset = (await assets.create(CreateAssetDto(name=f"stress {index}", asset_type_id=asset_type.id))).unwrap()
+        (await transactions.create(CreateTransactionDto(
+            transaction_type=TransactionTypeEnum.INCOME, amount=OPENING_BALANCE, asset_id=asset.id,
+        ))).unwrap()
+        ids.append(asset.id)
+    return ids
+
+
+async def _balances(db: MysqlConnection, asset_ids: List[int]) -> Dict[int, Decimal]:
+    async with db.session_maker() as session:
+        result = await session.execute(
+            select(CurrentSheet.asset_id, CurrentSheet.balance).where(CurrentSheet.asset_id.in_(asset_ids))
+        )
+        return {row.asset_id: Decimal(row.balance) for row in result}
+
+
+def _random_transfers(asset_ids: List[int], count: int, rng: random.Random) -> List[TransferFundDto]:
+    transfers = []
+    for _ in range(count):
+        source, destination = rng.sample(asset_ids, 2)
+        amount = Decimal(rng.randint(1, 500)) / 100
+        transfers.append(TransferFundDto(source_asset_id=source, destination_asset_id=destination, amount=amount))
+    return transfers
+
+
+def _expected(asset_ids: List[int], transfers: List[TransferFundDto]) -> Dict[int, Decimal]:
+    expected = {asset_id: OPENING_BALANCE for asset_id in asset_ids}
+    for dto in transfers:
+        expected[dto.source_asset_id] -= dto.amount
+        expected[dto.destination_asset_id] += dto.amount
+    return expected
+
+
+def test_parallel_transfers_conserve_balances(mysql_config: DbConfig) -> None:
+    async def scenario() -> None:
+        db = MysqlConnection(mysql_config)
+        try:
+            await db.create_tables()
+            asset_ids = await _open_assets(db)
+            transfers = _random_transfers(asset_ids, TRANSFERS, random.Random(4))
+            usecase = TransferUseCase(TransferRepository(db))
+
+            # Opposite directions over the same few assets: every pair of
+            # transfers contends for the same sheet rows
+            results = await asyncio.gather(*(usecase.transfer_fund(dto) for dto in transfers))
+
+            failures = [result.failure() for result in results if isinstance(result, Failure)]
+            assert failures == []
+            balances = await _balances(db, asset_ids)
+            assert sum(balances.values()) == OPENING_BALANCE * ASSETS
+            assert balances == _expected(asset_ids, transfers)
+
+            async with db.session_maker() as session:
+                written = (await session.execute(
+                    select(func.count()).select_from(Transaction).where(
+                        Transaction.transaction_type == TransactionType.TRANSFER,
+                        Transaction.asset_id.in_(asset_ids),
+                    )
+                )).scalar_one()
+            assert written == TRANSFERS
+        finally:
+            await db.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_parallel_batches_and_single_transfers_conserve_balances(mysql_config: DbConfig) -> None:
+    async def scenario() -> None:
+        db = MysqlConnection(mysql_config)
+        try:
+            await db.create_tables()
+            asset_ids = await _open_assets(db)
+            rng = random.Random(5)
+            batches = [_random_transfers(asset_ids, rng.randint(2, 8), rng) for _ in range(BATCHES)]
+            singles = _random_transfers(asset_ids, TRANSFERS // 2, rng)
+            usecase = TransferUseCase(TransferRepository(db))
+
+            batch_results, single_results = await asyncio.gather(
+                asyncio.gather(*(usecase.transfer_many(batch) for batch in batches)),
+                asyncio.gather(*(usecase.transfer_fund(dto) for dto in singles)),
+            )
+
+            assert [r.failure() for r in batch_results if isinstance(r, Failure)] == []
+            assert all(r.unwrap().committed for r in batch_results)
+            assert [r.failure() for r in single_results if isinstance(r, Failure)] == []
+            balances = await _balances(db, asset_ids)
+            assert sum(balances.values()) == OPENING_BALANCE * ASSETS
+            assert balances == _expected(asset_ids, [dto for batch in batches for dto in batch] + singles)
+        finally:
+            await db.dispose()
+
+    asyncio.run(scenario())